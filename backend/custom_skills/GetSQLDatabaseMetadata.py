@@ -14,9 +14,7 @@ from agency_swarm import BaseTool
 from pydantic import Field
 from sqlalchemy import MetaData, create_engine
 
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
-from backend.repositories.user_variable_storage import UserVariableStorage
-from backend.services.user_variable_manager import UserVariableManager
+from backend.services.service_registry import service_registry
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +26,7 @@ class GetSQLDatabaseMetadata(BaseTool):
 
     def run(self) -> str:
         """Execute the SQL query and return the result as a formatted string."""
-        user_variable_manager = UserVariableManager(UserVariableStorage(), AgentFlowSpecStorage())
+        user_variable_manager = service_registry.user_variable_manager
         database_url_prefix = user_variable_manager.get_by_key("DATABASE_URL_PREFIX")
         database_password = user_variable_manager.get_by_key("DATABASE_PASSWORD")
 
@@ -15,9 +15,7 @@ from pydantic import Field
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
-from backend.repositories.user_variable_storage import UserVariableStorage
-from backend.services.user_variable_manager import UserVariableManager
+from backend.services.service_registry import service_registry
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +33,7 @@ class SelectFromSQLDatabase(BaseTool):
 
     def run(self) -> str:
         """Execute the SQL query and return the result as a JSON string."""
-        user_variable_manager = UserVariableManager(UserVariableStorage(), AgentFlowSpecStorage())
+        user_variable_manager = service_registry.user_variable_manager
         database_url_prefix = user_variable_manager.get_by_key("DATABASE_URL_PREFIX")
         database_password = user_variable_manager.get_by_key("DATABASE_PASSWORD")
 
@@ -5,8 +5,8 @@ from pathlib import Path
 from agency_swarm import BaseTool
 from agency_swarm.tools import CodeInterpreter, Retrieval
 
-from backend.repositories.skill_config_storage import SkillConfigStorage
-from backend.services.skill_manager import SkillManager
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.service_registry import service_registry
 
 
 class SkillRegistry:
@@ -71,9 +71,7 @@ class SkillRegistry:
 
     def _get_skill_from_database(self, name: str) -> type[BaseTool] | None:
         """Retrieve a skill from the database and dynamically create a class."""
-        self.storage = SkillConfigStorage()
-        self.skill_manager = SkillManager(self.storage)
-        skill_configs = self.storage.load_by_titles([name])
+        skill_configs = service_registry.sync_skill_config_storage.load_by_titles([name])
         skill_config = skill_configs[0] if skill_configs else None
 
         if skill_config:
@@ -107,3 +105,5 @@ class SkillRegistry:
 
 # Create a global instance of the registry
 skill_registry = SkillRegistry()
+# Skill files are shared between the workers, pick up the ones added or removed by another worker
+cache_invalidation_bus.subscribe("skill", lambda _: skill_registry.reload())
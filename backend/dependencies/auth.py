@@ -18,7 +18,7 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     auth_service: Annotated[AuthService, Depends(AuthService)],
-    cache_manager: RedisCacheManager = Depends(get_redis_cache_manager)
+    cache_manager: RedisCacheManager = Depends(get_redis_cache_manager),
 ) -> User:
     user_data = await cache_manager.get(credentials.credentials)
     if user_data:
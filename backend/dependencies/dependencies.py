@@ -1,24 +1,23 @@
 from fastapi import Depends, HTTPException, WebSocket
 from redis import asyncio as aioredis
 
-from backend.repositories.agency_config_storage import AgencyConfigStorage
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
-from backend.repositories.session_storage import SessionConfigStorage
-from backend.repositories.skill_config_storage import SkillConfigStorage
-from backend.repositories.user_profile_storage import UserProfileStorage
-from backend.repositories.user_variable_storage import UserVariableStorage
+from backend.repositories.run_storage import RunStorage
 from backend.services.adapters.agency_adapter import AgencyAdapter
 from backend.services.adapters.agent_adapter import AgentAdapter
 from backend.services.adapters.session_adapter import SessionAdapter
 from backend.services.agency_manager import AgencyManager
 from backend.services.agent_manager import AgentManager
 from backend.services.auth_service import AuthService
+from backend.services.bundle_manager import BundleManager
 from backend.services.message_manager import MessageManager
 from backend.services.redis_cache_manager import RedisCacheManager
+from backend.services.run_manager import RunManager
+from backend.services.service_registry import service_registry
 from backend.services.session_manager import SessionManager
 from backend.services.skill_manager import SkillManager
 from backend.services.user_profile_manager import UserProfileManager
 from backend.services.user_variable_manager import UserVariableManager
+from backend.services.websocket.redis_connection_manager import websocket_connection_manager
 from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
 from backend.services.websocket.websocket_handler import WebSocketHandler
 from backend.settings import settings
@@ -38,66 +37,66 @@ def get_redis() -> aioredis.Redis:
     return redis
 
 
-def get_agent_adapter(
-    skill_config_storage: SkillConfigStorage = Depends(SkillConfigStorage),
-) -> AgentAdapter:
-    return AgentAdapter(skill_config_storage)
+def get_agent_adapter() -> AgentAdapter:
+    return service_registry.agent_adapter
 
 
-def get_agency_adapter(
-    agent_flow_spec_storage: AgentFlowSpecStorage = Depends(AgentFlowSpecStorage),
-    agent_adapter: AgentAdapter = Depends(get_agent_adapter),
-) -> AgencyAdapter:
-    return AgencyAdapter(agent_flow_spec_storage, agent_adapter)
+def get_agency_adapter() -> AgencyAdapter:
+    return service_registry.agency_adapter
 
 
-def get_session_adapter(
-    agency_config_storage: AgencyConfigStorage = Depends(AgencyConfigStorage),
-    agency_adapter: AgencyAdapter = Depends(get_agency_adapter),
-) -> SessionAdapter:
-    return SessionAdapter(agency_config_storage, agency_adapter)
+def get_session_adapter() -> SessionAdapter:
+    return service_registry.session_adapter
 
 
 def get_redis_cache_manager(redis: aioredis.Redis = Depends(get_redis)) -> RedisCacheManager:
     return RedisCacheManager(redis)
 
 
-def get_user_variable_manager(
-    user_variable_storage: UserVariableStorage = Depends(UserVariableStorage),
-    agent_storage: AgentFlowSpecStorage = Depends(AgentFlowSpecStorage),
-) -> UserVariableManager:
-    return UserVariableManager(user_variable_storage, agent_storage)
+def get_user_variable_manager() -> UserVariableManager:
+    return service_registry.user_variable_manager
 
 
 def get_skill_manager() -> SkillManager:
     """Get the skill manager instance."""
-    return SkillManager(SkillConfigStorage())
+    return SkillManager(service_registry.skill_config_storage, template_catalog=service_registry.template_catalog)
 
 
 def get_agent_manager(
-    storage: AgentFlowSpecStorage = Depends(AgentFlowSpecStorage),
     user_variable_manager: UserVariableManager = Depends(get_user_variable_manager),
-    skill_storage: SkillConfigStorage = Depends(SkillConfigStorage),
 ) -> AgentManager:
-    return AgentManager(storage, user_variable_manager, skill_storage)
+    return AgentManager(
+        service_registry.agent_flow_spec_storage,
+        user_variable_manager,
+        service_registry.skill_config_storage,
+        service_registry.template_catalog,
+    )
 
 
 def get_agency_manager(
     agent_manager: AgentManager = Depends(get_agent_manager),
-    agency_config_storage: AgencyConfigStorage = Depends(AgencyConfigStorage),
     user_variable_manager: UserVariableManager = Depends(get_user_variable_manager),
 ) -> AgencyManager:
-    return AgencyManager(agent_manager, agency_config_storage, user_variable_manager)
+    return AgencyManager(
+        agent_manager, service_registry.agency_config_storage, user_variable_manager, service_registry.template_catalog
+    )
+
+
+def get_bundle_manager(
+    agent_manager: AgentManager = Depends(get_agent_manager),
+    agency_manager: AgencyManager = Depends(get_agency_manager),
+    skill_manager: SkillManager = Depends(get_skill_manager),
+) -> BundleManager:
+    return BundleManager(agent_manager, agency_manager, skill_manager)
 
 
 def get_session_manager(
-    session_storage: SessionConfigStorage = Depends(SessionConfigStorage),
     user_variable_manager: UserVariableManager = Depends(get_user_variable_manager),
     session_adapter: SessionAdapter = Depends(get_session_adapter),
 ) -> SessionManager:
     """Returns a SessionManager object"""
     return SessionManager(
-        session_storage=session_storage,
+        session_storage=service_registry.session_config_storage,
         user_variable_manager=user_variable_manager,
         session_adapter=session_adapter,
     )
@@ -109,8 +108,12 @@ def get_message_manager(
     return MessageManager(user_variable_manager)
 
 
+def get_websocket_connection_manager() -> WebSocketConnectionManager:
+    return websocket_connection_manager
+
+
 def get_websocket_handler(
-    connection_manager: WebSocketConnectionManager = Depends(WebSocketConnectionManager),
+    connection_manager: WebSocketConnectionManager = Depends(get_websocket_connection_manager),
     auth_service: AuthService = Depends(AuthService),
     agency_manager: AgencyManager = Depends(get_agency_manager),
     message_manager: MessageManager = Depends(get_message_manager),
@@ -119,8 +122,19 @@ def get_websocket_handler(
     return WebSocketHandler(connection_manager, auth_service, agency_manager, message_manager, session_manager)
 
 
-def get_user_profile_manager(
-    user_profile_storage: UserProfileStorage = Depends(UserProfileStorage),
-) -> UserProfileManager:
+def get_user_profile_manager() -> UserProfileManager:
     """Returns user profile data"""
-    return UserProfileManager(user_profile_storage)
+    return service_registry.user_profile_manager
+
+
+def get_run_storage() -> RunStorage:
+    return service_registry.run_storage
+
+
+def get_run_manager(
+    run_storage: RunStorage = Depends(get_run_storage),
+    agency_manager: AgencyManager = Depends(get_agency_manager),
+    session_manager: SessionManager = Depends(get_session_manager),
+    connection_manager: WebSocketConnectionManager = Depends(get_websocket_connection_manager),
+) -> RunManager:
+    return RunManager(run_storage, agency_manager, session_manager, connection_manager)
@@ -3,6 +3,7 @@ import logging
 from fastapi import HTTPException, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
+from backend.repositories.data_loader import request_scope
 from backend.services.auth_service import AuthService
 from backend.services.context_vars_manager import ContextEnvVarsManager
 
@@ -24,3 +25,11 @@ class UserContextMiddleware(BaseHTTPMiddleware):
 
         response = await call_next(request)
         return response
+
+
+class RequestScopeMiddleware(BaseHTTPMiddleware):
+    """Give each request its own data loaders, so repeated repository reads of a request are coalesced."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        with request_scope():
+            return await call_next(request)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,10 +7,14 @@ from openai import AuthenticationError as OpenAIAuthenticationError
 from pydantic import ValidationError
 from starlette.staticfiles import StaticFiles
 
-from backend.dependencies.middleware import UserContextMiddleware
+from backend.dependencies.dependencies import get_redis
+from backend.dependencies.middleware import RequestScopeMiddleware, UserContextMiddleware
 from backend.exceptions import NotFoundError, UnsetVariableError
 from backend.routers.api import api_router
 from backend.routers.websocket import websocket_router
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.service_registry import service_registry
+from backend.services.websocket.redis_connection_manager import websocket_connection_manager
 from backend.utils.logging_utils import setup_logging
 
 setup_logging()
@@ -30,8 +36,23 @@ init_firebase_app()
 
 patch_openai_client()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Mounted sub-apps don't run their own lifespan, so the shared services are managed by the top-level app
+    service_registry.startup()
+    service_registry.template_catalog.start()
+    await cache_invalidation_bus.start(get_redis())
+    await websocket_connection_manager.start(get_redis())
+    yield
+    await websocket_connection_manager.stop()
+    await cache_invalidation_bus.stop()
+    await service_registry.redis.aclose()
+    service_registry.shutdown()
+
+
 # FastAPI app initialization
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # allow cross-origin requests for testing on localhost:800* ports only
 app.add_middleware(
@@ -59,6 +80,7 @@ api_app.add_exception_handler(UnsetVariableError, unset_variable_error_handler)
 api_app.add_exception_handler(Exception, unhandled_exception_handler)
 
 app.add_middleware(UserContextMiddleware)
+app.add_middleware(RequestScopeMiddleware)
 
 ws_app = FastAPI(root_path="/ws")
 ws_app.include_router(websocket_router)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.skill_config import SkillConfig
+
+
+class AgencyBundle(BaseModel):
+    """An agency with its agents and skills, the unit of the agency import and export.
+    The agency references the agents by their ids within the bundle, the agents reference the skills by title."""
+
+    agency: AgencyConfig = Field(..., description="The agency configuration")
+    agents: list[AgentFlowSpec] = Field(default_factory=list, description="The agents used in the agency")
+    skills: list[SkillConfig] = Field(default_factory=list, description="The skills used by the agents")
@@ -1,5 +1,6 @@
 import logging
 from datetime import UTC, datetime
+from typing import ClassVar
 
 from pydantic import BaseModel, Field, conlist, field_validator
 
@@ -107,3 +108,18 @@ class AgencyConfigForAPI(BaseModel):
                 raise ValidationErrorMissingReceiver
 
         return v
+
+
+class AgencyConfigSummary(BaseModel):
+    """Agency list item without the agents and the agency chart"""
+
+    # The document fields the summary is loaded from
+    projection: ClassVar[list[str]] = ["id", "user_id", "name", "description", "timestamp"]
+
+    id: str | None = Field(None, description="Unique identifier for the configuration")
+    user_id: str | None = Field(None, description="The user ID owning this configuration")
+    name: str = Field(..., description="Name of the agency")
+    description: str = Field("", description="Description of the agency")
+    timestamp: str = Field(
+        default_factory=lambda: datetime.now(UTC).isoformat(), description="Timestamp of the last update"
+    )
@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
+from typing import ClassVar
 
-from pydantic import BaseModel, Field
+from pydantic import AliasPath, BaseModel, Field
 
 from backend.models.skill_config import SkillConfig
 from backend.settings import settings
@@ -37,6 +38,9 @@ class AgentFlowSpec(BaseModel):
     description: str = Field("", description="Description of the agent")
     temperature: float = Field(0.0, description="temperature of the agent")
     user_id: str | None = Field(None, description="The user ID owning this configuration")
+    assistant_fingerprint: str | None = Field(
+        None, description="Fingerprint of the assistant settings last synced with OpenAI"
+    )
 
 
 class AgentFlowSpecForAPI(AgentFlowSpec):
@@ -46,3 +50,20 @@ class AgentFlowSpecForAPI(AgentFlowSpec):
     skills: list[SkillConfig] = Field(  # type: ignore
         default_factory=list, description="List of skill configurations equipped by the agent"
     )
+    # Internal, not exposed to the frontend
+    assistant_fingerprint: str | None = Field(None, exclude=True)
+
+
+class AgentFlowSpecSummary(BaseModel):
+    """Agent list item without the system message and the skills"""
+
+    # The document fields the summary is loaded from
+    projection: ClassVar[list[str]] = ["id", "user_id", "config.name", "description", "timestamp"]
+
+    id: str | None = Field(None, description="Unique identifier for the configuration")
+    user_id: str | None = Field(None, description="The user ID owning this configuration")
+    name: str = Field(..., validation_alias=AliasPath("config", "name"), description="Name of the agent")
+    description: str = Field("", description="Description of the agent")
+    timestamp: str = Field(
+        default_factory=lambda: datetime.now(UTC).isoformat(), description="Timestamp of the last update"
+    )
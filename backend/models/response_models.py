@@ -2,11 +2,12 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
-from backend.models.agency_config import AgencyConfigForAPI
-from backend.models.agent_flow_spec import AgentFlowSpecForAPI
+from backend.models.agency_config import AgencyConfigForAPI, AgencyConfigSummary
+from backend.models.agent_flow_spec import AgentFlowSpecForAPI, AgentFlowSpecSummary
 from backend.models.message import Message
-from backend.models.session_config import SessionConfigForAPI
-from backend.models.skill_config import SkillConfig
+from backend.models.run import Run
+from backend.models.session_config import SessionConfigForAPI, SessionConfigSummary
+from backend.models.skill_config import SkillConfig, SkillConfigSummary
 
 
 class BaseResponse(BaseModel):
@@ -22,6 +23,15 @@ class SkillListResponse(BaseResponse):
     data: list[SkillConfig] = Field(..., description="The list of skill configurations.")
 
 
+class SkillPageResponse(SkillListResponse):
+    next_page_token: str | None = Field(..., description="The token of the next page, None on the last page.")
+
+
+class SkillSummaryListResponse(BaseResponse):
+    data: list[SkillConfigSummary] = Field(..., description="The list of skill summaries.")
+    next_page_token: str | None = Field(None, description="The token of the next page, None on the last page.")
+
+
 class GetSkillResponse(BaseResponse):
     data: SkillConfig = Field(..., description="The skill configuration.")
 
@@ -38,6 +48,15 @@ class AgentListResponse(BaseResponse):
     data: list[AgentFlowSpecForAPI] = Field(..., description="The list of agent configurations.")
 
 
+class AgentPageResponse(AgentListResponse):
+    next_page_token: str | None = Field(..., description="The token of the next page, None on the last page.")
+
+
+class AgentSummaryListResponse(BaseResponse):
+    data: list[AgentFlowSpecSummary] = Field(..., description="The list of agent summaries.")
+    next_page_token: str | None = Field(None, description="The token of the next page, None on the last page.")
+
+
 class GetAgentResponse(BaseResponse):
     data: AgentFlowSpecForAPI = Field(..., description="The agent configuration.")
 
@@ -50,6 +69,15 @@ class AgencyListResponse(BaseResponse):
     data: list[AgencyConfigForAPI] = Field(..., description="The list of agency configurations.")
 
 
+class AgencyPageResponse(AgencyListResponse):
+    next_page_token: str | None = Field(..., description="The token of the next page, None on the last page.")
+
+
+class AgencySummaryListResponse(BaseResponse):
+    data: list[AgencyConfigSummary] = Field(..., description="The list of agency summaries.")
+    next_page_token: str | None = Field(None, description="The token of the next page, None on the last page.")
+
+
 class GetAgencyResponse(BaseResponse):
     data: AgencyConfigForAPI = Field(..., description="The agency configuration.")
 
@@ -62,6 +90,15 @@ class SessionListResponse(BaseResponse):
     data: list[SessionConfigForAPI] = Field(..., description="The list of session configurations.")
 
 
+class SessionPageResponse(SessionListResponse):
+    next_page_token: str | None = Field(..., description="The token of the next page, None on the last page.")
+
+
+class SessionSummaryListResponse(BaseResponse):
+    data: list[SessionConfigSummary] = Field(..., description="The list of session summaries.")
+    next_page_token: str | None = Field(None, description="The token of the next page, None on the last page.")
+
+
 class CreateSessionResponse(BaseResponse):
     data: list[SessionConfigForAPI] = Field(..., description="The list of session configurations.")
     session_id: str = Field(..., description="The unique identifier of the session.")
@@ -76,6 +113,10 @@ class MessagePostResponse(BaseResponse):
     response: str = Field(..., description="The final agent response.")
 
 
+class RunResponse(BaseResponse):
+    data: Run = Field(..., description="The agency run.")
+
+
 # =================================================================================================
 # User API
 
@@ -99,5 +140,52 @@ class VersionResponse(BaseResponse):
 # =================================================================================================
 # User Profile API Response
 
+
 class UserProfileResponse(BaseResponse):
     data: dict[str, str] | None = Field(..., description="User profile data.")
+
+
+# =================================================================================================
+# Admin API
+
+
+class AgencyPoolEntry(BaseModel):
+    key: str = Field(..., description="The cache key of the constructed agency (a hash of its configuration).")
+    label: str | None = Field(None, description="The agency id.")
+    size_bytes: int = Field(..., description="The estimated memory held by the agency.")
+    idle_seconds: float = Field(..., description="The time since the agency was last used.")
+
+
+class AgencyPoolStats(BaseModel):
+    entries: int = Field(..., description="The number of constructed agencies in the pool.")
+    size_bytes: int = Field(..., description="The estimated memory held by the pool.")
+    max_bytes: int = Field(..., description="The size bound of the pool.")
+    max_idle_seconds: float = Field(..., description="The idle time after which an agency is dropped.")
+    hits: int = Field(..., description="The number of lookups that found a constructed agency.")
+    misses: int = Field(..., description="The number of lookups that had to construct the agency.")
+    hit_rate: float = Field(..., description="The share of the lookups that were hits.")
+    evictions: int = Field(..., description="The number of agencies dropped for idleness or size.")
+
+
+class AgencyPoolData(AgencyPoolStats):
+    items: list[AgencyPoolEntry] = Field(..., description="The agencies in the pool, least recently used first.")
+
+
+class AgencyPoolResponse(BaseResponse):
+    data: AgencyPoolData = Field(..., description="The state of the agency pool of this worker.")
+
+
+class RunSchedulerStats(BaseModel):
+    workers: int = Field(..., description="The number of threads running the agencies.")
+    max_concurrent_runs: int = Field(..., description="The number of runs in progress at a time.")
+    max_runs_per_user: int = Field(..., description="The number of runs of a user in progress at a time.")
+    running: int = Field(..., description="The number of runs in progress.")
+    waiting: int = Field(..., description="The number of runs waiting for a slot.")
+    max_waiting: int = Field(..., description="The largest number of runs that waited at a time.")
+    started: int = Field(..., description="The number of runs started.")
+    queued: int = Field(..., description="The number of runs that had to wait.")
+    average_wait_seconds: float = Field(..., description="The average wait of the runs that had to wait.")
+
+
+class RunSchedulerResponse(BaseResponse):
+    data: RunSchedulerStats = Field(..., description="The state of the agency run scheduler of this worker.")
@@ -0,0 +1,24 @@
+from datetime import UTC, datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+RunStatus = Literal["queued", "running", "completed", "failed"]
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class Run(BaseModel):
+    """An agency run started by POST /message/run, see RunManager."""
+
+    id: str = Field(..., description="The unique identifier of the run.")
+    user_id: str = Field(..., description="The user who started the run.")
+    agency_id: str = Field(..., description="The agency of the session.")
+    session_id: str = Field(..., description="The session the message was sent to.")
+    status: RunStatus = Field("queued", description="The state of the run.")
+    response: str | None = Field(None, description="The final agent response, once completed.")
+    error: str | None = Field(None, description="The error message, if the run failed.")
+    created_at: str = Field(default_factory=_now, description="The timestamp when the run was created.")
+    updated_at: str = Field(default_factory=_now, description="The timestamp of the last status change.")
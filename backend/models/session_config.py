@@ -1,4 +1,5 @@
 from datetime import UTC, datetime
+from typing import ClassVar
 
 from pydantic import BaseModel, Field
 
@@ -25,3 +26,19 @@ class SessionConfigForAPI(SessionConfig):
     """Session configuration model for the API. Corresponds to the IChatSession type in the frontend"""
 
     flow_config: AgencyConfigForAPI = Field(..., description="The flow (agency) configuration for the session")
+
+
+class SessionConfigSummary(BaseModel):
+    """Session list item without the thread ids and the flow configuration"""
+
+    # The document fields the summary is loaded from
+    projection: ClassVar[list[str]] = ["id", "user_id", "name", "agency_id", "timestamp"]
+
+    id: str = Field(..., description="Unique identifier for the session")
+    user_id: str = Field(..., description="The user ID associated with the session")
+    name: str = Field(..., description="The name of the session")
+    agency_id: str = Field(..., description="Unique identifier for the agency")
+    timestamp: str = Field(
+        default_factory=lambda: datetime.now(UTC).isoformat(),
+        description="The timestamp at which the session was created",
+    )
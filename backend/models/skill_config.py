@@ -1,4 +1,5 @@
 from datetime import UTC, datetime
+from typing import ClassVar
 
 from pydantic import BaseModel, Field
 
@@ -14,3 +15,18 @@ class SkillConfig(BaseModel):
         default_factory=lambda: datetime.now(UTC).isoformat(), description="Timestamp of the last update"
     )
     content: str = Field("", description="The actual code of the skill")
+
+
+class SkillConfigSummary(BaseModel):
+    """Skill list item without the skill code"""
+
+    # The document fields the summary is loaded from
+    projection: ClassVar[list[str]] = ["id", "user_id", "title", "description", "timestamp"]
+
+    id: str | None = Field(None, description="Unique identifier for the configuration")
+    user_id: str | None = Field(None, description="The user ID owning this configuration")
+    title: str = Field(..., description="Name of the skill")
+    description: str = Field("", description="Description of the skill")
+    timestamp: str = Field(
+        default_factory=lambda: datetime.now(UTC).isoformat(), description="Timestamp of the last update"
+    )
@@ -1,12 +1,14 @@
-from firebase_admin import firestore
+from firebase_admin import firestore, firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
-from backend.models.agency_config import AgencyConfig
+from backend.models.agency_config import AgencyConfig, AgencyConfigSummary
+from backend.repositories.batch_loader import BATCH_WRITE_LIMIT, chunked
+from backend.repositories.pagination import PageCursor, paginate
 
 
 class AgencyConfigStorage:
-    def __init__(self):
-        self.db = firestore.client()
+    def __init__(self, db: firestore.Client | None = None):
+        self.db = db or firestore.client()
         self.collection_name = "agency_configs"
 
     def load_by_user_id(self, user_id: str | None = None) -> list[AgencyConfig]:
@@ -41,3 +43,92 @@ class AgencyConfigStorage:
     def delete(self, id_: str) -> None:
         collection = self.db.collection(self.collection_name)
         collection.document(id_).delete()
+
+
+class AsyncAgencyConfigStorage:
+    """Async counterpart of AgencyConfigStorage built on the Firestore async client.
+    Use it from coroutines so that Firestore round trips don't block the event loop."""
+
+    def __init__(self, db: firestore_async.AsyncClient | None = None):
+        self.db = db or firestore_async.client()
+        self.collection_name = "agency_configs"
+
+    async def load_by_user_id(
+        self, user_id: str | None = None, summary: bool = False
+    ) -> list[AgencyConfig] | list[AgencyConfigSummary]:
+        """Load the configs of the user. With summary=True only the AgencyConfigSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(AgencyConfigSummary.projection)
+        model = AgencyConfigSummary if summary else AgencyConfig
+        return [model.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def load_page_by_user_id(
+        self, user_id: str | None, limit: int, after: PageCursor | None = None, summary: bool = False
+    ) -> list[AgencyConfig] | list[AgencyConfigSummary]:
+        """Load up to `limit` configs of the user, newest first, following the `after` cursor.
+        With summary=True only the AgencyConfigSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(AgencyConfigSummary.projection)
+        model = AgencyConfigSummary if summary else AgencyConfig
+        return [
+            model.model_validate(document_snapshot.to_dict())
+            async for document_snapshot in paginate(query, limit, after).stream()
+        ]
+
+    async def load_by_id(self, id_: str) -> AgencyConfig | None:
+        collection = self.db.collection(self.collection_name)
+        document_snapshot = await collection.document(id_).get()
+        return AgencyConfig.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
+
+    async def load_by_ids(self, ids: list[str]) -> list[AgencyConfig]:
+        """Load the agency configurations with the given ids, in the order of the ids, with a single batched read."""
+        unique_ids = list(dict.fromkeys(ids))
+        collection = self.db.collection(self.collection_name)
+        references = [collection.document(id_) for id_ in unique_ids]
+        document_snapshots = {
+            document_snapshot.id: document_snapshot
+            async for document_snapshot in self.db.get_all(references)
+            if document_snapshot.exists
+        }
+        return [
+            AgencyConfig.model_validate(document_snapshots[id_].to_dict())
+            for id_ in unique_ids
+            if id_ in document_snapshots
+        ]
+
+    async def load_by_agent_id(self, agent_id: str) -> list[AgencyConfig]:
+        """Load all agency configurations with the given agent id present in the agents array."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("agents", "array_contains", agent_id))
+        return [AgencyConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def save(self, agency_config: AgencyConfig) -> str:
+        """Save the agency configuration to the Firestore.
+        If the id is not set, it will create a new document and set the id.
+        Returns the id."""
+        collection = self.db.collection(self.collection_name)
+        # A new document gets its id client-side, so that it's written with a single set()
+        document_reference = collection.document(agency_config.id)
+        agency_config.id = document_reference.id
+        await document_reference.set(agency_config.model_dump())
+        return agency_config.id
+
+    async def save_many(self, agency_configs: list[AgencyConfig]) -> list[str]:
+        """Save the agency configurations with batched writes, see save. Returns the ids."""
+        collection = self.db.collection(self.collection_name)
+        for chunk in chunked(agency_configs, BATCH_WRITE_LIMIT):
+            batch = self.db.batch()
+            for agency_config in chunk:
+                document_reference = collection.document(agency_config.id)
+                agency_config.id = document_reference.id
+                batch.set(document_reference, agency_config.model_dump())
+            await batch.commit()
+        return [agency_config.id for agency_config in agency_configs]
+
+    async def delete(self, id_: str) -> None:
+        collection = self.db.collection(self.collection_name)
+        await collection.document(id_).delete()
@@ -1,18 +1,28 @@
-from firebase_admin import firestore
+from typing import Any
+
+from firebase_admin import firestore, firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
-from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.agent_flow_spec import AgentFlowSpec, AgentFlowSpecSummary
+from backend.repositories.batch_loader import BATCH_WRITE_LIMIT, chunked
+from backend.repositories.pagination import PageCursor, paginate
 
 
 class AgentFlowSpecStorage:
-    def __init__(self):
-        self.db = firestore.client()
+    def __init__(self, db: firestore.Client | None = None):
+        self.db = db or firestore.client()
         self.collection_name = "agent_configs"
 
-    def load_by_user_id(self, user_id: str | None = None) -> list[AgentFlowSpec]:
+    def load_by_user_id(
+        self, user_id: str | None = None, summary: bool = False
+    ) -> list[AgentFlowSpec] | list[AgentFlowSpecSummary]:
+        """Load the configs of the user. With summary=True only the AgentFlowSpecSummary fields are read."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("user_id", "==", user_id))
-        return [AgentFlowSpec.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        if summary:
+            query = query.select(AgentFlowSpecSummary.projection)
+        model = AgentFlowSpecSummary if summary else AgentFlowSpec
+        return [model.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
 
     def load_by_id(self, id_: str) -> AgentFlowSpec | None:
         collection = self.db.collection(self.collection_name)
@@ -41,14 +51,112 @@ class AgentFlowSpecStorage:
         If the agent id is not set, it will create a new document and set the agent id.
         Returns the agent id."""
         collection = self.db.collection(self.collection_name)
-        if agent_flow_spec.id is None:
-            # Create a new document and set the id
-            document_reference = collection.add(agent_flow_spec.model_dump())[1]
-            agent_flow_spec.id = document_reference.id
-
-        collection.document(agent_flow_spec.id).set(agent_flow_spec.model_dump())
+        # A new document gets its id client-side, so that it's written with a single set()
+        document_reference = collection.document(agent_flow_spec.id)
+        agent_flow_spec.id = document_reference.id
+        document_reference.set(agent_flow_spec.model_dump())
         return agent_flow_spec.id
 
+    def save_many(self, agent_flow_specs: list[AgentFlowSpec]) -> list[str]:
+        """Save the agent configurations with batched writes, see save. Returns the ids."""
+        collection = self.db.collection(self.collection_name)
+        for chunk in chunked(agent_flow_specs, BATCH_WRITE_LIMIT):
+            batch = self.db.batch()
+            for agent_flow_spec in chunk:
+                document_reference = collection.document(agent_flow_spec.id)
+                agent_flow_spec.id = document_reference.id
+                batch.set(document_reference, agent_flow_spec.model_dump())
+            batch.commit()
+        return [agent_flow_spec.id for agent_flow_spec in agent_flow_specs]
+
     def delete(self, id_: str) -> None:
         collection = self.db.collection(self.collection_name)
         collection.document(id_).delete()
+
+
+class AsyncAgentFlowSpecStorage:
+    """Async counterpart of AgentFlowSpecStorage built on the Firestore async client."""
+
+    def __init__(self, db: firestore_async.AsyncClient | None = None):
+        self.db = db or firestore_async.client()
+        self.collection_name = "agent_configs"
+
+    async def load_by_user_id(
+        self, user_id: str | None = None, summary: bool = False
+    ) -> list[AgentFlowSpec] | list[AgentFlowSpecSummary]:
+        """Load the configs of the user. With summary=True only the AgentFlowSpecSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(AgentFlowSpecSummary.projection)
+        model = AgentFlowSpecSummary if summary else AgentFlowSpec
+        return [model.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def load_page_by_user_id(
+        self, user_id: str | None, limit: int, after: PageCursor | None = None, summary: bool = False
+    ) -> list[AgentFlowSpec] | list[AgentFlowSpecSummary]:
+        """Load up to `limit` configs of the user, newest first, following the `after` cursor.
+        With summary=True only the AgentFlowSpecSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(AgentFlowSpecSummary.projection)
+        model = AgentFlowSpecSummary if summary else AgentFlowSpec
+        return [
+            model.model_validate(document_snapshot.to_dict())
+            async for document_snapshot in paginate(query, limit, after).stream()
+        ]
+
+    async def load_by_id(self, id_: str) -> AgentFlowSpec | None:
+        collection = self.db.collection(self.collection_name)
+        document_snapshot = await collection.document(id_).get()
+        return AgentFlowSpec.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
+
+    async def load_by_ids(self, ids: list[str]) -> list[AgentFlowSpec]:
+        """Load the agents with the given ids, in the order of the ids, with a single batched read.
+        Agent documents are stored under their id, so no `in` query (and its limit of 10) is needed."""
+        unique_ids = list(dict.fromkeys(ids))
+        collection = self.db.collection(self.collection_name)
+        references = [collection.document(id_) for id_ in unique_ids]
+        document_snapshots = {
+            document_snapshot.id: document_snapshot
+            async for document_snapshot in self.db.get_all(references)
+            if document_snapshot.exists
+        }
+        return [
+            AgentFlowSpec.model_validate(document_snapshots[id_].to_dict())
+            for id_ in unique_ids
+            if id_ in document_snapshots
+        ]
+
+    async def save(self, agent_flow_spec: AgentFlowSpec) -> str:
+        """Save the agent configuration to the Firestore.
+        If the agent id is not set, it will create a new document and set the agent id.
+        Returns the agent id."""
+        collection = self.db.collection(self.collection_name)
+        # A new document gets its id client-side, so that it's written with a single set()
+        document_reference = collection.document(agent_flow_spec.id)
+        agent_flow_spec.id = document_reference.id
+        await document_reference.set(agent_flow_spec.model_dump())
+        return agent_flow_spec.id
+
+    async def save_many(self, agent_flow_specs: list[AgentFlowSpec]) -> list[str]:
+        """Save the agent configurations with batched writes, see save. Returns the ids."""
+        collection = self.db.collection(self.collection_name)
+        for chunk in chunked(agent_flow_specs, BATCH_WRITE_LIMIT):
+            batch = self.db.batch()
+            for agent_flow_spec in chunk:
+                document_reference = collection.document(agent_flow_spec.id)
+                agent_flow_spec.id = document_reference.id
+                batch.set(document_reference, agent_flow_spec.model_dump())
+            await batch.commit()
+        return [agent_flow_spec.id for agent_flow_spec in agent_flow_specs]
+
+    async def update(self, id_: str, fields: dict[str, Any]) -> None:
+        """Update the agent configuration with the given fields."""
+        collection = self.db.collection(self.collection_name)
+        await collection.document(id_).update(fields)
+
+    async def delete(self, id_: str) -> None:
+        collection = self.db.collection(self.collection_name)
+        await collection.document(id_).delete()
@@ -0,0 +1,42 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+
+from backend.settings import settings
+
+# Firestore `in` query supports up to 10 items in the array.
+IN_QUERY_LIMIT = 10
+# A Firestore batched write holds up to 500 writes.
+BATCH_WRITE_LIMIT = 500
+
+
+def chunked[T](items: list[T], size: int) -> Iterator[list[T]]:
+    """Split the items into consecutive chunks of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+async def load_in_chunks[T](
+    keys: Iterable[str],
+    load_chunk: Callable[[list[str]], Awaitable[list[T]]],
+    key: Callable[[T], str],
+    chunk_size: int = IN_QUERY_LIMIT,
+    max_concurrency: int | None = None,
+) -> list[T]:
+    """Load the documents for the keys with one `in` query per chunk, running the chunk queries concurrently.
+
+    Keys are de-duplicated, at most max_concurrency (default settings.firestore_max_concurrency) queries run
+    at a time, and the results follow the order of the keys: results of the same key keep their query order.
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    if not unique_keys:
+        return []
+    semaphore = asyncio.Semaphore(max_concurrency or settings.firestore_max_concurrency)
+
+    async def run(chunk: list[str]) -> list[T]:
+        async with semaphore:
+            return await load_chunk(chunk)
+
+    chunk_results = await asyncio.gather(*(run(chunk) for chunk in chunked(unique_keys, chunk_size)))
+    results = [item for items in chunk_results for item in items]
+    positions = {key_: position for position, key_ in enumerate(unique_keys)}
+    return sorted(results, key=lambda item: positions.get(key(item), len(positions)))
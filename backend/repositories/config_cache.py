@@ -0,0 +1,251 @@
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from backend.repositories.data_loader import clear_request_loaders, get_request_loader
+
+
+class ConfigCache:
+    """In-process TTL/LRU cache for config models, keyed by document id and, for skills, by title.
+
+    Cached models are copied on the way in and out so that callers can mutate what they get.
+    The cache is shared between the sync and async storage wrappers, hence the lock.
+    The version changes with every invalidation: the wrappers read it before loading from the storage and pass it
+    to put_many/put_titles, which don't cache what was loaded before an invalidation (it may predate a write).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._by_id: TTLCache[str, BaseModel] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._by_title: TTLCache[str, list[BaseModel]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, ids: Iterable[str]) -> tuple[dict[str, Any], list[str]]:
+        """Return the cached models by id and the ids that have to be loaded from the storage."""
+        found, missing = {}, []
+        with self._lock:
+            for id_ in dict.fromkeys(ids):
+                config = self._by_id.get(id_)
+                if config is None:
+                    missing.append(id_)
+                else:
+                    found[id_] = config.model_copy(deep=True)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, configs: Iterable[Any], version: int | None = None) -> None:
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            for config in configs:
+                self._by_id[config.id] = config.model_copy(deep=True)
+
+    def get_titles(self, titles: Iterable[str]) -> tuple[dict[str, list[Any]], list[str]]:
+        """Return the cached models by title and the titles that have to be loaded from the storage."""
+        found, missing = {}, []
+        with self._lock:
+            for title in dict.fromkeys(titles):
+                configs = self._by_title.get(title)
+                if configs is None:
+                    missing.append(title)
+                else:
+                    found[title] = [config.model_copy(deep=True) for config in configs]
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_titles(
+        self, titles: Iterable[str], configs: Iterable[Any], version: int | None = None
+    ) -> dict[str, list[Any]]:
+        """Cache the loaded models under their titles and return them grouped by title.
+        Titles without a match are cached as empty."""
+        grouped: dict[str, list[Any]] = {title: [] for title in titles}
+        for config in configs:
+            grouped.setdefault(config.title, []).append(config)
+        with self._lock:
+            if version is not None and version != self.version:
+                return grouped
+            for title, title_configs in grouped.items():
+                self._by_title[title] = [config.model_copy(deep=True) for config in title_configs]
+        return grouped
+
+    def invalidate(self, id_: str | None, title: str | None = None) -> None:
+        """Drop the entry for the id, every title entry that contains it and the entry for the title."""
+        with self._lock:
+            self.version += 1
+            self._by_id.pop(id_, None)
+            stale_titles = [
+                key for key, configs in self._by_title.items() if any(config.id == id_ for config in configs)
+            ]
+            if title is not None:
+                stale_titles.append(title)
+            for key in stale_titles:
+                self._by_title.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._by_id.clear()
+            self._by_title.clear()
+
+    def clear_titles(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._by_title.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._by_id) + len(self._by_title)}
+
+
+class CachedConfigStorage:
+    """Read-through wrapper around a sync config storage.
+    Cached reads: load_by_id, load_by_ids, load_by_titles. save, update and delete invalidate the cache.
+    Everything else is delegated to the wrapped storage."""
+
+    def __init__(self, storage: Any, cache: ConfigCache):
+        self._storage = storage
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self._storage, name)
+
+    def load_by_id(self, id_: str) -> Any | None:
+        version = self.cache.version
+        found, missing = self.cache.get_many([id_])
+        if not missing:
+            return found[id_]
+        config = self._storage.load_by_id(id_)
+        if config is not None:
+            self.cache.put_many([config], version)
+        return config
+
+    def load_by_ids(self, ids: list[str]) -> list[Any]:
+        version = self.cache.version
+        found, missing = self.cache.get_many(ids)
+        if missing:
+            configs = self._storage.load_by_ids(missing)
+            self.cache.put_many(configs, version)
+            found.update((config.id, config) for config in configs)
+        return [found[id_] for id_ in dict.fromkeys(ids) if id_ in found]
+
+    def load_by_titles(self, titles: list[str]) -> list[Any]:
+        version = self.cache.version
+        found, missing = self.cache.get_titles(titles)
+        if missing:
+            found.update(self.cache.put_titles(missing, self._storage.load_by_titles(missing), version))
+        return [config for title in dict.fromkeys(titles) for config in found.get(title, [])]
+
+    def save(self, config: Any) -> str:
+        id_ = self._storage.save(config)
+        self.cache.invalidate(id_, getattr(config, "title", None))
+        return id_
+
+    def save_many(self, configs: list[Any]) -> list[str]:
+        ids = self._storage.save_many(configs)
+        for config in configs:
+            self.cache.invalidate(config.id, getattr(config, "title", None))
+        return ids
+
+    def update(self, id_: str, fields: dict[str, Any]) -> None:
+        self._storage.update(id_, fields)
+        self.cache.invalidate(id_)
+
+    def delete(self, id_: str) -> None:
+        self._storage.delete(id_)
+        self.cache.invalidate(id_)
+
+
+class AsyncCachedConfigStorage:
+    """Read-through wrapper around an async config storage, see CachedConfigStorage.
+
+    Inside a request scope (see data_loader.request_scope) reads also go through per-request data loaders:
+    the ids and titles requested in the same event loop tick are fetched with one batched read,
+    and each is fetched at most once per request.
+    """
+
+    def __init__(self, storage: Any, cache: ConfigCache):
+        self._storage = storage
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self._storage, name)
+
+    async def load_by_id(self, id_: str) -> Any | None:
+        return (await self._load_ids([id_])).get(id_)
+
+    async def load_by_ids(self, ids: list[str]) -> list[Any]:
+        configs = await self._load_ids(ids)
+        return [configs[id_] for id_ in dict.fromkeys(ids) if id_ in configs]
+
+    async def load_by_titles(self, titles: list[str]) -> list[Any]:
+        unique_titles = list(dict.fromkeys(titles))
+        loader = get_request_loader(self, "titles", self._fetch_titles)
+        if loader is None:
+            configs_by_title = await self._fetch_titles(unique_titles)
+            return [config for title in unique_titles for config in configs_by_title.get(title, [])]
+        title_configs = await loader.load_many(unique_titles)
+        return [config.model_copy(deep=True) for configs in title_configs if configs for config in configs]
+
+    async def save(self, config: Any) -> str:
+        id_ = await self._storage.save(config)
+        self.cache.invalidate(id_, getattr(config, "title", None))
+        self._clear_request_loaders()
+        return id_
+
+    async def save_many(self, configs: list[Any]) -> list[str]:
+        ids = await self._storage.save_many(configs)
+        for config in configs:
+            self.cache.invalidate(config.id, getattr(config, "title", None))
+        self._clear_request_loaders()
+        return ids
+
+    async def update(self, id_: str, fields: dict[str, Any]) -> None:
+        await self._storage.update(id_, fields)
+        self.cache.invalidate(id_)
+        self._clear_request_loaders()
+
+    async def delete(self, id_: str) -> None:
+        await self._storage.delete(id_)
+        self.cache.invalidate(id_)
+        self._clear_request_loaders()
+
+    async def _load_ids(self, ids: list[str]) -> dict[str, Any]:
+        unique_ids = list(dict.fromkeys(ids))
+        loader = get_request_loader(self, "ids", self._fetch_ids)
+        if loader is None:
+            return await self._fetch_ids(unique_ids)
+        configs = await loader.load_many(unique_ids)
+        # Memoized models are shared by the whole request, hand out copies
+        return {id_: config.model_copy(deep=True) for id_, config in zip(unique_ids, configs, strict=True) if config}
+
+    async def _fetch_ids(self, ids: list[str]) -> dict[str, Any]:
+        version = self.cache.version
+        found, missing = self.cache.get_many(ids)
+        if not missing:
+            return found
+        if len(missing) == 1:
+            # A single document get is cheaper than a batched read
+            config = await self._storage.load_by_id(missing[0])
+            configs = [config] if config is not None else []
+        else:
+            configs = await self._storage.load_by_ids(missing)
+        self.cache.put_many(configs, version)
+        found.update((config.id, config) for config in configs)
+        return found
+
+    async def _fetch_titles(self, titles: list[str]) -> dict[str, list[Any]]:
+        version = self.cache.version
+        found, missing = self.cache.get_titles(titles)
+        if missing:
+            found.update(self.cache.put_titles(missing, await self._storage.load_by_titles(missing), version))
+        return found
+
+    def _clear_request_loaders(self) -> None:
+        clear_request_loaders(self)
@@ -0,0 +1,101 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Loaders of the current request (or websocket message), by owner and name. None outside of a request scope.
+_request_loaders: ContextVar[dict[tuple[int, str], "DataLoader"] | None] = ContextVar("request_loaders", default=None)
+
+
+class DataLoader[K: Hashable, V]:
+    """Coalesce the loads issued in the same event loop tick into one batch call and memoize the results.
+
+    batch_load gets the distinct keys that are not memoized yet and returns the values by key;
+    keys missing from the result resolve to None. A loader lives as long as the request that created it,
+    see request_scope().
+    """
+
+    def __init__(self, batch_load: Callable[[list[K]], Awaitable[dict[K, V]]]):
+        self._batch_load = batch_load
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[tuple[K, asyncio.Future[V | None]]] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        return await self._future(key)
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self._future(key) for key in keys)))
+
+    def clear(self, key: K | None = None) -> None:
+        """Forget a memoized key, or all of them if no key is given."""
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+    def _future(self, key: K) -> asyncio.Future[V | None]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append((key, future))
+        return future
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        keys, futures = [key for key, _ in queue], [future for _, future in queue]
+        task = asyncio.ensure_future(self._resolve(keys, futures))
+        # Keep a reference to the task until it's done, the event loop only keeps a weak one
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, keys: list[K], futures: list[asyncio.Future[V | None]]) -> None:
+        try:
+            values = await self._batch_load(keys)
+        except Exception as e:
+            for key, future in zip(keys, futures, strict=True):
+                # Don't memoize failures, the next load of the key retries
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in zip(keys, futures, strict=True):
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Give the code run inside the block its own set of data loaders."""
+    token = _request_loaders.set({})
+    try:
+        yield
+    finally:
+        _request_loaders.reset(token)
+
+
+def get_request_loader(owner: Any, name: str, batch_load: Callable[[list], Awaitable[dict]]) -> DataLoader | None:
+    """Return the owner's loader of the current request scope, creating it on first use. None outside a scope."""
+    loaders = _request_loaders.get()
+    if loaders is None:
+        return None
+    key = (id(owner), name)
+    if key not in loaders:
+        loaders[key] = DataLoader(batch_load)
+    return loaders[key]
+
+
+def clear_request_loaders(owner: Any) -> None:
+    """Forget what the owner's loaders of the current request scope memoized (e.g. after a write).
+    Doesn't create any loader."""
+    loaders = _request_loaders.get()
+    if loaders is None:
+        return
+    for (owner_id, _), loader in loaders.items():
+        if owner_id == id(owner):
+            loader.clear()
@@ -0,0 +1,23 @@
+from typing import Any
+
+from google.cloud.firestore_v1 import Query
+
+# Pages are ordered by the newest first; the id breaks ties between documents with the same timestamp.
+# Queries filtering by user_id need a composite index on (user_id, timestamp desc, id desc).
+PAGE_ORDER_FIELDS = ("timestamp", "id")
+
+PageCursor = tuple[str, str]
+
+
+def paginate(query: Any, limit: int, after: PageCursor | None = None) -> Any:
+    """Order the query by PAGE_ORDER_FIELDS and return at most `limit` documents following the `after` cursor."""
+    for field in PAGE_ORDER_FIELDS:
+        query = query.order_by(field, direction=Query.DESCENDING)
+    if after is not None:
+        query = query.start_after(dict(zip(PAGE_ORDER_FIELDS, after, strict=True)))
+    return query.limit(limit)
+
+
+def page_cursor(config: Any) -> PageCursor:
+    """Return the position of the config in the page order."""
+    return config.timestamp or "", config.id or ""
@@ -0,0 +1,24 @@
+from redis import asyncio as aioredis
+
+from backend.models.run import Run
+from backend.settings import settings
+
+
+class RunStorage:
+    """The agency runs in Redis, readable by every worker. They expire settings.run_ttl_seconds after
+    their last update."""
+
+    key_prefix = "agency_run"
+
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+
+    async def load_by_id(self, run_id: str) -> Run | None:
+        data = await self.redis.get(self._key(run_id))
+        return Run.model_validate_json(data) if data else None
+
+    async def save(self, run: Run) -> None:
+        await self.redis.set(self._key(run.id), run.model_dump_json(), ex=settings.run_ttl_seconds)
+
+    def _key(self, run_id: str) -> str:
+        return f"{self.key_prefix}:{run_id}"
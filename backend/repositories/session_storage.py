@@ -1,12 +1,13 @@
-from firebase_admin import firestore
+from firebase_admin import firestore, firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
-from backend.models.session_config import SessionConfig
+from backend.models.session_config import SessionConfig, SessionConfigSummary
+from backend.repositories.pagination import PageCursor, paginate
 
 
 class SessionConfigStorage:
-    def __init__(self):
-        self.db = firestore.client()
+    def __init__(self, db: firestore.Client | None = None):
+        self.db = db or firestore.client()
         self.collection_name = "session_configs"
 
     def load_by_user_id(self, user_id: str | None = None) -> list[SessionConfig]:
@@ -36,3 +37,60 @@ class SessionConfigStorage:
     def delete(self, session_id: str) -> None:
         collection = self.db.collection(self.collection_name)
         collection.document(session_id).delete()
+
+
+class AsyncSessionConfigStorage:
+    """Async counterpart of SessionConfigStorage built on the Firestore async client."""
+
+    def __init__(self, db: firestore_async.AsyncClient | None = None):
+        self.db = db or firestore_async.client()
+        self.collection_name = "session_configs"
+
+    async def load_by_user_id(
+        self, user_id: str | None = None, summary: bool = False
+    ) -> list[SessionConfig] | list[SessionConfigSummary]:
+        """Load the configs of the user. With summary=True only the SessionConfigSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(SessionConfigSummary.projection)
+        model = SessionConfigSummary if summary else SessionConfig
+        return [model.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def load_page_by_user_id(
+        self, user_id: str | None, limit: int, after: PageCursor | None = None, summary: bool = False
+    ) -> list[SessionConfig] | list[SessionConfigSummary]:
+        """Load up to `limit` configs of the user, newest first, following the `after` cursor.
+        With summary=True only the SessionConfigSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(SessionConfigSummary.projection)
+        model = SessionConfigSummary if summary else SessionConfig
+        return [
+            model.model_validate(document_snapshot.to_dict())
+            async for document_snapshot in paginate(query, limit, after).stream()
+        ]
+
+    async def load_by_agency_id(self, agency_id: str) -> list[SessionConfig]:
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("agency_id", "==", agency_id))
+        return [SessionConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def load_by_id(self, session_id: str) -> SessionConfig | None:
+        collection = self.db.collection(self.collection_name)
+        document_snapshot = await collection.document(session_id).get()
+        return SessionConfig.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
+
+    async def save(self, session_config: SessionConfig) -> None:
+        collection = self.db.collection(self.collection_name)
+        await collection.document(session_config.id).set(session_config.model_dump())
+
+    async def update(self, session_id: str, fields: dict[str, str]) -> None:
+        """Update the session with the given fields."""
+        collection = self.db.collection(self.collection_name)
+        await collection.document(session_id).update(fields)
+
+    async def delete(self, session_id: str) -> None:
+        collection = self.db.collection(self.collection_name)
+        await collection.document(session_id).delete()
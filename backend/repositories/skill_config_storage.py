@@ -1,18 +1,26 @@
-from firebase_admin import firestore
+from firebase_admin import firestore, firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
-from backend.models.skill_config import SkillConfig
+from backend.models.skill_config import SkillConfig, SkillConfigSummary
+from backend.repositories.batch_loader import BATCH_WRITE_LIMIT, chunked, load_in_chunks
+from backend.repositories.pagination import PageCursor, paginate
 
 
 class SkillConfigStorage:
-    def __init__(self):
-        self.db = firestore.client()
+    def __init__(self, db: firestore.Client | None = None):
+        self.db = db or firestore.client()
         self.collection_name = "skill_configs"
 
-    def load_by_user_id(self, user_id: str | None = None) -> list[SkillConfig]:
+    def load_by_user_id(
+        self, user_id: str | None = None, summary: bool = False
+    ) -> list[SkillConfig] | list[SkillConfigSummary]:
+        """Load the configs of the user. With summary=True only the SkillConfigSummary fields are read."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("user_id", "==", user_id))
-        return [SkillConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        if summary:
+            query = query.select(SkillConfigSummary.projection)
+        model = SkillConfigSummary if summary else SkillConfig
+        return [model.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
 
     def load_by_id(self, id_: str) -> SkillConfig | None:
         collection = self.db.collection(self.collection_name)
@@ -38,13 +46,116 @@ class SkillConfigStorage:
 
     def save(self, skill_config: SkillConfig) -> str:
         collection = self.db.collection(self.collection_name)
-        if skill_config.id is None:
-            # Create a new document and set the id
-            document_reference = collection.add(skill_config.model_dump())[1]
-            skill_config.id = document_reference.id
-        collection.document(skill_config.id).set(skill_config.model_dump())
+        # A new document gets its id client-side, so that it's written with a single set()
+        document_reference = collection.document(skill_config.id)
+        skill_config.id = document_reference.id
+        document_reference.set(skill_config.model_dump())
         return skill_config.id
 
+    def save_many(self, skill_configs: list[SkillConfig]) -> list[str]:
+        """Save the skill configurations with batched writes, see save. Returns the ids."""
+        collection = self.db.collection(self.collection_name)
+        for chunk in chunked(skill_configs, BATCH_WRITE_LIMIT):
+            batch = self.db.batch()
+            for skill_config in chunk:
+                document_reference = collection.document(skill_config.id)
+                skill_config.id = document_reference.id
+                batch.set(document_reference, skill_config.model_dump())
+            batch.commit()
+        return [skill_config.id for skill_config in skill_configs]
+
     def delete(self, id_: str) -> None:
         collection = self.db.collection(self.collection_name)
         collection.document(id_).delete()
+
+
+class AsyncSkillConfigStorage:
+    """Async counterpart of SkillConfigStorage built on the Firestore async client."""
+
+    def __init__(self, db: firestore_async.AsyncClient | None = None):
+        self.db = db or firestore_async.client()
+        self.collection_name = "skill_configs"
+
+    async def load_by_user_id(
+        self, user_id: str | None = None, summary: bool = False
+    ) -> list[SkillConfig] | list[SkillConfigSummary]:
+        """Load the configs of the user. With summary=True only the SkillConfigSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(SkillConfigSummary.projection)
+        model = SkillConfigSummary if summary else SkillConfig
+        return [model.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def load_page_by_user_id(
+        self, user_id: str | None, limit: int, after: PageCursor | None = None, summary: bool = False
+    ) -> list[SkillConfig] | list[SkillConfigSummary]:
+        """Load up to `limit` configs of the user, newest first, following the `after` cursor.
+        With summary=True only the SkillConfigSummary fields are read."""
+        collection = self.db.collection(self.collection_name)
+        query = collection.where(filter=FieldFilter("user_id", "==", user_id))
+        if summary:
+            query = query.select(SkillConfigSummary.projection)
+        model = SkillConfigSummary if summary else SkillConfig
+        return [
+            model.model_validate(document_snapshot.to_dict())
+            async for document_snapshot in paginate(query, limit, after).stream()
+        ]
+
+    async def load_by_id(self, id_: str) -> SkillConfig | None:
+        collection = self.db.collection(self.collection_name)
+        document_snapshot = await collection.document(id_).get()
+        return SkillConfig.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
+
+    async def load_by_ids(self, ids: list[str]) -> list[SkillConfig]:
+        """Load the skills with the given ids, in the order of the ids, with a single batched read."""
+        unique_ids = list(dict.fromkeys(ids))
+        collection = self.db.collection(self.collection_name)
+        references = [collection.document(id_) for id_ in unique_ids]
+        document_snapshots = {
+            document_snapshot.id: document_snapshot
+            async for document_snapshot in self.db.get_all(references)
+            if document_snapshot.exists
+        }
+        return [
+            SkillConfig.model_validate(document_snapshots[id_].to_dict())
+            for id_ in unique_ids
+            if id_ in document_snapshots
+        ]
+
+    async def load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
+        """Load the skills with the given titles, in the order of the titles. The chunk queries run concurrently."""
+        return await load_in_chunks(titles, self._load_by_titles, key=lambda skill_config: skill_config.title)
+
+    async def _load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
+        collection = self.db.collection(self.collection_name)
+        # Firestore `in` query supports up to 10 items in the array.
+        if len(titles) > 10:
+            raise ValueError("Titles list exceeds the maximum size of 10 for an 'in' query in Firestore.")
+
+        query = collection.where(filter=FieldFilter("title", "in", titles))
+        return [SkillConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
+
+    async def save(self, skill_config: SkillConfig) -> str:
+        collection = self.db.collection(self.collection_name)
+        # A new document gets its id client-side, so that it's written with a single set()
+        document_reference = collection.document(skill_config.id)
+        skill_config.id = document_reference.id
+        await document_reference.set(skill_config.model_dump())
+        return skill_config.id
+
+    async def save_many(self, skill_configs: list[SkillConfig]) -> list[str]:
+        """Save the skill configurations with batched writes, see save. Returns the ids."""
+        collection = self.db.collection(self.collection_name)
+        for chunk in chunked(skill_configs, BATCH_WRITE_LIMIT):
+            batch = self.db.batch()
+            for skill_config in chunk:
+                document_reference = collection.document(skill_config.id)
+                skill_config.id = document_reference.id
+                batch.set(document_reference, skill_config.model_dump())
+            await batch.commit()
+        return [skill_config.id for skill_config in skill_configs]
+
+    async def delete(self, id_: str) -> None:
+        collection = self.db.collection(self.collection_name)
+        await collection.document(id_).delete()
@@ -0,0 +1,380 @@
+"""Repository implementations on a local SQLite database, an alternative to Firestore for load tests
+and single-node deployments (see Settings.storage_backend).
+
+Each collection is a table holding the document as JSON, plus indexed columns for the fields the repositories
+query on. The agents of an agency are also kept in a join table for the agency-by-agent lookup.
+The sync storages have the same methods as the Firestore ones; AsyncSqliteStorage gives the async counterparts.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, ClassVar
+
+from pydantic import BaseModel
+
+from backend.models.agency_config import AgencyConfig, AgencyConfigSummary
+from backend.models.agent_flow_spec import AgentFlowSpec, AgentFlowSpecSummary
+from backend.models.session_config import SessionConfig, SessionConfigSummary
+from backend.models.skill_config import SkillConfig, SkillConfigSummary
+from backend.repositories.batch_loader import chunked
+from backend.repositories.pagination import PageCursor
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER in the `in` queries
+SQLITE_IN_QUERY_LIMIT = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agency_configs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agency_configs_user_id ON agency_configs (user_id, timestamp DESC, id DESC);
+CREATE TABLE IF NOT EXISTS agency_agents (
+    agency_id TEXT NOT NULL REFERENCES agency_configs (id) ON DELETE CASCADE,
+    agent_id TEXT NOT NULL,
+    PRIMARY KEY (agency_id, agent_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS agency_agents_agent_id ON agency_agents (agent_id);
+
+CREATE TABLE IF NOT EXISTS agent_configs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agent_configs_user_id ON agent_configs (user_id, timestamp DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS skill_configs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    title TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS skill_configs_user_id ON skill_configs (user_id, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS skill_configs_title ON skill_configs (title);
+
+CREATE TABLE IF NOT EXISTS session_configs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    agency_id TEXT,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_configs_user_id ON session_configs (user_id, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS session_configs_agency_id ON session_configs (agency_id);
+
+CREATE TABLE IF NOT EXISTS user_profiles (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_variables (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SqliteDatabase:
+    """A SQLite database file in WAL mode, with one connection per thread.
+
+    WAL lets readers run concurrently with the (single) writer. Write transactions are taken with BEGIN IMMEDIATE,
+    so a concurrent writer waits for the lock (up to busy_timeout) instead of failing when it upgrades a read.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """The connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """A write transaction, committed on exit or rolled back on error."""
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def _set_path(document: dict[str, Any], path: str, value: Any) -> None:
+    """Set a field given as a Firestore field path ("a.b"), creating the parent maps."""
+    *parents, name = path.split(".")
+    for parent in parents:
+        document = document.setdefault(parent, {})
+    document[name] = value
+
+
+class SqliteConfigStorage:
+    """Base of the config storages: a table with the document and the columns in `columns`.
+    Subclasses set the table, the models and the columns, and add their specific queries."""
+
+    table: ClassVar[str]
+    model: ClassVar[type[BaseModel]]
+    summary_model: ClassVar[type[BaseModel]]
+    # The indexed document fields, stored in the columns of the same name
+    columns: ClassVar[tuple[str, ...]] = ("user_id", "timestamp")
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def load_by_user_id(self, user_id: str | None = None, summary: bool = False) -> list[Any]:
+        """Load the configs of the user. With summary=True only the summary fields are read."""
+        return self._select("WHERE user_id IS ?", [user_id], summary)
+
+    def load_page_by_user_id(
+        self, user_id: str | None, limit: int, after: PageCursor | None = None, summary: bool = False
+    ) -> list[Any]:
+        """Load up to `limit` configs of the user, newest first, following the `after` cursor."""
+        clause, params = "WHERE user_id IS ?", [user_id]
+        if after:
+            clause += " AND (timestamp, id) < (?, ?)"
+            params.extend(after)
+        return self._select(f"{clause} ORDER BY timestamp DESC, id DESC LIMIT ?", [*params, limit], summary)
+
+    def load_by_id(self, id_: str) -> Any | None:
+        configs = self._select("WHERE id = ?", [id_])
+        return configs[0] if configs else None
+
+    def load_by_ids(self, ids: list[str]) -> list[Any]:
+        """Load the configs with the given ids, in the order of the ids."""
+        unique_ids = list(dict.fromkeys(ids))
+        configs = {
+            config.id: config
+            for chunk in chunked(unique_ids, SQLITE_IN_QUERY_LIMIT)
+            for config in self._select(f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        }
+        return [configs[id_] for id_ in unique_ids if id_ in configs]
+
+    def save(self, config: Any) -> str:
+        """Save the config. If the id is not set, a new one is generated. Returns the id."""
+        with self.db.transaction() as connection:
+            self._write(connection, config)
+        return config.id
+
+    def save_many(self, configs: list[Any]) -> list[str]:
+        """Save the configs in one transaction, see save. Returns the ids."""
+        with self.db.transaction() as connection:
+            for config in configs:
+                self._write(connection, config)
+        return [config.id for config in configs]
+
+    def update(self, id_: str, fields: dict[str, Any]) -> None:
+        """Update the config with the given fields (Firestore field paths)."""
+        with self.db.transaction() as connection:
+            row = connection.execute(f"SELECT data FROM {self.table} WHERE id = ?", (id_,)).fetchone()
+            if row is None:
+                raise KeyError(f"Config not found in {self.table}: {id_}")
+            document = json.loads(row[0])
+            for path, value in fields.items():
+                _set_path(document, path, value)
+            self._write(connection, self.model.model_validate(document))
+
+    def delete(self, id_: str) -> None:
+        with self.db.transaction() as connection:
+            connection.execute(f"DELETE FROM {self.table} WHERE id = ?", (id_,))
+
+    def _select(self, clause: str, params: list[Any], summary: bool = False) -> list[Any]:
+        if summary:
+            projection = self.summary_model.projection  # type: ignore[attr-defined]
+            fields = ", ".join(f"json_extract(data, '$.{path}')" for path in projection)
+            rows = self.db.connection().execute(f"SELECT {fields} FROM {self.table} {clause}", params).fetchall()
+            documents = []
+            for row in rows:
+                document: dict[str, Any] = {}
+                for path, value in zip(projection, row, strict=True):
+                    _set_path(document, path, value)
+                documents.append(document)
+            return [self.summary_model.model_validate(document) for document in documents]
+        rows = self.db.connection().execute(f"SELECT data FROM {self.table} {clause}", params).fetchall()
+        return [self.model.model_validate_json(data) for (data,) in rows]
+
+    def _write(self, connection: sqlite3.Connection, config: Any) -> None:
+        if not config.id:
+            config.id = uuid.uuid4().hex
+        document = config.model_dump()
+        columns = ("id", *self.columns, "data")
+        values = [config.id, *(document.get(column) for column in self.columns), json.dumps(document)]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        connection.execute(
+            f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}",
+            values,
+        )
+
+
+class SqliteAgencyConfigStorage(SqliteConfigStorage):
+    table = "agency_configs"
+    model = AgencyConfig
+    summary_model = AgencyConfigSummary
+
+    def load_by_agent_id(self, agent_id: str) -> list[AgencyConfig]:
+        """Load all agency configurations with the given agent id present in the agents array."""
+        rows = (
+            self.db.connection()
+            .execute(
+                "SELECT data FROM agency_configs JOIN agency_agents ON agency_agents.agency_id = agency_configs.id "
+                "WHERE agency_agents.agent_id = ?",
+                (agent_id,),
+            )
+            .fetchall()
+        )
+        return [AgencyConfig.model_validate_json(data) for (data,) in rows]
+
+    def _write(self, connection: sqlite3.Connection, config: AgencyConfig) -> None:
+        super()._write(connection, config)
+        connection.execute("DELETE FROM agency_agents WHERE agency_id = ?", (config.id,))
+        connection.executemany(
+            "INSERT OR IGNORE INTO agency_agents (agency_id, agent_id) VALUES (?, ?)",
+            [(config.id, agent_id) for agent_id in config.agents],
+        )
+
+
+class SqliteAgentFlowSpecStorage(SqliteConfigStorage):
+    table = "agent_configs"
+    model = AgentFlowSpec
+    summary_model = AgentFlowSpecSummary
+
+
+class SqliteSkillConfigStorage(SqliteConfigStorage):
+    table = "skill_configs"
+    model = SkillConfig
+    summary_model = SkillConfigSummary
+    columns = ("user_id", "title", "timestamp")
+
+    def load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
+        """Load the skills with the given titles, in the order of the titles."""
+        unique_titles = list(dict.fromkeys(titles))
+        skills = [
+            skill
+            for chunk in chunked(unique_titles, SQLITE_IN_QUERY_LIMIT)
+            for skill in self._select(f"WHERE title IN ({', '.join('?' * len(chunk))})", chunk)
+        ]
+        order = {title: i for i, title in enumerate(unique_titles)}
+        return sorted(skills, key=lambda skill: order[skill.title])
+
+
+class SqliteSessionConfigStorage(SqliteConfigStorage):
+    table = "session_configs"
+    model = SessionConfig
+    summary_model = SessionConfigSummary
+    columns = ("user_id", "agency_id", "timestamp")
+
+    def load_by_agency_id(self, agency_id: str) -> list[SessionConfig]:
+        return self._select("WHERE agency_id = ?", [agency_id])
+
+
+class SqliteDocumentStorage:
+    """A table of schemaless documents by id, for the user profiles and the user variables."""
+
+    def __init__(self, db: SqliteDatabase, table: str):
+        self.db = db
+        self.table = table
+
+    def get(self, id_: str) -> dict | None:
+        row = self.db.connection().execute(f"SELECT data FROM {self.table} WHERE id = ?", (id_,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, id_: str, document: dict[str, Any]) -> None:
+        with self.db.transaction() as connection:
+            connection.execute(
+                f"INSERT INTO {self.table} (id, data) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+                (id_, json.dumps(document)),
+            )
+
+    def update(self, id_: str, fields: dict[str, Any]) -> None:
+        """Update the given fields (Firestore field paths) of an existing document."""
+        with self.db.transaction() as connection:
+            row = connection.execute(f"SELECT data FROM {self.table} WHERE id = ?", (id_,)).fetchone()
+            if row is None:
+                raise KeyError(f"Document not found in {self.table}: {id_}")
+            document = json.loads(row[0])
+            for path, value in fields.items():
+                _set_path(document, path, value)
+            connection.execute(f"UPDATE {self.table} SET data = ? WHERE id = ?", (json.dumps(document), id_))
+
+
+class SqliteUserProfileStorage:
+    def __init__(self, db: SqliteDatabase):
+        self.documents = SqliteDocumentStorage(db, "user_profiles")
+
+    def get_profile(self, user_id: str) -> dict | None:
+        """Fetch user profile data based on user_id"""
+        return self.documents.get(user_id)
+
+    def update_profile(self, user_id: str, fields: dict[str, str]) -> None:
+        """Set user profile data based on user_id"""
+        self.documents.set(user_id, fields)
+
+
+class SqliteUserVariableStorage:
+    def __init__(self, db: SqliteDatabase):
+        self.documents = SqliteDocumentStorage(db, "user_variables")
+
+    def get_all_variables(self, user_id: str) -> dict | None:
+        """Fetch user variables based on user_id"""
+        return self.documents.get(user_id)
+
+    def set_variables(self, user_id: str, variables: dict[str, str]) -> None:
+        """Set user variables based on user_id"""
+        self.documents.set(user_id, variables)
+
+    def update_variables(self, user_id: str, variables: dict[str, str]) -> None:
+        """Update user variables based on user_id"""
+        self.documents.update(user_id, variables)
+
+
+class AsyncSqliteStorage:
+    """Async counterpart of a SQLite storage: the methods of the wrapped storage run in a worker thread,
+    so that queries don't block the event loop."""
+
+    def __init__(self, storage: Any):
+        self._storage = storage
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._storage, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(attribute, *args, **kwargs)
+
+        return call
@@ -1,14 +1,14 @@
 import logging
 
-from firebase_admin import firestore
+from firebase_admin import firestore, firestore_async
 
 logger = logging.getLogger(__name__)
 
 
 class UserProfileStorage:
-    def __init__(self):
+    def __init__(self, db: firestore.Client | None = None):
         """Initialize Firestore client and collection name."""
-        self.db = firestore.client()
+        self.db = db or firestore.client()
         self.collection_name = "user_profiles"
 
     def get_profile(self, user_id: str) -> dict | None:
@@ -23,3 +23,25 @@ class UserProfileStorage:
         logger.info(f"Updating user profile data for user_id: {user_id}")
         collection = self.db.collection(self.collection_name)
         collection.document(user_id).set(fields)
+
+
+class AsyncUserProfileStorage:
+    """Async counterpart of UserProfileStorage built on the Firestore async client."""
+
+    def __init__(self, db: firestore_async.AsyncClient | None = None):
+        """Initialize Firestore async client and collection name."""
+        self.db = db or firestore_async.client()
+        self.collection_name = "user_profiles"
+
+    async def get_profile(self, user_id: str) -> dict | None:
+        """Fetch user profile data based on user_id"""
+        logger.info(f"Fetching user profile data for user_id: {user_id}")
+        collection = self.db.collection(self.collection_name)
+        document_snapshot = await collection.document(user_id).get()
+        return document_snapshot.to_dict() if document_snapshot.exists else None
+
+    async def update_profile(self, user_id: str, fields: dict[str, str]) -> None:
+        """Set user profile data based on user_id"""
+        logger.info(f"Updating user profile data for user_id: {user_id}")
+        collection = self.db.collection(self.collection_name)
+        await collection.document(user_id).set(fields)
@@ -6,9 +6,9 @@ logger = logging.getLogger(__name__)
 
 
 class UserVariableStorage:
-    def __init__(self):
+    def __init__(self, db: firestore.Client | None = None):
         """Initialize Firestore client and collection name."""
-        self.db = firestore.client()
+        self.db = db or firestore.client()
         self.collection_name = "user_variables"
 
     def get_all_variables(self, user_id: str) -> dict | None:
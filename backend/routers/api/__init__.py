@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from backend.routers.api.admin import admin_router
 from backend.routers.api.agency import agency_router
 from backend.routers.api.agent import agent_router
 from backend.routers.api.message import message_router
@@ -21,3 +22,4 @@ api_router.include_router(message_router)
 api_router.include_router(version_router)
 api_router.include_router(user_router)
 api_router.include_router(profile_router)
+api_router.include_router(admin_router)
@@ -0,0 +1,46 @@
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from backend.dependencies.auth import get_current_superuser
+from backend.models.auth import User
+from backend.models.response_models import AgencyPoolData, AgencyPoolResponse, RunSchedulerResponse, RunSchedulerStats
+from backend.services.agency_manager import agency_pool
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.run_scheduler import run_scheduler
+
+logger = logging.getLogger(__name__)
+
+admin_router = APIRouter(
+    tags=["admin"],
+    responses={404: {"description": "Not found"}},
+    dependencies=[Depends(get_current_superuser)],
+)
+
+
+def _agency_pool_data() -> AgencyPoolData:
+    return AgencyPoolData(**agency_pool.stats(), items=agency_pool.entries())
+
+
+@admin_router.get("/admin/agency-pool")
+async def get_agency_pool() -> AgencyPoolResponse:
+    """Return the size, the hit rate, the evictions and the entries of the agency pool of the worker."""
+    return AgencyPoolResponse(data=_agency_pool_data())
+
+
+@admin_router.delete("/admin/agency-pool")
+async def flush_agency_pool(
+    current_user: Annotated[User, Depends(get_current_superuser)],
+) -> AgencyPoolResponse:
+    """Drop the constructed agencies of all the workers (through the cache invalidation bus).
+    The config caches and the template catalog are kept."""
+    logger.info(f"Flushing the agency pools, user: {current_user.id}")
+    cache_invalidation_bus.publish("agency_pool", None)
+    return AgencyPoolResponse(message="Agency pool flushed", data=_agency_pool_data())
+
+
+@admin_router.get("/admin/run-scheduler")
+async def get_run_scheduler() -> RunSchedulerResponse:
+    """Return the running and waiting agency runs of the worker and the queue metrics."""
+    return RunSchedulerResponse(data=RunSchedulerStats(**run_scheduler.stats()))
@@ -4,17 +4,28 @@ from typing import Annotated
 
 from fastapi import APIRouter, Body, Depends
 from fastapi.params import Query
+from fastapi.responses import StreamingResponse
 
 from backend.dependencies.auth import get_current_user
-from backend.dependencies.dependencies import get_agency_adapter, get_agency_manager, get_session_manager
+from backend.dependencies.dependencies import (
+    get_agency_adapter,
+    get_agency_manager,
+    get_bundle_manager,
+    get_session_manager,
+)
+from backend.models.agency_bundle import AgencyBundle
 from backend.models.agency_config import AgencyConfigForAPI
 from backend.models.auth import User
 from backend.models.response_models import (
     AgencyListResponse,
+    AgencyPageResponse,
+    AgencySummaryListResponse,
     GetAgencyResponse,
 )
 from backend.services.adapters.agency_adapter import AgencyAdapter
 from backend.services.agency_manager import AgencyManager
+from backend.services.bundle_manager import BundleManager
+from backend.services.pagination import MAX_PAGE_SIZE, page_size
 from backend.services.session_manager import SessionManager
 
 logger = logging.getLogger(__name__)
@@ -30,11 +41,23 @@ async def get_agency_list(
     current_user: Annotated[User, Depends(get_current_user)],
     adapter: Annotated[AgencyAdapter, Depends(get_agency_adapter)],
     manager: AgencyManager = Depends(get_agency_manager),
-) -> AgencyListResponse:
-    """Get the list of agencies"""
-    agencies = await manager.get_agency_list(current_user.id)
-    agencies_for_api = [adapter.to_api(agency) for agency in agencies]
-    return AgencyListResponse(data=agencies_for_api)
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="The page size, the whole list by default"),
+    page_token: str | None = Query(None, description="The next_page_token of the previous page"),
+    summary: bool = Query(False, description="Return summaries instead of the full configurations"),
+) -> AgencyListResponse | AgencyPageResponse | AgencySummaryListResponse:
+    """Get the list of agencies, or a page of it if `limit` or `page_token` is set"""
+    if (page_limit := page_size(limit, page_token)) is None:
+        agencies, next_page_token = await manager.get_agency_list(current_user.id, summary=summary), None
+    else:
+        agencies, next_page_token = await manager.get_agency_page(
+            current_user.id, page_limit, page_token, summary=summary
+        )
+    if summary:
+        return AgencySummaryListResponse(data=agencies, next_page_token=next_page_token)
+    agencies_for_api = await adapter.to_api_many(agencies)
+    if page_limit is None:
+        return AgencyListResponse(data=agencies_for_api)
+    return AgencyPageResponse(data=agencies_for_api, next_page_token=next_page_token)
 
 
 @agency_router.get("/agency")
@@ -50,7 +73,7 @@ async def get_agency_config(
     agency_config = await manager.get_agency_config(id, current_user.id, allow_template=True)
 
     # Transform the internal model to the API model
-    config_for_api = adapter.to_api(agency_config)
+    config_for_api = await adapter.to_api(agency_config)
     return GetAgencyResponse(data=config_for_api)
 
 
@@ -68,7 +91,7 @@ async def create_or_update_agency(
     await manager.handle_agency_creation_or_update(config, current_user.id)
 
     agencies = await manager.get_agency_list(current_user.id)
-    agencies_for_api = [adapter.to_api(agency) for agency in agencies]
+    agencies_for_api = await adapter.to_api_many(agencies)
     return AgencyListResponse(message="Saved", data=agencies_for_api)
 
 
@@ -82,8 +105,40 @@ async def delete_agency(
 ) -> AgencyListResponse:
     """Delete an agency"""
     await manager.delete_agency(id, current_user.id)
-    session_manager.delete_sessions_by_agency_id(id)
+    await session_manager.delete_sessions_by_agency_id(id)
 
     agencies = await manager.get_agency_list(current_user.id)
-    agencies_for_api = [adapter.to_api(agency) for agency in agencies]
+    agencies_for_api = await adapter.to_api_many(agencies)
     return AgencyListResponse(message="Agency deleted", data=agencies_for_api)
+
+
+@agency_router.post("/agency/import", status_code=HTTPStatus.OK)
+async def import_agency(
+    current_user: Annotated[User, Depends(get_current_user)],
+    adapter: Annotated[AgencyAdapter, Depends(get_agency_adapter)],
+    bundle: AgencyBundle = Body(...),
+    manager: BundleManager = Depends(get_bundle_manager),
+) -> GetAgencyResponse:
+    """Import an agency with its agents and skills (e.g. a line of the export).
+    The bundle is validated as a whole before anything is saved."""
+    agency_config = await manager.import_bundle(bundle, current_user.id)
+    return GetAgencyResponse(message="Imported", data=await adapter.to_api(agency_config))
+
+
+@agency_router.get("/agency/export")
+async def export_agencies(
+    current_user: Annotated[User, Depends(get_current_user)],
+    ids: Annotated[
+        list[str] | None, Query(description="The agencies to export, all the user's agencies by default")
+    ] = None,
+    manager: BundleManager = Depends(get_bundle_manager),
+) -> StreamingResponse:
+    """Export agencies with their agents and skills as newline-delimited JSON, one bundle per line."""
+    # Resolve the requested agencies before streaming, so that errors get a proper status code
+    agencies = await manager.load_agencies(current_user.id, ids)
+
+    async def lines():
+        async for bundle in manager.export_bundles(agencies, current_user.id):
+            yield bundle.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
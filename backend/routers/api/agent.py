@@ -11,11 +11,14 @@ from backend.models.agent_flow_spec import AgentFlowSpecForAPI
 from backend.models.auth import User
 from backend.models.response_models import (
     AgentListResponse,
+    AgentPageResponse,
+    AgentSummaryListResponse,
     GetAgentResponse,
 )
 from backend.services.adapters.agent_adapter import AgentAdapter
 from backend.services.agency_manager import AgencyManager
 from backend.services.agent_manager import AgentManager
+from backend.services.pagination import MAX_PAGE_SIZE, page_size
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +36,24 @@ async def get_agent_list(
     adapter: Annotated[AgentAdapter, Depends(get_agent_adapter)],
     manager: AgentManager = Depends(get_agent_manager),
     owned_by_user: bool = Query(False, description="Filter agents owned by the current user"),
-) -> AgentListResponse:
-    """Get a list of agent configurations."""
-    configs = await manager.get_agent_list(current_user.id, owned_by_user=owned_by_user)
-    configs_for_api = [adapter.to_api(config) for config in configs]
-    return AgentListResponse(data=configs_for_api)
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="The page size, the whole list by default"),
+    page_token: str | None = Query(None, description="The next_page_token of the previous page"),
+    summary: bool = Query(False, description="Return summaries instead of the full configurations"),
+) -> AgentListResponse | AgentPageResponse | AgentSummaryListResponse:
+    """Get a list of agent configurations, or a page of it if `limit` or `page_token` is set."""
+    if (page_limit := page_size(limit, page_token)) is None:
+        configs = await manager.get_agent_list(current_user.id, owned_by_user=owned_by_user, summary=summary)
+        next_page_token = None
+    else:
+        configs, next_page_token = await manager.get_agent_page(
+            current_user.id, page_limit, page_token, owned_by_user=owned_by_user, summary=summary
+        )
+    if summary:
+        return AgentSummaryListResponse(data=configs, next_page_token=next_page_token)
+    configs_for_api = await adapter.to_api_many(configs)
+    if page_limit is None:
+        return AgentListResponse(data=configs_for_api)
+    return AgentPageResponse(data=configs_for_api, next_page_token=next_page_token)
 
 
 @agent_router.get("/agent")
@@ -54,7 +70,7 @@ async def get_agent_config(
     # check if the current user is the owner of the agent
     if config.user_id and config.user_id != current_user.id:
         raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="You don't have permissions to access this agent")
-    config_for_api = adapter.to_api(config)
+    config_for_api = await adapter.to_api(config)
     return GetAgentResponse(data=config_for_api)
 
 
@@ -72,7 +88,7 @@ async def create_or_update_agent(
     await manager.handle_agent_creation_or_update(internal_config, current_user.id)
 
     configs = await manager.get_agent_list(current_user.id)
-    configs_for_api = [adapter.to_api(config) for config in configs]
+    configs_for_api = await adapter.to_api_many(configs)
     return AgentListResponse(message="Saved", data=configs_for_api)
 
 
@@ -86,7 +102,7 @@ async def delete_agent(
 ) -> AgentListResponse:
     """Delete an agent configuration."""
     # Check if the agent is part of any team configurations
-    if agency_manager.is_agent_used_in_agencies(id):
+    if await agency_manager.is_agent_used_in_agencies(id):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail="Agent cannot be deleted as it is currently used in a team configuration",
@@ -95,5 +111,5 @@ async def delete_agent(
     await manager.delete_agent(id, current_user.id)
 
     configs = await manager.get_agent_list(current_user.id)
-    configs_for_api = [adapter.to_api(config) for config in configs]
+    configs_for_api = await adapter.to_api_many(configs)
     return AgentListResponse(message="Agent configuration deleted", data=configs_for_api)
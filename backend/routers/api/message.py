@@ -1,18 +1,25 @@
-import asyncio
 import logging
+from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from backend.constants import INTERNAL_ERROR_MESSAGE
 from backend.dependencies.auth import get_current_user
-from backend.dependencies.dependencies import get_agency_manager, get_message_manager, get_session_manager
+from backend.dependencies.dependencies import (
+    get_agency_manager,
+    get_message_manager,
+    get_run_manager,
+    get_session_manager,
+)
 from backend.models.auth import User
 from backend.models.message import Message
-from backend.models.response_models import MessagePostResponse
+from backend.models.response_models import MessagePostResponse, RunResponse
 from backend.services.agency_manager import AgencyManager
 from backend.services.context_vars_manager import ContextEnvVarsManager
 from backend.services.message_manager import MessageManager
+from backend.services.run_manager import RunManager
+from backend.services.run_scheduler import run_scheduler
 from backend.services.session_manager import SessionManager
 
 logger = logging.getLogger(__name__)
@@ -34,7 +41,7 @@ async def get_message_list(
 ) -> list[Message]:
     """Get the list of messages for the given session_id."""
     # check if the current_user has permissions to send a message to the agency
-    session_config = session_manager.get_session(session_id)
+    session_config = await session_manager.get_session(session_id)
     session_manager.validate_session_ownership(session_config.user_id, current_user.id)
 
     messages = message_manager.get_messages(session_id, limit=limit, before=before)
@@ -52,7 +59,7 @@ async def post_message(
     """Send a message to the User Proxy (the main agent) for the given agency_id and session_id."""
     session_id = request.session_id
 
-    session_config = session_manager.get_session(session_id)
+    session_config = await session_manager.get_session(session_id)
     agency_id = session_config.agency_id
 
     # Set the agency_id in the context variables
@@ -66,17 +73,41 @@ async def post_message(
     )
 
     try:
-        response = await asyncio.to_thread(
-            agency.get_completion, message=request.content, yield_messages=False, message_files=None
+        response = await run_scheduler.run(
+            current_user.id, agency.get_completion, message=request.content, yield_messages=False, message_files=None
         )
     except Exception as e:
         logger.exception(f"Error sending message to agency {agency_id}, session {session_id}")
         raise HTTPException(status_code=500, detail=INTERNAL_ERROR_MESSAGE) from e
 
     # update the session timestamp
-    session_manager.update_session_timestamp(session_id)
+    await session_manager.update_session_timestamp(session_id)
 
     # get the updated list of messages for the session
     messages = message_manager.get_messages(session_id, limit=20)
 
     return MessagePostResponse(data=messages, response=response)
+
+
+@message_router.post("/message/run", status_code=HTTPStatus.ACCEPTED)
+async def start_message_run(
+    current_user: Annotated[User, Depends(get_current_user)],
+    request: Message,
+    client_id: str | None = Query(None, description="The websocket client to notify when the run is finished"),
+    run_manager: RunManager = Depends(get_run_manager),
+) -> RunResponse:
+    """Send a message to the User Proxy (the main agent) of the session without waiting for the response.
+    Returns the run: poll GET /message/run/{run_id}, or pass the client_id of one of your websocket connections
+    (authenticated with a message) to get a run_finished message, then get the messages of the session."""
+    run = await run_manager.start_run(current_user.id, request, client_id)
+    return RunResponse(message="Run started", data=run)
+
+
+@message_router.get("/message/run/{run_id}")
+async def get_message_run(
+    current_user: Annotated[User, Depends(get_current_user)],
+    run_id: str,
+    run_manager: RunManager = Depends(get_run_manager),
+) -> RunResponse:
+    """Return the state of a run started with POST /message/run, and its response once completed."""
+    return RunResponse(data=await run_manager.get_run(run_id, current_user.id))
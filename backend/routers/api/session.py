@@ -8,8 +8,14 @@ from backend.dependencies.auth import get_current_user
 from backend.dependencies.dependencies import get_agency_manager, get_session_manager
 from backend.models.auth import User
 from backend.models.request_models import RenameSessionRequest
-from backend.models.response_models import CreateSessionResponse, SessionListResponse
+from backend.models.response_models import (
+    CreateSessionResponse,
+    SessionListResponse,
+    SessionPageResponse,
+    SessionSummaryListResponse,
+)
 from backend.services.agency_manager import AgencyManager
+from backend.services.pagination import MAX_PAGE_SIZE, page_size
 from backend.services.session_manager import SessionManager
 from backend.utils import sanitize_id
 
@@ -25,10 +31,22 @@ session_router = APIRouter(
 async def get_session_list(
     current_user: Annotated[User, Depends(get_current_user)],
     session_manager: SessionManager = Depends(get_session_manager),
-) -> SessionListResponse:
-    """Return a list of all sessions for the current user."""
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
-    return SessionListResponse(data=sessions_for_api)
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="The page size, the whole list by default"),
+    page_token: str | None = Query(None, description="The next_page_token of the previous page"),
+    summary: bool = Query(False, description="Return summaries instead of the full configurations"),
+) -> SessionListResponse | SessionPageResponse | SessionSummaryListResponse:
+    """Return a list of all sessions for the current user, or a page of it if `limit` or `page_token` is set."""
+    if (page_limit := page_size(limit, page_token)) is None:
+        sessions, next_page_token = await session_manager.get_sessions_for_user(current_user.id, summary=summary), None
+    else:
+        sessions, next_page_token = await session_manager.get_session_page(
+            current_user.id, page_limit, page_token, summary=summary
+        )
+    if summary:
+        return SessionSummaryListResponse(data=sessions, next_page_token=next_page_token)
+    if page_limit is None:
+        return SessionListResponse(data=sessions)
+    return SessionPageResponse(data=sessions, next_page_token=next_page_token)
 
 
 @session_router.post("/session")
@@ -46,11 +64,11 @@ async def create_session(
         agency_id, thread_ids=new_thread_ids, user_id=current_user.id
     )
 
-    session_id = session_manager.create_session(
+    session_id = await session_manager.create_session(
         agency, name=agency_config.name, agency_id=agency_id, user_id=current_user.id, thread_ids=new_thread_ids
     )
 
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id)
     return CreateSessionResponse(data=sessions_for_api, session_id=session_id, message="Session created successfully")
 
 
@@ -59,16 +77,16 @@ async def rename_session(
     current_user: Annotated[User, Depends(get_current_user)],
     payload: RenameSessionRequest = Body(...),
     session_manager: SessionManager = Depends(get_session_manager),
-) -> SessionListResponse:
+) -> SessionListResponse | SessionPageResponse:
     """Rename the session with the given id and return a list of all sessions for the current user."""
     session_id = sanitize_id(payload.id)
     logger.info(f"Renaming session: {session_id}, user: {current_user.id}")
 
-    db_session = session_manager.get_session(session_id)
+    db_session = await session_manager.get_session(session_id)
     session_manager.validate_session_ownership(db_session.user_id, current_user.id)
-    session_manager.rename_session(session_id, payload.name)
+    await session_manager.rename_session(session_id, payload.name)
 
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id)
     return SessionListResponse(message="Session renamed successfully", data=sessions_for_api)
 
 
@@ -77,11 +95,11 @@ async def delete_session(
     current_user: Annotated[User, Depends(get_current_user)],
     id: str = Query(..., description="The unique identifier of the session"),
     session_manager: SessionManager = Depends(get_session_manager),
-) -> SessionListResponse:
+) -> SessionListResponse | SessionPageResponse:
     """Delete the session with the given id and return a list of all sessions for the current user."""
     logger.info(f"Deleting session: {id}, user: {current_user.id}")
 
-    session_manager.delete_session(id)
+    await session_manager.delete_session(id)
 
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id)
     return SessionListResponse(message="Session deleted successfully", data=sessions_for_api)
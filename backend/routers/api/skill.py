@@ -11,8 +11,11 @@ from backend.models.response_models import (
     ExecuteSkillResponse,
     GetSkillResponse,
     SkillListResponse,
+    SkillPageResponse,
+    SkillSummaryListResponse,
 )
 from backend.models.skill_config import SkillConfig
+from backend.services.pagination import MAX_PAGE_SIZE, page_size
 from backend.services.skill_executor import SkillExecutor
 from backend.services.skill_manager import SkillManager
 
@@ -25,10 +28,21 @@ skill_router = APIRouter(tags=["skill"])
 async def get_skill_list(
     current_user: Annotated[User, Depends(get_current_user)],
     manager: SkillManager = Depends(get_skill_manager),
-) -> SkillListResponse:
-    """Get a list of configs for the skills the current user has access to."""
-    skills = manager.get_skill_list(current_user.id)
-    return SkillListResponse(data=skills)
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="The page size, the whole list by default"),
+    page_token: str | None = Query(None, description="The next_page_token of the previous page"),
+    summary: bool = Query(False, description="Return summaries instead of the full configurations"),
+) -> SkillListResponse | SkillPageResponse | SkillSummaryListResponse:
+    """Get a list of configs for the skills the current user has access to,
+    or a page of it if `limit` or `page_token` is set."""
+    if (page_limit := page_size(limit, page_token)) is None:
+        skills, next_page_token = await manager.get_skill_list(current_user.id, summary=summary), None
+    else:
+        skills, next_page_token = await manager.get_skill_page(current_user.id, page_limit, page_token, summary=summary)
+    if summary:
+        return SkillSummaryListResponse(data=skills, next_page_token=next_page_token)
+    if page_limit is None:
+        return SkillListResponse(data=skills)
+    return SkillPageResponse(data=skills, next_page_token=next_page_token)
 
 
 @skill_router.get("/skill")
@@ -40,7 +54,7 @@ async def get_skill_config(
     """Get a skill configuration by ID.
     NOTE: currently this endpoint is not used in the frontend.
     """
-    config = manager.get_skill_config(id)
+    config = await manager.get_skill_config(id)
     manager.check_user_permissions(config, current_user.id)
     return GetSkillResponse(data=config)
 
@@ -56,8 +70,8 @@ async def create_or_update_skill(
     If approved, it will be immediately available for use.
     If not approved, an error message will explain why.
     Note: Skills are limited to 200 lines of code (this is a reliability limitation of o1-mini)."""
-    manager.create_or_update_skill(config, current_user.id)
-    configs = manager.get_skill_list(current_user.id)
+    await manager.create_or_update_skill(config, current_user.id)
+    configs = await manager.get_skill_list(current_user.id)
     return SkillListResponse(data=configs, message=f"Skill {config.title} created or updated")
 
 
@@ -68,8 +82,8 @@ async def delete_skill(
     manager: SkillManager = Depends(get_skill_manager),
 ):
     """Delete a skill configuration."""
-    manager.delete_skill(id, current_user.id)
-    configs = manager.get_skill_list(current_user.id)
+    await manager.delete_skill(id, current_user.id)
+    configs = await manager.get_skill_list(current_user.id)
     return SkillListResponse(data=configs, message="Skill configuration deleted")
 
 
@@ -82,7 +96,7 @@ async def execute_skill(
 ) -> ExecuteSkillResponse:
     """Execute a skill by using the user prompt as input to GPT-4, which fills in the skill kwargs.
     Returns the output of the skill."""
-    config = manager.get_skill_config(payload.id)
+    config = await manager.get_skill_config(payload.id)
     manager.check_user_permissions(config, current_user.id)
 
     # check if the current_user has permissions to execute the skill
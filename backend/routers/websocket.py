@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from backend.dependencies.dependencies import get_websocket, get_websocket_handler
 from backend.services.websocket.websocket_handler import WebSocketHandler
@@ -16,6 +16,7 @@ websocket_router = APIRouter(
 @websocket_router.websocket("/{client_id}")
 async def websocket_session_endpoint(
     client_id: str,
+    session_id: str | None = Query(None, description="The session to prepare the agency for"),
     websocket=Depends(get_websocket),
     websocket_handler: WebSocketHandler = Depends(get_websocket_handler),
 ) -> None:
@@ -24,7 +25,8 @@ async def websocket_session_endpoint(
     Send messages to and from the user proxy of the given agency.
 
     :param client_id: The client ID.
+    :param session_id: The session the client is going to use, if known.
     :param websocket: The WebSocket connection.
     :param websocket_handler: The WebSocket handler instance.
     """
-    await websocket_handler.handle_websocket_connection(websocket, client_id)
+    await websocket_handler.handle_websocket_connection(websocket, client_id, session_id)
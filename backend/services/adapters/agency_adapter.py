@@ -1,5 +1,6 @@
 from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI, CommunicationFlow
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
+from backend.models.agent_flow_spec import AgentFlowSpecForAPI
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
 from backend.services.adapters.agent_adapter import AgentAdapter
 
 
@@ -11,7 +12,7 @@ class AgencyAdapter:
     (AgencyConfigForAPI Pydantic model); and vice versa.
     """
 
-    def __init__(self, agent_flow_spec_storage: AgentFlowSpecStorage, agent_adapter: AgentAdapter):
+    def __init__(self, agent_flow_spec_storage: AsyncAgentFlowSpecStorage, agent_adapter: AgentAdapter):
         self.agent_flow_spec_storage = agent_flow_spec_storage
         self.agent_adapter = agent_adapter
 
@@ -41,7 +42,7 @@ class AgencyAdapter:
         agency_config_dict["agency_chart"] = agency_chart
         return AgencyConfig(**agency_config_dict)
 
-    def to_api(self, agency_config: AgencyConfig) -> AgencyConfigForAPI:
+    async def to_api(self, agency_config: AgencyConfig) -> AgencyConfigForAPI:
         """
         Converts the `agents` field with a list of IDs and `main_agent` and `agency_chart` fields with names
         of the agents (AgencyConfig Pydantic model) into AgentFlowSpec objects in the `flows` field
@@ -49,25 +50,44 @@ class AgencyAdapter:
         Uses the agent_flow_spec_storage.load_by_ids method to get the AgentFlowSpec objects.
         The `receiver` field is optional if there is only one row in the flow list.
         """
+        return (await self.to_api_many([agency_config]))[0]
+
+    async def to_api_many(self, agency_configs: list[AgencyConfig]) -> list[AgencyConfigForAPI]:
+        """
+        Converts several agencies at once: the agents of all of them are loaded with a single load_by_ids call
+        and converted with a single AgentAdapter.to_api_many call.
+        """
+        agent_ids = list(
+            dict.fromkeys(agent_id for agency_config in agency_configs for agent_id in agency_config.agents)
+        )
+        agents: dict[str, AgentFlowSpecForAPI] = {}
+        if agent_ids:
+            agent_list = await self.agent_flow_spec_storage.load_by_ids(agent_ids)
+            agents = {agent.id: agent for agent in await self.agent_adapter.to_api_many(agent_list)}
+        return [self._build_api_model(agency_config, agents) for agency_config in agency_configs]
+
+    @staticmethod
+    def _build_api_model(agency_config: AgencyConfig, agents: dict[str, AgentFlowSpecForAPI]) -> AgencyConfigForAPI:
         if not agency_config.agents:
             return AgencyConfigForAPI(**agency_config.model_dump())
 
-        agent_list = self.agent_flow_spec_storage.load_by_ids(agency_config.agents)
-        agents = {agent.config.name: agent for agent in agent_list}
+        agents_by_name = {
+            agents[agent_id].config.name: agents[agent_id] for agent_id in agency_config.agents if agent_id in agents
+        }
 
         flows = []
         if agency_config.agency_chart:
             for sender_name, receiver_name in agency_config.agency_chart.values():
-                sender = agents[sender_name]
-                receiver = agents[receiver_name] if receiver_name else None
+                sender = agents_by_name[sender_name]
+                receiver = agents_by_name[receiver_name] if receiver_name else None
                 flow = CommunicationFlow(
-                    sender=self.agent_adapter.to_api(sender),
-                    receiver=self.agent_adapter.to_api(receiver) if receiver else None,
+                    sender=sender.model_copy(deep=True),
+                    receiver=receiver.model_copy(deep=True) if receiver else None,
                 )
                 flows.append(flow)
         else:
-            main_agent = agents[agency_config.main_agent]
-            flow = CommunicationFlow(sender=self.agent_adapter.to_api(main_agent))
+            main_agent = agents_by_name[agency_config.main_agent]
+            flow = CommunicationFlow(sender=main_agent.model_copy(deep=True))
             flows.append(flow)
 
         agency_config_dict = agency_config.model_dump()
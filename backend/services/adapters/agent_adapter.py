@@ -1,5 +1,6 @@
 from backend.models.agent_flow_spec import AgentFlowSpec, AgentFlowSpecForAPI
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.models.skill_config import SkillConfig
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
 
 
 class AgentAdapter:
@@ -9,7 +10,7 @@ class AgentAdapter:
     to a list of SkillConfig objects (frontend) and vice versa.
     """
 
-    def __init__(self, skill_config_storage: SkillConfigStorage):
+    def __init__(self, skill_config_storage: AsyncSkillConfigStorage):
         self.skill_config_storage = skill_config_storage
 
     @staticmethod
@@ -23,16 +24,31 @@ class AgentAdapter:
         agent_flow_spec_dict["skills"] = skill_names
         return AgentFlowSpec.model_validate(agent_flow_spec_dict)
 
-    def to_api(self, agent_flow_spec: AgentFlowSpec) -> AgentFlowSpecForAPI:
+    async def to_api(self, agent_flow_spec: AgentFlowSpec) -> AgentFlowSpecForAPI:
         """
         Converts the `skills` field from a list of strings to a list of SkillConfig objects.
         """
-        if not agent_flow_spec.skills:
-            return AgentFlowSpecForAPI.model_validate(agent_flow_spec.model_dump())
+        return (await self.to_api_many([agent_flow_spec]))[0]
 
-        skill_configs = self.skill_config_storage.load_by_titles(agent_flow_spec.skills)
+    async def to_api_many(self, agent_flow_specs: list[AgentFlowSpec]) -> list[AgentFlowSpecForAPI]:
+        """
+        Converts several agents at once, loading the skills of all of them with a single load_by_titles call.
+        """
+        titles = list(dict.fromkeys(title for agent_flow_spec in agent_flow_specs for title in agent_flow_spec.skills))
+        skill_configs: dict[str, list[SkillConfig]] = {}
+        if titles:
+            for skill_config in await self.skill_config_storage.load_by_titles(titles):
+                skill_configs.setdefault(skill_config.title, []).append(skill_config)
+        return [self._build_api_model(agent_flow_spec, skill_configs) for agent_flow_spec in agent_flow_specs]
 
+    @staticmethod
+    def _build_api_model(
+        agent_flow_spec: AgentFlowSpec, skill_configs: dict[str, list[SkillConfig]]
+    ) -> AgentFlowSpecForAPI:
         agent_flow_spec_dict = agent_flow_spec.model_dump()
-        agent_flow_spec_dict["skills"] = skill_configs
-        agent_flow_spec_new = AgentFlowSpecForAPI.model_validate(agent_flow_spec_dict)
-        return agent_flow_spec_new
+        agent_flow_spec_dict["skills"] = [
+            skill_config.model_copy(deep=True)
+            for title in dict.fromkeys(agent_flow_spec.skills)
+            for skill_config in skill_configs.get(title, [])
+        ]
+        return AgentFlowSpecForAPI.model_validate(agent_flow_spec_dict)
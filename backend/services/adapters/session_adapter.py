@@ -1,6 +1,7 @@
 from backend.exceptions import NotFoundError
+from backend.models.agency_config import AgencyConfigForAPI
 from backend.models.session_config import SessionConfig, SessionConfigForAPI
-from backend.repositories.agency_config_storage import AgencyConfigStorage
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
 from backend.services.adapters.agency_adapter import AgencyAdapter
 
 
@@ -10,21 +11,42 @@ class SessionAdapter:
     In particular, it fills the `flow_config` field with an AgencyConfigForAPI object based on an agency_id string.
     """
 
-    def __init__(self, agency_config_storage: AgencyConfigStorage, agency_adapter: AgencyAdapter):
+    def __init__(self, agency_config_storage: AsyncAgencyConfigStorage, agency_adapter: AgencyAdapter):
         self.agency_config_storage = agency_config_storage
         self.agency_adapter = agency_adapter
 
-    def to_api(self, session_config: SessionConfig) -> SessionConfigForAPI:
+    async def to_api(self, session_config: SessionConfig) -> SessionConfigForAPI:
         """
         Converts the SessionConfig model to the API model.
         """
-        agency_config = self.agency_config_storage.load_by_id(session_config.agency_id)
+        agency_config = await self.agency_config_storage.load_by_id(session_config.agency_id)
         if agency_config is None:
             raise NotFoundError("Agency", session_config.agency_id)
 
-        agency_config_for_api = self.agency_adapter.to_api(agency_config)
+        agency_config_for_api = await self.agency_adapter.to_api(agency_config)
+        return self._build_api_model(session_config, agency_config_for_api)
 
+    async def to_api_many(self, session_configs: list[SessionConfig]) -> list[SessionConfigForAPI]:
+        """
+        Converts several sessions at once. The distinct agencies are loaded and converted once for all the sessions,
+        so the number of storage reads doesn't grow with the number of sessions.
+        """
+        agency_ids = list(dict.fromkeys(session_config.agency_id for session_config in session_configs))
+        agency_list = await self.agency_config_storage.load_by_ids(agency_ids) if agency_ids else []
+        agencies = {agency.id: agency for agency in await self.agency_adapter.to_api_many(agency_list)}
+
+        sessions_for_api = []
+        for session_config in session_configs:
+            agency_config_for_api = agencies.get(session_config.agency_id)
+            if agency_config_for_api is None:
+                raise NotFoundError("Agency", session_config.agency_id)
+            sessions_for_api.append(self._build_api_model(session_config, agency_config_for_api.model_copy(deep=True)))
+        return sessions_for_api
+
+    @staticmethod
+    def _build_api_model(
+        session_config: SessionConfig, agency_config_for_api: AgencyConfigForAPI
+    ) -> SessionConfigForAPI:
         session_config_dict = session_config.model_dump()
         session_config_dict["flow_config"] = agency_config_for_api
-        session_config_new = SessionConfigForAPI.model_validate(session_config_dict)
-        return session_config_new
+        return SessionConfigForAPI.model_validate(session_config_dict)
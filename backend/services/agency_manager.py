@@ -1,47 +1,89 @@
-import json
+import asyncio
+import copy
 import logging
 from datetime import UTC, datetime
 from http import HTTPStatus
 from typing import Any
 
-from agency_swarm import Agency, Agent
-from cachetools import LRUCache
+from agency_swarm import Agency, Agent, BaseTool
+from agency_swarm.util.shared_state import SharedState
 from fastapi import HTTPException
 
 from backend.exceptions import NotFoundError
-from backend.models.agency_config import AgencyConfig
-from backend.repositories.agency_config_storage import AgencyConfigStorage
-from backend.services.agent_manager import AgentManager
+from backend.models.agency_config import AgencyConfig, AgencyConfigSummary
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
+from backend.services.agency_pool import AgencyPool, estimate_size
+from backend.services.agent_manager import AgentManager, shared_agent_objects
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.context_vars_manager import ContextEnvVarsManager
+from backend.services.pagination import decode_page_token, merge_page
+from backend.services.template_catalog import TemplateCatalog
 from backend.services.user_variable_manager import UserVariableManager
+from backend.settings import settings
 from backend.utils import hash_string
 
 logger = logging.getLogger(__name__)
 
-agency_cache: LRUCache = LRUCache(maxsize=1000)
+# Constructed agencies by agency config version, shared by all the sessions of the agency (see _bind_threads)
+agency_pool = AgencyPool(settings.agency_pool_max_bytes, settings.agency_pool_max_idle_seconds)
+# The constructions in progress by cache key: concurrent requests for the same agency wait for the same one
+pending_constructions: dict[str, asyncio.Future] = {}
+
+
+def _invalidate_agencies() -> None:
+    agency_pool.clear()
+    # A construction started before the change must not be cached
+    pending_constructions.clear()
+
+
+# Constructed agencies embed their agents, skills and the user's OpenAI client: drop them when any of these change
+for kind in ("agency", "agent", "skill", "user_variables", "agency_pool"):
+    cache_invalidation_bus.subscribe(kind, lambda _: _invalidate_agencies())
 
 
 class AgencyManager:
     def __init__(
         self,
         agent_manager: AgentManager,
-        agency_config_storage: AgencyConfigStorage,
+        agency_config_storage: AsyncAgencyConfigStorage,
         user_variable_manager: UserVariableManager,
+        template_catalog: TemplateCatalog | None = None,
     ) -> None:
         self.storage = agency_config_storage
         self.agent_manager = agent_manager
         self.user_variable_manager = user_variable_manager
+        self.template_catalog = template_catalog
 
-    async def get_agency_list(self, user_id: str) -> list[AgencyConfig]:
-        """Get the list of agencies for the user. It will return the agencies for the user and the templates."""
-        user_agencies = self.storage.load_by_user_id(user_id)
-        template_agencies = self.storage.load_by_user_id(None)
-        agencies = user_agencies + template_agencies
+    async def get_agency_list(
+        self, user_id: str, summary: bool = False
+    ) -> list[AgencyConfig] | list[AgencyConfigSummary]:
+        """Get the list of agencies for the user. It will return the agencies for the user and the templates.
+        With summary=True it returns AgencyConfigSummary items."""
+        user_agencies = await self.storage.load_by_user_id(user_id, summary=summary)
+        agencies = user_agencies + await self._get_template_agencies(summary)
         sorted_agencies = sorted(agencies, key=lambda x: x.timestamp, reverse=True)
         return sorted_agencies
 
+    async def get_agency_page(
+        self, user_id: str, limit: int, page_token: str | None = None, summary: bool = False
+    ) -> tuple[list[AgencyConfig] | list[AgencyConfigSummary], str | None]:
+        """Get a page of the agency list, see get_agency_list. Returns the page and the token of the next page."""
+        after = decode_page_token(page_token)
+        user_agencies = await self.storage.load_page_by_user_id(user_id, limit + 1, after, summary=summary)
+        return merge_page([user_agencies, await self._get_template_agencies(summary)], limit, after)
+
+    async def _get_template_agencies(self, summary: bool = False) -> list[AgencyConfig] | list[AgencyConfigSummary]:
+        if self.template_catalog:
+            templates = await self.template_catalog.get_templates("agency")
+        else:
+            templates = await self.storage.load_by_user_id(None)
+        if summary:
+            return [AgencyConfigSummary.model_validate(template.model_dump()) for template in templates]
+        return templates
+
     async def get_agency_config(self, id_: str, user_id: str, allow_template: bool = False) -> AgencyConfig:
         """Get the agency configuration by ID."""
-        agency_config = self.storage.load_by_id(id_)
+        agency_config = await self.storage.load_by_id(id_)
         if not agency_config:
             raise NotFoundError("Agency", id_)
         self.validate_agency_ownership(agency_config.user_id, user_id, allow_template=allow_template)
@@ -56,9 +98,16 @@ class AgencyManager:
         agency = await self._construct_agency_and_update_assistants(agency_config, thread_ids)
         return agency, agency_config
 
-    def is_agent_used_in_agencies(self, agent_id: str) -> bool:
+    async def warm_up(self, agency_id: str, user_id: str) -> None:
+        """Construct and cache the agency ahead of the first message of a session (see background_tasks).
+        Meant to run in a context of its own: the agents get the OpenAI client of the user from the context."""
+        ContextEnvVarsManager.set("user_id", user_id)
+        agency_config = await self.get_agency_config(agency_id, user_id)
+        await self._get_constructed_agency(agency_config)
+
+    async def is_agent_used_in_agencies(self, agent_id: str) -> bool:
         """Check if the agent is part of any agency configurations."""
-        return len(self.storage.load_by_agent_id(agent_id)) > 0
+        return len(await self.storage.load_by_agent_id(agent_id)) > 0
 
     async def handle_agency_creation_or_update(self, config: AgencyConfig, current_user_id: str) -> str:
         """Handle the agency creation or update. It will check the permissions and update the agency in the Firestore
@@ -71,11 +120,11 @@ class AgencyManager:
 
         # Check permissions
         if config.id:
-            config_db = self.storage.load_by_id(config.id)
+            config_db = await self.storage.load_by_id(config.id)
             if not config_db:
                 raise NotFoundError("Agency", config.id)
             self.validate_agency_ownership(config_db.user_id, current_user_id)
-        self._validate_agent_ownership(config.agents, current_user_id)
+        await self._validate_agent_ownership(config.agents, current_user_id)
 
         # Ensure the agency is associated with the current user
         config.user_id = current_user_id
@@ -84,23 +133,25 @@ class AgencyManager:
         return await self._create_or_update_agency(config)
 
     async def _load_and_construct_agents(self, agency_config: AgencyConfig) -> dict[str, Agent]:
+        """Load the agents of the agency (in one batched read) and construct them concurrently."""
         agents = {}
+        found_ids = set()
+        for agent, agent_flow_spec in await self.agent_manager.get_agents(agency_config.agents):
+            agents[agent_flow_spec.config.name] = agent
+            found_ids.add(agent_flow_spec.id)
         for agent_id in agency_config.agents:
-            get_result = await self.agent_manager.get_agent(agent_id)
-            if get_result:
-                agent, agent_flow_spec = get_result
-                agents[agent_flow_spec.config.name] = agent
-            else:
+            if agent_id not in found_ids:
                 logger.error(f"Agent with id {agent_id} not found.")
         return agents
 
     async def delete_agency(self, agency_id: str, current_user_id: str) -> None:
         """Delete the agency from the Firestore."""
-        agency_config = self.storage.load_by_id(agency_id)
+        agency_config = await self.storage.load_by_id(agency_id)
         if not agency_config:
             raise NotFoundError("Agency", agency_id)
         self.validate_agency_ownership(agency_config.user_id, current_user_id)
-        self.storage.delete(agency_id)
+        await self.storage.delete(agency_id)
+        cache_invalidation_bus.publish("agency", agency_id)
 
     @staticmethod
     def validate_agency_ownership(
@@ -117,23 +168,57 @@ class AgencyManager:
     async def _create_or_update_agency(self, agency_config: AgencyConfig) -> str:
         """Update or create the agency. It will update the agency in the Firestore."""
         AgencyConfig.model_validate(agency_config.model_dump())
-        return self.storage.save(agency_config)
+        agency_id = await self.storage.save(agency_config)
+        cache_invalidation_bus.publish("agency", agency_id)
+        return agency_id
 
     async def _construct_agency_and_update_assistants(
-        self, agency_config: AgencyConfig, thread_ids: dict[str, Any]
+        self, agency_config: AgencyConfig, thread_ids: dict[str, Any] | None
     ) -> Agency:
         """Create the agency using external library agency-swarm. It is a wrapper around OpenAI API.
         It saves all the settings in the settings.json file (in the root folder, not thread safe)
         Gets the agency config from the Firestore, constructs agents and agency
-        (agency-swarm also updates assistants). Returns the Agency instance if successful, otherwise None.
+        and updates the assistants. Returns the Agency instance if successful, otherwise None.
+        The constructed agency is cached by the agency config, the session threads are bound to a copy of it.
         """
-        # Check if the agency is already in the cache
-        agency_config_str = agency_config.model_dump_json()
-        thread_ids_str = json.dumps(thread_ids)
-        cache_key = hash_string(agency_config_str + thread_ids_str)
-        if cache_key in agency_cache:
-            return agency_cache[cache_key]
+        agency = await self._get_constructed_agency(agency_config)
+        return self._bind_threads(agency, thread_ids)
+
+    async def _get_constructed_agency(self, agency_config: AgencyConfig) -> Agency:
+        """Get the constructed agency from the pool, or construct it (once for all the concurrent requests)."""
+        # Check if the agency is already in the pool
+        cache_key = hash_string(agency_config.model_dump_json())
+        agency = agency_pool.get(cache_key)
+        if agency is not None:
+            return agency
+
+        construction = pending_constructions.get(cache_key)
+        if construction is None:
+            construction = asyncio.ensure_future(self._construct_and_measure_agency(agency_config))
+            pending_constructions[cache_key] = construction
+            construction.add_done_callback(lambda future: self._construction_done(cache_key, agency_config.id, future))
+        # A cancelled request doesn't cancel the construction the other requests are waiting for
+        agency, _ = await asyncio.shield(construction)
+        return agency
+
+    async def _construct_and_measure_agency(self, agency_config: AgencyConfig) -> tuple[Agency, int]:
+        """Construct the agency and estimate its size for the pool, without the parts shared with the cached agents."""
+        agency = await self._construct_agency(agency_config)
+        return agency, await asyncio.to_thread(estimate_size, agency, shared_agent_objects())
 
+    @staticmethod
+    def _construction_done(cache_key: str, agency_id: str | None, construction: asyncio.Future) -> None:
+        # Not pending anymore if the pool was invalidated in the meantime
+        if pending_constructions.get(cache_key) is not construction:
+            return
+        del pending_constructions[cache_key]
+        if not construction.cancelled() and construction.exception() is None:
+            # Store the constructed agency in the pool
+            agency, size = construction.result()
+            agency_pool.put(cache_key, agency, size=size, label=agency_id)
+
+    async def _construct_agency(self, agency_config: AgencyConfig) -> Agency:
+        """Construct the agents and the agency without threads."""
         agents = await self._load_and_construct_agents(agency_config)
 
         agency_chart = []
@@ -144,25 +229,61 @@ class AgencyManager:
                 new_agency_chart = [[agents[name] for name in layer] for layer in agency_config.agency_chart.values()]
                 agency_chart.extend(new_agency_chart)
 
-        # Call Agency.__init__ to create or update the agency
-        agency = Agency(
-            agency_chart,
-            shared_instructions=agency_config.shared_instructions,
-            threads_callbacks=(
-                {"load": lambda: thread_ids, "save": lambda x: thread_ids.update(x)} if thread_ids is not None else None
-            ),
-        )
+        # Call Agency.__init__ to create the agency, then update the assistants that are out of sync
+        agency = Agency(agency_chart, shared_instructions=agency_config.shared_instructions)
+        await self.agent_manager.sync_assistants(agency.agents)
+        return agency
 
-        # Store the constructed agency in the cache
-        agency_cache[cache_key] = agency
+    @staticmethod
+    def _bind_threads(agency: Agency, thread_ids: dict[str, Any] | None) -> Agency:
+        """Get a copy of the constructed agency bound to the session threads.
+        The agents are shallow copies sharing the assistants and the clients with the cached agency. The threads,
+        the SendMessage tools bound to them and the shared state belong to the session: agency-swarm keeps the
+        shared state on the tool classes, so the session gets subclasses of the tools of the cached agency.
+        The missing thread ids are created and saved into thread_ids (agency-swarm threads_callbacks).
 
-        return agency
+        Relies on the internals of agency-swarm (pinned in pyproject.toml): Agency._init_threads,
+        Agency._create_special_tools and the layout of Agency.agents_and_threads."""
+        session_agency = copy.copy(agency)
+        session_agency.shared_state = SharedState()
+        agents = {}
+        for agent in agency.agents:
+            agents[agent.name] = copy.copy(agent)
+            # The SendMessage tools are replaced below
+            agents[agent.name].tools = [AgencyManager._session_tool(tool) for tool in agent.tools]
+            agents[agent.name].shared_state = session_agency.shared_state
+        session_agency.agents = list(agents.values())
+        session_agency.ceo = agents[agency.ceo.name] if agency.ceo else None
+        session_agency.main_recipients = [agents[agent.name] for agent in agency.main_recipients]
+        session_agency.threads_callbacks = (
+            {"load": lambda: thread_ids, "save": lambda x: thread_ids.update(x)} if thread_ids is not None else None
+        )
+        # The same structure as after Agency._parse_agency_chart, agency-swarm creates the threads from it
+        session_agency.agents_and_threads = {
+            agent_name: {
+                other_agent: {"agent": thread.agent.name, "recipient_agent": thread.recipient_agent.name}
+                for other_agent, thread in threads.items()
+            }
+            for agent_name, threads in agency.agents_and_threads.items()
+            if agent_name != "main_thread"
+        }
+        session_agency._init_threads()
+        session_agency._create_special_tools()
+        return session_agency
+
+    @staticmethod
+    def _session_tool(tool: type) -> type:
+        """A subclass of the tool for the shared state of a session, the same tool for the assistant."""
+        if not issubclass(tool, BaseTool):
+            return tool
+        return type(tool.__name__, (tool,), {"__module__": tool.__module__, "__doc__": tool.__doc__})
 
-    def _validate_agent_ownership(self, agents: list[str], current_user_id: str) -> None:
+    async def _validate_agent_ownership(self, agents: list[str], current_user_id: str) -> None:
         """Validate the agent ownership. It will check if the current user has permissions to use the agents."""
         # check that all used agents belong to the current user
+        agent_flow_specs = {config.id: config for config in await self.agent_manager.storage.load_by_ids(agents)}
         for agent_id in agents:
-            agent_flow_spec = self.agent_manager.storage.load_by_id(agent_id)
+            agent_flow_spec = agent_flow_specs.get(agent_id)
             if not agent_flow_spec:
                 raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Agent not found: {agent_id}")
             if agent_flow_spec.user_id != current_user_id:
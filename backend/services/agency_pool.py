@@ -0,0 +1,150 @@
+import gc
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from types import FunctionType, MethodDescriptorType, ModuleType, WrapperDescriptorType
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+# Shared by all the agencies (and everything else), not counted in the size of an entry
+_SHARED_TYPES = (type, ModuleType, FunctionType, OpenAI, AsyncOpenAI, httpx.Client, httpx.AsyncClient)
+_BUILTIN_METHOD_TYPES = (MethodDescriptorType, WrapperDescriptorType)
+# Stop walking huge object graphs: the estimate only has to be in the right ballpark
+MAX_SIZE_ESTIMATE_OBJECTS = 200_000
+
+
+def estimate_size(obj: Any, shared: Iterable[Any] = ()) -> int:
+    """Estimate the memory held by an object: the sizes of the objects reachable from it, classes, functions,
+    modules and the OpenAI and HTTP clients excluded. The walk also stops at the given shared objects (e.g. the
+    cached agents the agencies are built from), which are charged to none of the entries."""
+    shared_ids = {id(shared_obj) for shared_obj in shared}
+    seen: set[int] = set()
+    pending = [obj]
+    size = 0
+    while pending and len(seen) < MAX_SIZE_ESTIMATE_OBJECTS:
+        current = pending.pop()
+        if id(current) in seen or id(current) in shared_ids or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        # Don't run __sizeof__ overridden in Python (e.g. mocks), only the builtin ones
+        if isinstance(inspect.getattr_static(type(current), "__sizeof__"), _BUILTIN_METHOD_TYPES):
+            size += sys.getsizeof(current, 0)
+        else:
+            size += object.__sizeof__(current)
+        pending.extend(gc.get_referents(current))
+    return size
+
+
+class PoolEntry:
+    def __init__(self, value: Any, size: int, label: str | None, last_used: float):
+        self.value = value
+        self.size = size
+        self.label = label
+        self.last_used = last_used
+
+
+class AgencyPool:
+    """In-process pool of constructed agencies by cache key, see agency_manager.
+
+    Entries are dropped after max_idle_seconds without use, and the least recently used ones are dropped while
+    the estimated total size exceeds max_bytes (the newest entry is kept even if it exceeds it alone).
+    Expired entries are dropped lazily, on access. Safe to use from any thread.
+    """
+
+    def __init__(self, max_bytes: int, max_idle_seconds: float, timer: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.max_idle_seconds = max_idle_seconds
+        self._timer = timer
+        self._entries: OrderedDict[str, PoolEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry.last_used = self._timer()
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def put(self, key: str, value: Any, size: int | None = None, label: str | None = None) -> None:
+        """Add an entry. The size is estimated if not given (see estimate_size), the label is for the inspection."""
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = PoolEntry(value, size, label, self._timer())
+            self._size += size
+            self._evict_idle()
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> int:
+        """Drop all the entries. Returns the number of dropped entries."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._size = 0
+            return count
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._evict_idle()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "max_idle_seconds": self.max_idle_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def entries(self) -> list[dict[str, Any]]:
+        """The entries, least recently used first."""
+        with self._lock:
+            self._evict_idle()
+            now = self._timer()
+            return [
+                {"key": key, "label": entry.label, "size_bytes": entry.size, "idle_seconds": now - entry.last_used}
+                for key, entry in self._entries.items()
+            ]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def _evict_idle(self) -> None:
+        deadline = self._timer() - self.max_idle_seconds
+        # The entries are ordered by the last use
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.last_used > deadline:
+                break
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
@@ -1,33 +1,84 @@
 import asyncio
+import contextvars
+import copy
+import json
 import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from http import HTTPStatus
+from typing import Any
 
 from agency_swarm import Agent
+from cachetools import LRUCache
 from fastapi import HTTPException
 
 from backend.constants import DEFAULT_OPENAI_API_TIMEOUT
 from backend.custom_skills import skill_registry
 from backend.exceptions import NotFoundError
-from backend.models.agent_flow_spec import AgentFlowSpec
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.models.agent_flow_spec import AgentFlowSpec, AgentFlowSpecSummary
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
 from backend.services.oai_client import get_openai_client
+from backend.services.pagination import decode_page_token, merge_page
+from backend.services.template_catalog import TemplateCatalog
 from backend.services.user_variable_manager import UserVariableManager
+from backend.settings import settings
+from backend.utils import hash_string
 
 logger = logging.getLogger(__name__)
 
+# Constructing an agent (loading the tools and the files folder) is blocking. Agencies construct their agents
+# in parallel on these threads, the size of the pool bounds the concurrency.
+agent_construction_executor = ThreadPoolExecutor(
+    max_workers=settings.agent_construction_workers, thread_name_prefix="agent-construction"
+)
+
+# Constructed agents by (agent id, config timestamp), the agencies get copies of them (see _copy_agent)
+agent_cache: LRUCache[tuple[str, str], Agent] = LRUCache(maxsize=settings.agent_cache_maxsize)
+_agent_cache_lock = threading.Lock()
+# Bumped by each invalidation: a construction started before it must not be cached
+_agent_cache_generation = 0
+
+
+def _invalidate_agents(agent_id: str | None) -> None:
+    global _agent_cache_generation
+    with _agent_cache_lock:
+        _agent_cache_generation += 1
+        if agent_id is None:
+            agent_cache.clear()
+            return
+        for key in [key for key in agent_cache if key[0] == agent_id]:
+            del agent_cache[key]
+
+
+def shared_agent_objects() -> list[Any]:
+    """The cached agents and their attributes, shared with the copies handed to the agencies (see _copy_agent)."""
+    with _agent_cache_lock:
+        agents = list(agent_cache.values())
+    return [*agents, *(value for agent in agents for value in vars(agent).values())]
+
+
+cache_invalidation_bus.subscribe("agent", _invalidate_agents)
+# The tools are the skill classes and the agents hold the user's OpenAI client
+for kind in ("skill", "user_variables"):
+    cache_invalidation_bus.subscribe(kind, lambda _: _invalidate_agents(None))
+
 
 class AgentManager:
     def __init__(
         self,
-        storage: AgentFlowSpecStorage,
+        storage: AsyncAgentFlowSpecStorage,
         user_variable_manager: UserVariableManager,
-        skill_storage: SkillConfigStorage,
+        skill_storage: AsyncSkillConfigStorage,
+        template_catalog: TemplateCatalog | None = None,
     ) -> None:
         self.user_variable_manager = user_variable_manager
         self.storage = storage
         self.skill_storage = skill_storage
+        self.template_catalog = template_catalog
         self._openai_client = None
 
     @property
@@ -37,20 +88,65 @@ class AgentManager:
             self._openai_client = get_openai_client(self.user_variable_manager)
         return self._openai_client
 
-    async def get_agent_list(self, user_id: str, owned_by_user: bool = False) -> list[AgentFlowSpec]:
-        user_configs = self.storage.load_by_user_id(user_id)
-        template_configs = self.storage.load_by_user_id(None) if not owned_by_user else []
+    async def get_agent_list(
+        self, user_id: str, owned_by_user: bool = False, summary: bool = False
+    ) -> list[AgentFlowSpec] | list[AgentFlowSpecSummary]:
+        user_configs = await self.storage.load_by_user_id(user_id, summary=summary)
+        template_configs = [] if owned_by_user else await self._get_template_agents(summary)
         agents = user_configs + template_configs
         sorted_agents = sorted(agents, key=lambda x: x.timestamp, reverse=True)
         return sorted_agents
 
+    async def get_agent_page(
+        self,
+        user_id: str,
+        limit: int,
+        page_token: str | None = None,
+        owned_by_user: bool = False,
+        summary: bool = False,
+    ) -> tuple[list[AgentFlowSpec] | list[AgentFlowSpecSummary], str | None]:
+        """Get a page of the agent list, see get_agent_list. Returns the page and the token of the next page."""
+        after = decode_page_token(page_token)
+        user_configs = await self.storage.load_page_by_user_id(user_id, limit + 1, after, summary=summary)
+        template_configs = [] if owned_by_user else await self._get_template_agents(summary)
+        return merge_page([user_configs, template_configs], limit, after)
+
+    async def _get_template_agents(self, summary: bool = False) -> list[AgentFlowSpec] | list[AgentFlowSpecSummary]:
+        if self.template_catalog:
+            templates = await self.template_catalog.get_templates("agent")
+        else:
+            templates = await self.storage.load_by_user_id(None)
+        if summary:
+            return [AgentFlowSpecSummary.model_validate(template.model_dump()) for template in templates]
+        return templates
+
     async def get_agent(self, agent_id: str) -> tuple[Agent, AgentFlowSpec]:
-        config = self.storage.load_by_id(agent_id)
+        config = await self.storage.load_by_id(agent_id)
         if not config:
             raise NotFoundError("Agent", agent_id)
-        agent = await asyncio.to_thread(self._construct_agent, config)
+        agent = await self._get_constructed_agent(config)
         return agent, config
 
+    async def get_agents(self, agent_ids: list[str]) -> list[tuple[Agent, AgentFlowSpec]]:
+        """Get several agents: the configs are loaded with a single batched read and the agents are constructed
+        in parallel (see agent_construction_executor). Missing agents are skipped, the order of the ids is kept."""
+        configs = await self.storage.load_by_ids(agent_ids)
+        agents = await asyncio.gather(*(self._get_constructed_agent(config) for config in configs))
+        return list(zip(agents, configs, strict=True))
+
+    async def _get_constructed_agent(self, config: AgentFlowSpec) -> Agent:
+        """Construct the agent, or copy the one constructed for the same version of the config."""
+        key = (config.id, config.timestamp)
+        with _agent_cache_lock:
+            agent = agent_cache.get(key)
+            generation = _agent_cache_generation
+        if agent is None:
+            agent = await _run_in_construction_executor(self._construct_agent, config)
+            with _agent_cache_lock:
+                if generation == _agent_cache_generation:
+                    agent_cache[key] = agent
+        return _copy_agent(agent)
+
     async def handle_agent_creation_or_update(self, config: AgentFlowSpec, current_user_id: str) -> str:
         """Create or update an agent. If the agent already exists, it will be updated."""
         # Support template configs
@@ -60,43 +156,95 @@ class AgentManager:
 
         # Check permissions and validate agent name
         if config.id:
-            config_db = self.storage.load_by_id(config.id)
+            config_db = await self.storage.load_by_id(config.id)
             if not config_db:
                 raise NotFoundError("Agent", config.id)
             self._validate_agent_ownership(config_db, current_user_id)
             self._validate_agent_name(config, config_db)
+            config.assistant_fingerprint = config_db.assistant_fingerprint
 
         # Ensure the agent is associated with the current user
         config.user_id = current_user_id
         config.timestamp = datetime.now(UTC).isoformat()
 
         # Validate skills
-        self._validate_skills(config.skills)
+        await self._validate_skills(config.skills)
 
         return await self._create_or_update_agent(config)
 
     async def delete_agent(self, agent_id: str, current_user_id: str) -> None:
-        config = self.storage.load_by_id(agent_id)
+        config = await self.storage.load_by_id(agent_id)
         if not config:
             raise NotFoundError("Agent", agent_id)
         self._validate_agent_ownership(config, current_user_id)
-        self.storage.delete(agent_id)
+        await self.storage.delete(agent_id)
+        cache_invalidation_bus.publish("agent", agent_id)
 
         self.openai_client.beta.assistants.delete(assistant_id=agent_id, timeout=DEFAULT_OPENAI_API_TIMEOUT)
 
+    async def create_or_update_agents(self, configs: list[AgentFlowSpec]) -> list[str]:
+        """Create or update several agents: the assistants are initialized concurrently
+        (at most settings.openai_max_concurrency at a time) and the agents are saved with batched writes.
+        The configs must be validated and associated with the user already."""
+        semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
+
+        async def init_assistant(config: AgentFlowSpec) -> None:
+            async with semaphore:
+                await self._init_assistant(config)
+
+        await asyncio.gather(*(init_assistant(config) for config in configs))
+        ids = await self.storage.save_many(configs)
+        for id_ in ids:
+            cache_invalidation_bus.publish("agent", id_)
+        return ids
+
     async def _create_or_update_agent(self, config: AgentFlowSpec) -> str:
         """Create or update an agent. If the agent already exists, it will be updated."""
+        await self._init_assistant(config)
+        await self.storage.save(config)
+        cache_invalidation_bus.publish("agent", config.id)
+        return config.id
+
+    async def sync_assistants(self, agents: list[Agent]) -> None:
+        """Sync the OpenAI assistants of constructed agents (e.g. after agency-swarm added the shared instructions
+        and the SendMessage tools), skipping the assistants in sync already. See _sync_assistant."""
+        configs = {config.id: config for config in await self.storage.load_by_ids([agent.id for agent in agents])}
+        semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
+
+        async def sync_assistant(agent: Agent, config: AgentFlowSpec) -> None:
+            async with semaphore:
+                if await asyncio.to_thread(self._sync_assistant, agent, config):
+                    # Not published on the bus: the constructed agencies don't depend on the fingerprint
+                    await self.storage.update(config.id, {"assistant_fingerprint": config.assistant_fingerprint})
+
+        await asyncio.gather(*(sync_assistant(agent, configs[agent.id]) for agent in agents if agent.id in configs))
+
+    async def _init_assistant(self, config: AgentFlowSpec) -> None:
+        """Create or update the OpenAI assistant of the agent and set the agent id to the assistant id."""
         # FIXME: a workaround explained at the top of the file api/agent.py
         if not config.config.name.endswith(f" ({config.user_id})"):
             config.config.name = f"{config.config.name} ({config.user_id})"
 
-        agent = await asyncio.to_thread(self._construct_agent, config)
-        await asyncio.to_thread(agent.init_oai)  # initialize the openai agent to get the id
+        agent = await _run_in_construction_executor(self._construct_agent, config)
+        await asyncio.to_thread(self._sync_assistant, agent, config)
+
+    @staticmethod
+    def _sync_assistant(agent: Agent, config: AgentFlowSpec) -> bool:
+        """Create or update the OpenAI assistant of the agent (blocking) and set the config id to the assistant id.
+        The update is skipped when the assistant settings match the fingerprint of the last sync.
+        Returns whether the assistant was synced."""
+        fingerprint = assistant_fingerprint(agent)
+        if agent.id and fingerprint == config.assistant_fingerprint:
+            return False
+        agent.refresh_from_id = True
+        agent.init_oai()
         config.id = agent.id
-        self.storage.save(config)
-        return agent.id
+        config.assistant_fingerprint = fingerprint
+        return True
 
     def _construct_agent(self, agent_flow_spec: AgentFlowSpec) -> Agent:
+        """Construct the agent without syncing its assistant: with an id, init_oai doesn't call OpenAI,
+        see _sync_assistant."""
         agent = Agent(
             id=agent_flow_spec.id,
             name=agent_flow_spec.config.name,
@@ -106,6 +254,7 @@ class AgentManager:
             tools=[skill_registry.get_skill(skill) for skill in agent_flow_spec.skills],
             temperature=agent_flow_spec.config.temperature,
             model=agent_flow_spec.config.model,
+            refresh_from_id=False,
         )
         return agent
 
@@ -121,12 +270,44 @@ class AgentManager:
         if config.config.name != config_db.config.name:
             raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Renaming agents is not supported yet")
 
-    def _validate_skills(self, skills: list[str]) -> None:
+    async def _validate_skills(self, skills: list[str]) -> None:
         # Check if all skills are supported
-        available_skills = self.skill_storage.load_by_titles(skills)
+        available_skills = await self.skill_storage.load_by_titles(skills)
         available_skill_titles = {skill.title for skill in available_skills}
         unsupported_skills = {skill for skill in skills if skill not in available_skill_titles}
         if unsupported_skills:
             raise HTTPException(
                 status_code=HTTPStatus.BAD_REQUEST, detail=f"Some skills are not supported: {unsupported_skills}"
             )
+
+
+def _copy_agent(agent: Agent) -> Agent:
+    """A copy of a cached agent that an agency can modify: agency-swarm adds the shared instructions, the SendMessage
+    tools and the shared files. The tool classes, the OpenAI client and the parsed schemas are shared."""
+    agent_copy = copy.copy(agent)
+    agent_copy.tools = list(agent.tools)
+    agent_copy.files_folder = copy.copy(agent.files_folder)
+    agent_copy.tool_resources = copy.deepcopy(agent.tool_resources)
+    agent_copy.metadata = dict(agent.metadata)
+    return agent_copy
+
+
+def assistant_fingerprint(agent: Agent) -> str:
+    """Fingerprint of the assistant settings the agent syncs to OpenAI (see Agent._check_parameters)."""
+    assistant_settings = {
+        "name": agent.name,
+        "description": agent.description,
+        "instructions": agent.instructions,
+        "model": agent.model,
+        "temperature": agent.temperature,
+        "top_p": agent.top_p,
+        "response_format": agent.response_format,
+        "tools": agent.get_oai_tools(),
+    }
+    return hash_string(json.dumps(assistant_settings, sort_keys=True, default=str))
+
+
+async def _run_in_construction_executor(func: Callable[..., Agent], *args: Any) -> Agent:
+    """Run func in agent_construction_executor, in the current context (as asyncio.to_thread does)."""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(agent_construction_executor, context.run, func, *args)
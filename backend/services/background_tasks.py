@@ -0,0 +1,26 @@
+import asyncio
+import contextvars
+import logging
+from collections.abc import Coroutine
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# The event loop keeps weak references to the tasks only
+_tasks: set[asyncio.Task] = set()
+
+
+def run_in_background(coroutine: Coroutine[Any, Any, Any], name: str) -> asyncio.Task:
+    """Run the coroutine in a task of its own that nobody awaits, e.g. a cache warm-up.
+    The task runs in an empty context: the context variables of the caller (ContextEnvVarsManager keeps
+    a mutable dict) are not shared with it. Failures are logged."""
+    task = asyncio.create_task(coroutine, name=name, context=contextvars.Context())
+    _tasks.add(task)
+    task.add_done_callback(_task_done)
+    return task
+
+
+def _task_done(task: asyncio.Task) -> None:
+    _tasks.discard(task)
+    if not task.cancelled() and (exception := task.exception()) is not None:
+        logger.warning(f"Background task {task.get_name()} failed: {exception!r}")
@@ -0,0 +1,161 @@
+import logging
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from backend.models.agency_bundle import AgencyBundle
+from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.skill_config import SkillConfig
+from backend.services.agency_manager import AgencyManager
+from backend.services.agent_manager import AgentManager
+from backend.services.skill_manager import SkillManager
+
+logger = logging.getLogger(__name__)
+
+
+class BundleManager:
+    """Imports and exports agencies together with their agents and skills (see AgencyBundle).
+    Agent names carry the owner's user id as a suffix (see api/agent.py), an imported agent is renamed
+    for the importing user and the agency chart is remapped accordingly."""
+
+    def __init__(self, agent_manager: AgentManager, agency_manager: AgencyManager, skill_manager: SkillManager):
+        self.agent_manager = agent_manager
+        self.agency_manager = agency_manager
+        self.skill_manager = skill_manager
+
+    async def import_bundle(self, bundle: AgencyBundle, current_user_id: str) -> AgencyConfig:
+        """Import the bundle for the current user. The whole bundle is validated first and all the problems are
+        reported in one error; then the skills, the agents and the agency are written with batched commits
+        and the OpenAI assistants are created or updated concurrently.
+        Configs owned by the current user are updated, the other ones are copied."""
+        errors = []
+        skills = []
+        bundle_agent_ids = [agent.id for agent in bundle.agents]
+        try:
+            skills = await self.skill_manager.prepare_skill_imports(bundle.skills, current_user_id)
+        except HTTPException as e:
+            errors.append(e.detail)
+        skill_titles = {skill.title for skill in bundle.skills}
+        names = await self._prepare_agents(bundle.agents, current_user_id, skill_titles, errors)
+        agency = await self._prepare_agency(bundle.agency, bundle_agent_ids, current_user_id, names, errors)
+        if errors:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="; ".join(errors))
+        await self.skill_manager.check_skills_safety(skills)
+
+        if skills:
+            await self.skill_manager.save_skills(skills)
+        new_ids = await self.agent_manager.create_or_update_agents(bundle.agents)
+        new_agent_ids = dict(zip(bundle_agent_ids, new_ids, strict=True))
+        agency.agents = [new_agent_ids[agent_id] for agent_id in agency.agents]
+        await self.agency_manager.handle_agency_creation_or_update(agency, current_user_id)
+        return agency
+
+    async def load_agencies(self, current_user_id: str, agency_ids: list[str] | None = None) -> list[AgencyConfig]:
+        """The agencies to export: the given agencies (templates included) or all the agencies of the user.
+        Raises NotFoundError or HTTPException (403) for an agency the user can't access."""
+        if agency_ids is None:
+            return await self.agency_manager.storage.load_by_user_id(current_user_id)
+        return [
+            await self.agency_manager.get_agency_config(agency_id, current_user_id, allow_template=True)
+            for agency_id in agency_ids
+        ]
+
+    async def export_bundles(self, agencies: list[AgencyConfig], current_user_id: str) -> AsyncIterator[AgencyBundle]:
+        """Yield a bundle per agency (see load_agencies) with its agents and skills."""
+        for agency in agencies:
+            agents = await self.agent_manager.storage.load_by_ids(agency.agents) if agency.agents else []
+            titles = list(dict.fromkeys(title for agent in agents for title in agent.skills))
+            skills = await self.skill_manager.storage.load_by_titles(titles) if titles else []
+            yield AgencyBundle(agency=agency, agents=agents, skills=self._accessible_skills(skills, current_user_id))
+
+    @staticmethod
+    def _accessible_skills(skills: list[SkillConfig], current_user_id: str) -> list[SkillConfig]:
+        """Keep one skill per title: the user's own skill, otherwise the template one."""
+        by_title: dict[str, SkillConfig] = {}
+        for skill in skills:
+            if skill.user_id == current_user_id or (skill.user_id is None and skill.title not in by_title):
+                by_title[skill.title] = skill
+        return list(by_title.values())
+
+    async def _prepare_agents(
+        self, agents: list[AgentFlowSpec], current_user_id: str, skill_titles: set[str], errors: list[str]
+    ) -> dict[str, str]:
+        """Validate the agents and associate them with the current user.
+        Returns the new agent names by the names used in the bundle (with and without the owner suffix)."""
+        base_names = [self._base_name(agent) for agent in agents]
+        if duplicates := sorted({name for name in base_names if base_names.count(name) > 1}):
+            errors.append(f"Duplicate agent names: {duplicates}")
+
+        # Skills must come with the bundle or be available already
+        used_titles = {title for agent in agents for title in agent.skills}
+        if missing_titles := sorted(used_titles - skill_titles):
+            available = await self.agent_manager.skill_storage.load_by_titles(missing_titles)
+            if unsupported := sorted(set(missing_titles) - {skill.title for skill in available}):
+                errors.append(f"Some skills are not supported: {unsupported}")
+
+        existing_ids = [agent.id for agent in agents if agent.id]
+        existing_agents = (
+            {config.id: config for config in await self.agent_manager.storage.load_by_ids(existing_ids)}
+            if existing_ids
+            else {}
+        )
+
+        names = {}
+        timestamp = datetime.now(UTC).isoformat()
+        for agent, base_name in zip(agents, base_names, strict=True):
+            new_name = f"{base_name} ({current_user_id})"
+            names[agent.config.name] = names[base_name] = new_name
+            config_db = existing_agents.get(agent.id)
+            if config_db and config_db.user_id == current_user_id:
+                if config_db.config.name != new_name:
+                    errors.append(f"Agent {agent.id}: renaming agents is not supported yet")
+                agent.assistant_fingerprint = config_db.assistant_fingerprint
+            else:
+                agent.id = None
+                agent.assistant_fingerprint = None
+            agent.config.name = new_name
+            agent.user_id = current_user_id
+            agent.timestamp = timestamp
+        return names
+
+    async def _prepare_agency(
+        self,
+        agency: AgencyConfig,
+        bundle_agent_ids: list[str | None],
+        current_user_id: str,
+        names: dict[str, str],
+        errors: list[str],
+    ) -> AgencyConfig:
+        """Validate the agency and remap it to the imported agents (by their ids in the bundle)."""
+        agency = agency.model_copy(deep=True)
+        if not agency.agents:
+            agency.agents = [agent_id for agent_id in bundle_agent_ids if agent_id]
+        if unknown_agents := sorted(set(agency.agents) - set(bundle_agent_ids)):
+            errors.append(f"Agency agents not found in the bundle: {unknown_agents}")
+        used_names = {name for pair in agency.agency_chart.values() for name in pair}
+        if agency.main_agent:  # None for an agency without agents
+            used_names.add(agency.main_agent)
+        if unknown_names := sorted(used_names - names.keys()):
+            errors.append(f"Agency chart agents not found in the bundle: {unknown_names}")
+        else:
+            agency.main_agent = names.get(agency.main_agent)
+            agency.agency_chart = {
+                key: [names[sender], names[receiver]] for key, (sender, receiver) in agency.agency_chart.items()
+            }
+
+        if agency.id:
+            config_db = await self.agency_manager.storage.load_by_id(agency.id)
+            if not config_db or config_db.user_id != current_user_id:
+                agency.id = None
+        agency.user_id = current_user_id
+        return agency
+
+    @staticmethod
+    def _base_name(agent: AgentFlowSpec) -> str:
+        """The agent name without the owner suffix."""
+        if agent.user_id:
+            return agent.config.name.removesuffix(f" ({agent.user_id})")
+        return agent.config.name
@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Literal
+from uuid import uuid4
+
+from redis import asyncio as aioredis
+
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# "agency_pool" only drops the constructed agencies (DELETE /admin/agency-pool), the configs stay cached
+CacheKind = Literal["agent", "agency", "skill", "user_variables", "agency_pool"]
+InvalidationHandler = Callable[[str | None], None]
+
+MIN_RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+class CacheInvalidationBus:
+    """Broadcast config changes between workers over Redis pub/sub.
+
+    Every worker keeps in-process caches (config caches, agency_pool, skill_registry). Managers call publish()
+    after a save or delete: the local handlers run right away and the event is sent to the other workers,
+    whose handlers run when it arrives. Handlers are called with the changed id, or None for "drop everything"
+    (sent once the subscription is back after an interruption, as events may have been missed meanwhile).
+    If Redis is unavailable the bus degrades to local invalidation only.
+    """
+
+    def __init__(self, channel: str = settings.cache_invalidation_channel):
+        self.channel = channel
+        self.origin = uuid4().hex
+        self._handlers: dict[str, list[InvalidationHandler]] = defaultdict(list)
+        self._redis: aioredis.Redis | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: asyncio.Task | None = None
+
+    def subscribe(self, kind: CacheKind, handler: InvalidationHandler) -> None:
+        """Register a handler for the changes of the given kind."""
+        self._handlers[kind].append(handler)
+
+    def publish(self, kind: CacheKind, id_: str | None) -> None:
+        """Invalidate the local caches and broadcast the change. Safe to call from any thread."""
+        self._dispatch(kind, id_)
+        if self._redis is None or self._loop is None:
+            return
+        message = json.dumps({"origin": self.origin, "kind": kind, "id": id_})
+        asyncio.run_coroutine_threadsafe(self._send(message), self._loop)
+
+    async def start(self, redis: aioredis.Redis) -> None:
+        """Start listening to the changes published by the other workers."""
+        self._redis = redis
+        self._loop = asyncio.get_running_loop()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._redis = self._loop = self._listener = None
+
+    async def _send(self, message: str) -> None:
+        try:
+            await self._redis.publish(self.channel, message)
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation event: {e}")
+
+    async def _listen(self) -> None:
+        delay = MIN_RECONNECT_DELAY_SECONDS
+        # Set while the subscription is down: the events published meanwhile are lost
+        missed_events = False
+        while True:
+            try:
+                async with self._redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    delay = MIN_RECONNECT_DELAY_SECONDS
+                    if missed_events:
+                        # Drop everything that could be stale, once per interruption and not on every retry:
+                        # the caches keep working while Redis is down
+                        logger.info("Cache invalidation subscription restored, dropping all the caches")
+                        self._dispatch_all()
+                        missed_events = False
+                    async for message in pubsub.listen():
+                        self._handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost, retrying in {delay}s: {e}")
+                missed_events = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    def _handle_message(self, data: bytes | str) -> None:
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Malformed cache invalidation event: {data!r}")
+            return
+        if event.get("origin") != self.origin:
+            self._dispatch(event.get("kind"), event.get("id"))
+
+    def _dispatch(self, kind: str, id_: str | None) -> None:
+        for handler in self._handlers.get(kind, []):
+            try:
+                handler(id_)
+            except Exception:
+                logger.exception(f"Cache invalidation handler failed for {kind} {id_}")
+
+    def _dispatch_all(self) -> None:
+        for kind in list(self._handlers):
+            self._dispatch(kind, None)
+
+
+# Create a global instance of the bus
+cache_invalidation_bus = CacheInvalidationBus()
@@ -0,0 +1,49 @@
+import base64
+import json
+from collections.abc import Iterable
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from backend.repositories.pagination import PageCursor, page_cursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_page_token(cursor: PageCursor) -> str:
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+
+def decode_page_token(page_token: str | None) -> PageCursor | None:
+    """Return the cursor encoded in the page token, None for the first page."""
+    if not page_token:
+        return None
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(page_token.encode()))
+    except ValueError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid page token") from e
+    if not isinstance(cursor, list) or len(cursor) != 2 or not all(isinstance(value, str) for value in cursor):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid page token")
+    timestamp, id_ = cursor
+    return timestamp, id_
+
+
+def merge_page[T](sources: Iterable[list[T]], limit: int, after: PageCursor | None) -> tuple[list[T], str | None]:
+    """Merge the configs of several sources into one page in the page order.
+
+    Each source must hold all of its configs following the `after` cursor, or at least `limit` + 1 of them,
+    so that a next page is detected. Returns the page and the token of the next page (None for the last page).
+    """
+    configs = [config for source in sources for config in source if after is None or page_cursor(config) < after]
+    configs.sort(key=page_cursor, reverse=True)
+    page = configs[:limit]
+    next_page_token = encode_page_token(page_cursor(page[-1])) if len(configs) > limit else None
+    return page, next_page_token
+
+
+def page_size(limit: int | None, page_token: str | None) -> int | None:
+    """Return the page size of a list request, None when the whole list is requested (the default)."""
+    if limit is None and page_token:
+        return DEFAULT_PAGE_SIZE
+    return limit
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+from http import HTTPStatus
+from uuid import uuid4
+
+from agency_swarm import Agency
+from fastapi import HTTPException
+
+from backend.constants import INTERNAL_ERROR_MESSAGE
+from backend.exceptions import NotFoundError
+from backend.models.message import Message
+from backend.models.run import Run
+from backend.repositories.run_storage import RunStorage
+from backend.services.agency_manager import AgencyManager
+from backend.services.background_tasks import run_in_background
+from backend.services.context_vars_manager import ContextEnvVarsManager
+from backend.services.run_scheduler import run_scheduler
+from backend.services.session_manager import SessionManager
+from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+class RunManager:
+    """Runs the messages sent with POST /message/run in the background, instead of holding the request open.
+
+    The state of the runs is kept in Redis (see RunStorage), so that any worker can answer the polls.
+    The run itself goes through the run_scheduler of the worker that received the message; if the client
+    passed a client_id, the finished run is also pushed to its websocket (on whichever worker it is connected),
+    if the client authenticated as the user of the run.
+    """
+
+    def __init__(
+        self,
+        run_storage: RunStorage,
+        agency_manager: AgencyManager,
+        session_manager: SessionManager,
+        connection_manager: WebSocketConnectionManager,
+    ):
+        self.run_storage = run_storage
+        self.agency_manager = agency_manager
+        self.session_manager = session_manager
+        self.connection_manager = connection_manager
+
+    async def start_run(self, user_id: str, message: Message, client_id: str | None = None) -> Run:
+        """Check the session and construct its agency, then start the run. Returns the queued run."""
+        session_config = await self.session_manager.get_session(message.session_id)
+        self.session_manager.validate_session_ownership(session_config.user_id, user_id)
+        ContextEnvVarsManager.set("agency_id", session_config.agency_id)
+
+        # permissions are checked in the agency_manager.get_agency method
+        agency, _ = await self.agency_manager.get_agency(
+            session_config.agency_id, thread_ids=session_config.thread_ids, user_id=user_id
+        )
+
+        run = Run(id=uuid4().hex, user_id=user_id, agency_id=session_config.agency_id, session_id=message.session_id)
+        await self.run_storage.save(run)
+        logger.info(f"Started run {run.id} for agency_id: {run.agency_id}, session_id: {run.session_id}")
+        run_in_background(
+            self._execute(run.model_copy(), agency, message.content, client_id), name=f"agency-run-{run.id}"
+        )
+        return run
+
+    async def get_run(self, run_id: str, user_id: str) -> Run:
+        run = await self.run_storage.load_by_id(run_id)
+        if run is None:
+            raise NotFoundError("Run", run_id)
+        if run.user_id != user_id:
+            raise HTTPException(
+                status_code=HTTPStatus.FORBIDDEN, detail="You don't have permissions to access this run"
+            )
+        return run
+
+    async def _execute(self, run: Run, agency: Agency, content: str, client_id: str | None) -> None:
+        # Runs in a context of its own (see run_in_background): the agents get the OpenAI client of the user from it
+        ContextEnvVarsManager.set("user_id", run.user_id)
+        ContextEnvVarsManager.set("agency_id", run.agency_id)
+
+        loop = asyncio.get_running_loop()
+
+        def get_completion() -> str:
+            # Called once the scheduler started the run, in its executor
+            asyncio.run_coroutine_threadsafe(self._update(run, status="running"), loop).result()
+            return agency.get_completion(message=content, yield_messages=False, message_files=None)
+
+        try:
+            response = await run_scheduler.run(run.user_id, get_completion)
+        except Exception:
+            logger.exception(f"Error in run {run.id} of agency {run.agency_id}, session {run.session_id}")
+            await self._update(run, status="failed", error=INTERNAL_ERROR_MESSAGE)
+        else:
+            await self.session_manager.update_session_timestamp(run.session_id)
+            await self._update(run, status="completed", response=response)
+
+        if client_id:
+            # Only delivered if the client is a websocket connection of the user
+            await self.connection_manager.send_message(
+                {"type": "run_finished", "data": run.model_dump()}, client_id, user_id=run.user_id
+            )
+
+    async def _update(self, run: Run, **fields) -> None:
+        for name, value in fields.items():
+            setattr(run, name, value)
+        run.updated_at = datetime.now(UTC).isoformat()
+        await self.run_storage.save(run)
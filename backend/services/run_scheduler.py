@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+PositionCallback = Callable[[int], Awaitable[None]]
+
+
+class _Ticket:
+    """A run waiting for a slot. The scheduler sends it its new positions in the queue, 0 once started."""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.position = 0
+        self.started = False
+        self.enqueued_at = time.monotonic()
+        self.updates: asyncio.Queue[int] = asyncio.Queue()
+
+
+class RunScheduler:
+    """Runs the agency completions (blocking calls) in an executor of their own, apart from the default one
+    used by asyncio.to_thread.
+
+    At most max_concurrent_runs runs, and max_runs_per_user runs of a user, are in progress at a time.
+    The other ones wait in a FIFO queue: a freed slot goes to the first waiting run whose user is under
+    the limit. The waiting runs are told their position in the queue (see run). Used on the event loop only.
+    """
+
+    def __init__(self, max_workers: int, max_concurrent_runs: int, max_runs_per_user: int):
+        self.max_workers = max_workers
+        self.max_concurrent_runs = min(max_concurrent_runs, max_workers)
+        self.max_runs_per_user = max_runs_per_user
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agency-run")
+        self._waiting: deque[_Ticket] = deque()
+        self._running = 0
+        self._running_by_user: Counter[str] = Counter()
+        self.started = 0
+        self.queued = 0
+        self.max_waiting = 0
+        self.total_wait_seconds = 0.0
+
+    async def run(
+        self,
+        user_id: str,
+        func: Callable[..., T],
+        *args: Any,
+        on_position: PositionCallback | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run func(*args, **kwargs) in the run executor, in the current context (as asyncio.to_thread does),
+        once a slot is free. While the run waits, on_position is awaited with its position in the queue
+        (1 for the next one) each time it changes."""
+        await self._acquire(user_id, on_position)
+        try:
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, func, *args, **kwargs)
+            future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except BaseException:
+            self._release(user_id)
+            raise
+        # The slot is freed when the thread is, even if the caller is cancelled
+        future.add_done_callback(lambda _: self._release(user_id))
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_concurrent_runs": self.max_concurrent_runs,
+            "max_runs_per_user": self.max_runs_per_user,
+            "running": self._running,
+            "waiting": len(self._waiting),
+            "max_waiting": self.max_waiting,
+            "started": self.started,
+            "queued": self.queued,
+            "average_wait_seconds": self.total_wait_seconds / self.queued if self.queued else 0.0,
+        }
+
+    def _can_start(self, user_id: str) -> bool:
+        return self._running < self.max_concurrent_runs and self._running_by_user[user_id] < self.max_runs_per_user
+
+    def _start(self, user_id: str) -> None:
+        self._running += 1
+        self._running_by_user[user_id] += 1
+        self.started += 1
+
+    async def _acquire(self, user_id: str, on_position: PositionCallback | None) -> None:
+        # Don't overtake the waiting runs that could start in the same slot
+        if self._can_start(user_id) and not any(self._can_start(ticket.user_id) for ticket in self._waiting):
+            self._start(user_id)
+            return
+
+        ticket = _Ticket(user_id)
+        self._waiting.append(ticket)
+        self.queued += 1
+        self.max_waiting = max(self.max_waiting, len(self._waiting))
+        self._update_positions()
+        logger.info(f"Run of user {user_id} queued, {len(self._waiting)} waiting, {self._running} running")
+        try:
+            while True:
+                position = await ticket.updates.get()
+                # Only report the latest position
+                while not ticket.updates.empty():
+                    position = ticket.updates.get_nowait()
+                if ticket.started:
+                    break
+                if on_position is not None:
+                    await on_position(position)
+        except BaseException:
+            if ticket.started:
+                self._release(user_id)
+            else:
+                self._waiting.remove(ticket)
+                self._update_positions()
+            raise
+        self.total_wait_seconds += time.monotonic() - ticket.enqueued_at
+
+    def _release(self, user_id: str) -> None:
+        self._running -= 1
+        self._running_by_user[user_id] -= 1
+        if not self._running_by_user[user_id]:
+            del self._running_by_user[user_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start the first waiting runs that fit in the free slots."""
+        for ticket in list(self._waiting):
+            if self._running >= self.max_concurrent_runs:
+                break
+            if self._can_start(ticket.user_id):
+                self._waiting.remove(ticket)
+                self._start(ticket.user_id)
+                ticket.started = True
+                ticket.updates.put_nowait(0)
+        self._update_positions()
+
+    def _update_positions(self) -> None:
+        for position, ticket in enumerate(self._waiting, start=1):
+            if ticket.position != position:
+                ticket.position = position
+                ticket.updates.put_nowait(position)
+
+
+# The agency runs of the worker (websocket and API)
+run_scheduler = RunScheduler(
+    max_workers=settings.agency_run_workers,
+    max_concurrent_runs=settings.agency_run_max_concurrency,
+    max_runs_per_user=settings.agency_run_max_per_user,
+)
@@ -0,0 +1,185 @@
+import logging
+
+from firebase_admin import firestore, firestore_async
+from redis import asyncio as aioredis
+
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
+from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage, AsyncAgentFlowSpecStorage
+from backend.repositories.config_cache import AsyncCachedConfigStorage, CachedConfigStorage, ConfigCache
+from backend.repositories.run_storage import RunStorage
+from backend.repositories.session_storage import AsyncSessionConfigStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage, SkillConfigStorage
+from backend.repositories.sqlite_storage import (
+    AsyncSqliteStorage,
+    SqliteAgencyConfigStorage,
+    SqliteAgentFlowSpecStorage,
+    SqliteDatabase,
+    SqliteSessionConfigStorage,
+    SqliteSkillConfigStorage,
+    SqliteUserProfileStorage,
+    SqliteUserVariableStorage,
+)
+from backend.repositories.user_profile_storage import AsyncUserProfileStorage
+from backend.repositories.user_variable_storage import UserVariableStorage
+from backend.services.adapters.agency_adapter import AgencyAdapter
+from backend.services.adapters.agent_adapter import AgentAdapter
+from backend.services.adapters.session_adapter import SessionAdapter
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.template_catalog import TemplateCatalog, TemplateKind
+from backend.services.user_profile_manager import UserProfileManager
+from backend.services.user_variable_manager import UserVariableManager
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Process-wide storage clients, repositories, adapters and stateless managers.
+
+    Built once per worker by the application lifespan and shared by the dependency getters and the skills.
+    Managers that cache a per-user OpenAI client (agent, agency, session, message) are still created
+    per request, on top of the shared objects held here.
+    If the lifespan didn't run (tests, scripts), the services are built on first access.
+    The repositories are backed by Firestore or by a local SQLite database, see Settings.storage_backend.
+    """
+
+    firestore_client: firestore.Client | None
+    firestore_async_client: firestore_async.AsyncClient | None
+    sqlite_database: SqliteDatabase | None
+    redis: aioredis.Redis
+
+    agency_config_cache: ConfigCache
+    agent_config_cache: ConfigCache
+    skill_config_cache: ConfigCache
+
+    agency_config_storage: AsyncCachedConfigStorage
+    agent_flow_spec_storage: AsyncCachedConfigStorage
+    session_config_storage: AsyncSessionConfigStorage | AsyncSqliteStorage
+    skill_config_storage: AsyncCachedConfigStorage
+    user_profile_storage: AsyncUserProfileStorage | AsyncSqliteStorage
+    sync_agent_flow_spec_storage: CachedConfigStorage
+    sync_skill_config_storage: CachedConfigStorage
+    user_variable_storage: UserVariableStorage | SqliteUserVariableStorage
+    run_storage: RunStorage
+
+    agent_adapter: AgentAdapter
+    agency_adapter: AgencyAdapter
+    session_adapter: SessionAdapter
+    user_variable_manager: UserVariableManager
+    user_profile_manager: UserProfileManager
+    template_catalog: TemplateCatalog
+
+    def __init__(self):
+        self._started = False
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes that are not set yet, i.e. before startup()
+        if name.startswith("_") or self._started:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.startup()
+        return getattr(self, name)
+
+    def startup(self) -> None:
+        """Create the storage clients and everything built on top of them."""
+        if settings.storage_backend == "sqlite":
+            self._create_sqlite_storages()
+        else:
+            self._create_firestore_storages()
+        # Connects lazily, closed by the application lifespan
+        self.redis = aioredis.from_url(str(settings.redis_tls_url or settings.redis_url), decode_responses=False)
+        self.run_storage = RunStorage(self.redis)
+
+        # Agency, agent and skill configs are read far more often than written: cache them in front of the storage.
+        # The sync and async storages of a collection share one cache so that a write through either invalidates both.
+        self.agency_config_cache = ConfigCache(settings.config_cache_maxsize, settings.config_cache_ttl_seconds)
+        self.agent_config_cache = ConfigCache(settings.config_cache_maxsize, settings.config_cache_ttl_seconds)
+        self.skill_config_cache = ConfigCache(settings.config_cache_maxsize, settings.config_cache_ttl_seconds)
+
+        self.agency_config_storage = AsyncCachedConfigStorage(self.agency_config_storage, self.agency_config_cache)
+        self.agent_flow_spec_storage = AsyncCachedConfigStorage(self.agent_flow_spec_storage, self.agent_config_cache)
+        self.skill_config_storage = AsyncCachedConfigStorage(self.skill_config_storage, self.skill_config_cache)
+        self.sync_agent_flow_spec_storage = CachedConfigStorage(
+            self.sync_agent_flow_spec_storage, self.agent_config_cache
+        )
+        self.sync_skill_config_storage = CachedConfigStorage(self.sync_skill_config_storage, self.skill_config_cache)
+
+        self.agent_adapter = AgentAdapter(self.skill_config_storage)
+        self.agency_adapter = AgencyAdapter(self.agent_flow_spec_storage, self.agent_adapter)
+        self.session_adapter = SessionAdapter(self.agency_config_storage, self.agency_adapter)
+        self.user_variable_manager = UserVariableManager(self.user_variable_storage, self.sync_agent_flow_spec_storage)
+        self.user_profile_manager = UserProfileManager(self.user_profile_storage)
+        self.template_catalog = TemplateCatalog(
+            self.firestore_client,
+            {
+                "agency": self.agency_config_storage,
+                "agent": self.agent_flow_spec_storage,
+                "skill": self.skill_config_storage,
+            },
+            settings.template_catalog_refresh_seconds,
+        )
+
+        self._started = True
+        logger.info(f"Service registry started with the {settings.storage_backend} storage backend")
+
+    def _create_firestore_storages(self) -> None:
+        """Create the Firestore clients and the repositories (uncached) on top of them."""
+        self.firestore_client = firestore.client()
+        self.firestore_async_client = firestore_async.client()
+        self.sqlite_database = None
+
+        self.agency_config_storage = AsyncAgencyConfigStorage(self.firestore_async_client)
+        self.agent_flow_spec_storage = AsyncAgentFlowSpecStorage(self.firestore_async_client)
+        self.session_config_storage = AsyncSessionConfigStorage(self.firestore_async_client)
+        self.skill_config_storage = AsyncSkillConfigStorage(self.firestore_async_client)
+        self.user_profile_storage = AsyncUserProfileStorage(self.firestore_async_client)
+        self.sync_agent_flow_spec_storage = AgentFlowSpecStorage(self.firestore_client)
+        self.sync_skill_config_storage = SkillConfigStorage(self.firestore_client)
+        self.user_variable_storage = UserVariableStorage(self.firestore_client)
+
+    def _create_sqlite_storages(self) -> None:
+        """Open the SQLite database and create the repositories (uncached) on top of it.
+        The sync and async storages of a collection share one instance."""
+        self.firestore_client = None
+        self.firestore_async_client = None
+        self.sqlite_database = SqliteDatabase(settings.sqlite_path)
+
+        agent_flow_spec_storage = SqliteAgentFlowSpecStorage(self.sqlite_database)
+        skill_config_storage = SqliteSkillConfigStorage(self.sqlite_database)
+        self.agency_config_storage = AsyncSqliteStorage(SqliteAgencyConfigStorage(self.sqlite_database))
+        self.agent_flow_spec_storage = AsyncSqliteStorage(agent_flow_spec_storage)
+        self.session_config_storage = AsyncSqliteStorage(SqliteSessionConfigStorage(self.sqlite_database))
+        self.skill_config_storage = AsyncSqliteStorage(skill_config_storage)
+        self.user_profile_storage = AsyncSqliteStorage(SqliteUserProfileStorage(self.sqlite_database))
+        self.sync_agent_flow_spec_storage = agent_flow_spec_storage
+        self.sync_skill_config_storage = skill_config_storage
+        self.user_variable_storage = SqliteUserVariableStorage(self.sqlite_database)
+
+    def shutdown(self) -> None:
+        """Drop the shared services so that the next access builds them again."""
+        if self._started:
+            self.template_catalog.stop()
+            if self.sqlite_database:
+                self.sqlite_database.close()
+        self.__dict__.clear()
+        self._started = False
+        logger.info("Service registry shut down")
+
+    def invalidate(self, kind: TemplateKind, id_: str | None) -> None:
+        """Drop a changed config from the caches of its kind. Without an id the whole cache is dropped.
+        The title entries are all dropped: the events don't carry the titles, and a new or renamed config
+        changes entries that don't contain its id (e.g. cached as not found)."""
+        if not self._started:
+            return
+        cache: ConfigCache = getattr(self, f"{kind}_config_cache")
+        if id_ is None:
+            cache.clear()
+        else:
+            cache.invalidate(id_)
+            cache.clear_titles()
+        self.template_catalog.invalidate(kind)
+
+
+# Create a global instance of the registry
+service_registry = ServiceRegistry()
+for kind in ("agency", "agent", "skill"):
+    cache_invalidation_bus.subscribe(kind, lambda id_, kind=kind: service_registry.invalidate(kind, id_))
@@ -7,17 +7,18 @@ from fastapi import HTTPException
 
 from backend.constants import DEFAULT_OPENAI_API_TIMEOUT
 from backend.exceptions import NotFoundError
-from backend.models.session_config import SessionConfig, SessionConfigForAPI
-from backend.repositories.session_storage import SessionConfigStorage
+from backend.models.session_config import SessionConfig, SessionConfigForAPI, SessionConfigSummary
+from backend.repositories.session_storage import AsyncSessionConfigStorage
 from backend.services.adapters.session_adapter import SessionAdapter
 from backend.services.oai_client import get_openai_client
+from backend.services.pagination import decode_page_token, merge_page
 from backend.services.user_variable_manager import UserVariableManager
 
 
 class SessionManager:
     def __init__(
         self,
-        session_storage: SessionConfigStorage,
+        session_storage: AsyncSessionConfigStorage,
         user_variable_manager: UserVariableManager,
         session_adapter: SessionAdapter,
     ):
@@ -33,21 +34,37 @@ class SessionManager:
             self._openai_client = get_openai_client(self.user_variable_manager)
         return self._openai_client
 
-    def get_sessions_for_user(self, user_id: str) -> list[SessionConfigForAPI]:
-        """Return a list of all sessions for the given user."""
-        sessions = self.session_storage.load_by_user_id(user_id)
-        sessions_for_api = [self.session_adapter.to_api(session) for session in sessions]
+    async def get_sessions_for_user(
+        self, user_id: str, summary: bool = False
+    ) -> list[SessionConfigForAPI] | list[SessionConfigSummary]:
+        """Return a list of all sessions for the given user. With summary=True it returns SessionConfigSummary items."""
+        sessions = await self.session_storage.load_by_user_id(user_id, summary=summary)
+        if summary:
+            return sorted(sessions, key=lambda x: x.timestamp, reverse=True)
+        sessions_for_api = await self.session_adapter.to_api_many(sessions)
         sorted_sessions = sorted(sessions_for_api, key=lambda x: x.timestamp, reverse=True)
         return sorted_sessions
 
-    def get_session(self, session_id: str) -> SessionConfig:
+    async def get_session_page(
+        self, user_id: str, limit: int, page_token: str | None = None, summary: bool = False
+    ) -> tuple[list[SessionConfigForAPI] | list[SessionConfigSummary], str | None]:
+        """Return a page of the sessions for the given user, newest first, and the token of the next page.
+        With summary=True it returns SessionConfigSummary items."""
+        after = decode_page_token(page_token)
+        sessions = await self.session_storage.load_page_by_user_id(user_id, limit + 1, after, summary=summary)
+        page, next_page_token = merge_page([sessions], limit, after)
+        if summary:
+            return page, next_page_token
+        return await self.session_adapter.to_api_many(page), next_page_token
+
+    async def get_session(self, session_id: str) -> SessionConfig:
         """Return the session with the given ID."""
-        session = self.session_storage.load_by_id(session_id)
+        session = await self.session_storage.load_by_id(session_id)
         if not session:
             raise NotFoundError("Session", session_id)
         return session
 
-    def create_session(
+    async def create_session(
         self, agency: Agency, name: str, agency_id: str, user_id: str, thread_ids: dict[str, Any]
     ) -> str:
         """Create a new session for the given agency and return its id."""
@@ -60,33 +77,33 @@ class SessionManager:
             thread_ids=thread_ids,
             timestamp=datetime.now(UTC).isoformat(),
         )
-        self.session_storage.save(session_config)
+        await self.session_storage.save(session_config)
         return session_id
 
-    def rename_session(self, session_id: str, new_name: str) -> None:
+    async def rename_session(self, session_id: str, new_name: str) -> None:
         """Rename the session with the given ID."""
-        self.session_storage.update(session_id, {"name": new_name})
+        await self.session_storage.update(session_id, {"name": new_name})
 
-    def update_session_timestamp(self, session_id: str) -> None:
+    async def update_session_timestamp(self, session_id: str) -> None:
         """Update the session with the given ID."""
         timestamp = datetime.now(UTC).isoformat()
-        self.session_storage.update(session_id, {"timestamp": timestamp})
+        await self.session_storage.update(session_id, {"timestamp": timestamp})
 
-    def delete_session(self, session_id: str) -> None:
+    async def delete_session(self, session_id: str) -> None:
         """Delete the session with the given ID."""
-        session_config = self.get_session(session_id)
+        session_config = await self.get_session(session_id)
         main_thread_id: str = session_config.thread_ids.pop("main_thread")  # type: ignore
         self._delete_session_via_api(main_thread_id)
         for receiver in session_config.thread_ids.values():
             for thread_id in receiver.values():  # type: ignore
                 self._delete_session_via_api(thread_id)
-        self.session_storage.delete(session_id)
+        await self.session_storage.delete(session_id)
 
-    def delete_sessions_by_agency_id(self, agency_id: str) -> None:
+    async def delete_sessions_by_agency_id(self, agency_id: str) -> None:
         """Delete all sessions for the given agency."""
-        sessions = self.session_storage.load_by_agency_id(agency_id)
+        sessions = await self.session_storage.load_by_agency_id(agency_id)
         for session in sessions:
-            self.delete_session(session.id)
+            await self.delete_session(session.id)
 
     def _delete_session_via_api(self, session_id: str) -> None:
         """Delete the session with the given ID."""
@@ -1,4 +1,5 @@
 import ast
+import asyncio
 import importlib
 import logging
 import os
@@ -11,8 +12,12 @@ from fastapi import HTTPException
 from pydantic import BaseModel, Field
 
 from backend.exceptions import NotFoundError, UnsetVariableError
-from backend.models.skill_config import SkillConfig
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.models.skill_config import SkillConfig, SkillConfigSummary
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.pagination import decode_page_token, merge_page
+from backend.services.template_catalog import TemplateCatalog
+from backend.settings import settings
 from backend.utils import get_chat_completion, get_chat_completion_structured
 
 logger = logging.getLogger(__name__)
@@ -74,9 +79,15 @@ class RealFileSystem:
 
 
 class SkillManager:
-    def __init__(self, storage: SkillConfigStorage, fs: FileSystem | None = None):
+    def __init__(
+        self,
+        storage: AsyncSkillConfigStorage,
+        fs: FileSystem | None = None,
+        template_catalog: TemplateCatalog | None = None,
+    ):
         self.storage = storage
         self.fs = fs or RealFileSystem()
+        self.template_catalog = template_catalog
         # Get the custom_skills directory path
         self.skills_dir = Path(__file__).parent.parent / "custom_skills"
 
@@ -165,15 +176,36 @@ class SkillManager:
             logger.error(f"Error deleting skill file: {e}")
             # Don't raise an exception here as the file might not exist
 
-    def get_skill_list(self, current_user_id: str) -> list[SkillConfig]:
-        """Get a list of configs for the skills owned by the current user and template (public) skills."""
-        skills = self.storage.load_by_user_id(current_user_id) + self.storage.load_by_user_id(None)
+    async def get_skill_list(
+        self, current_user_id: str, summary: bool = False
+    ) -> list[SkillConfig] | list[SkillConfigSummary]:
+        """Get a list of configs for the skills owned by the current user and template (public) skills.
+        With summary=True it returns SkillConfigSummary items."""
+        user_skills = await self.storage.load_by_user_id(current_user_id, summary=summary)
+        skills = user_skills + await self._get_template_skills(summary)
         sorted_skills = sorted(skills, key=lambda x: x.timestamp, reverse=True)
         return sorted_skills
 
-    def get_skill_config(self, id_: str) -> SkillConfig:
+    async def get_skill_page(
+        self, current_user_id: str, limit: int, page_token: str | None = None, summary: bool = False
+    ) -> tuple[list[SkillConfig] | list[SkillConfigSummary], str | None]:
+        """Get a page of the skill list, see get_skill_list. Returns the page and the token of the next page."""
+        after = decode_page_token(page_token)
+        user_skills = await self.storage.load_page_by_user_id(current_user_id, limit + 1, after, summary=summary)
+        return merge_page([user_skills, await self._get_template_skills(summary)], limit, after)
+
+    async def _get_template_skills(self, summary: bool = False) -> list[SkillConfig] | list[SkillConfigSummary]:
+        if self.template_catalog:
+            templates = await self.template_catalog.get_templates("skill")
+        else:
+            templates = await self.storage.load_by_user_id(None)
+        if summary:
+            return [SkillConfigSummary.model_validate(template.model_dump()) for template in templates]
+        return templates
+
+    async def get_skill_config(self, id_: str) -> SkillConfig:
         """Get a skill configuration by ID."""
-        config_db = self.storage.load_by_id(id_)
+        config_db = await self.storage.load_by_id(id_)
         if not config_db:
             raise NotFoundError("Skill", id_)
         return config_db
@@ -236,7 +268,7 @@ Code:
                 status_code=HTTPStatus.BAD_REQUEST, detail=f"Error evaluating skill safety: {str(e)}"
             ) from e
 
-    def create_or_update_skill(self, config: SkillConfig, current_user_id: str) -> str:
+    async def create_or_update_skill(self, config: SkillConfig, current_user_id: str) -> str:
         """Create or update a skill configuration."""
         # Support template configs
         if not config.user_id:
@@ -246,7 +278,7 @@ Code:
         # Check permissions if updating existing skill
         config_db = None
         if config.id:
-            config_db = self.get_skill_config(config.id)
+            config_db = await self.get_skill_config(config.id)
             self.check_user_permissions(config_db, current_user_id)
 
         # Ensure the skill is associated with the current user
@@ -264,16 +296,76 @@ Code:
                 )
 
         # Save the approved skill to storage
-        skill_id = self.storage.save(config)
+        skill_id = await self.storage.save(config)
+        cache_invalidation_bus.publish("skill", skill_id)
         return skill_id
 
-    def delete_skill(self, id_: str, current_user_id: str) -> None:
+    async def prepare_skill_imports(self, configs: list[SkillConfig], current_user_id: str) -> list[SkillConfig]:
+        """Validate the imported skills and associate them with the current user. Returns the skills to save:
+        a skill identical to an accessible skill with the same title is skipped,
+        a skill owned by the current user with the same title is updated.
+        All the problems are reported in one error. Call check_skills_safety for the returned skills before saving.
+        """
+        errors = []
+        titles = [config.title for config in configs]
+        if duplicates := sorted({title for title in titles if titles.count(title) > 1}):
+            errors.append(f"Duplicate skill titles: {duplicates}")
+        for config in configs:
+            try:
+                self._check_skill_size(config.content)
+                self._validate_skill_code(config.content)
+            except HTTPException as e:
+                errors.append(f"Skill {config.title}: {e.detail}")
+        if errors:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="; ".join(errors))
+
+        existing_skills = await self.storage.load_by_titles(titles) if titles else []
+        timestamp = datetime.now(UTC).isoformat()
+        new_configs = []
+        for config in configs:
+            same_title = [skill for skill in existing_skills if skill.title == config.title]
+            accessible = [skill for skill in same_title if skill.user_id in (None, current_user_id)]
+            if any(skill.content == config.content for skill in accessible):
+                continue
+            owned = next((skill for skill in same_title if skill.user_id == current_user_id), None)
+            config.id = owned.id if owned else None
+            config.user_id = current_user_id
+            config.timestamp = timestamp
+            new_configs.append(config)
+        return new_configs
+
+    async def check_skills_safety(self, configs: list[SkillConfig]) -> None:
+        """Evaluate the safety of the skills concurrently (at most settings.openai_max_concurrency at a time)."""
+        semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
+
+        async def evaluate(config: SkillConfig) -> tuple[bool, str]:
+            async with semaphore:
+                return await asyncio.to_thread(self._evaluate_skill_safety, config)
+
+        evaluations = await asyncio.gather(*(evaluate(config) for config in configs))
+        unsafe = [
+            f"{config.title}: {reason}"
+            for config, (is_safe, reason) in zip(configs, evaluations, strict=True)
+            if not is_safe
+        ]
+        if unsafe:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Skills not safe: {'; '.join(unsafe)}")
+
+    async def save_skills(self, configs: list[SkillConfig]) -> list[str]:
+        """Save several validated skills with batched writes."""
+        skill_ids = await self.storage.save_many(configs)
+        for skill_id in skill_ids:
+            cache_invalidation_bus.publish("skill", skill_id)
+        return skill_ids
+
+    async def delete_skill(self, id_: str, current_user_id: str) -> None:
         """Delete a skill configuration."""
-        config = self.get_skill_config(id_)
+        config = await self.get_skill_config(id_)
         self.check_user_permissions(config, current_user_id)
         # Delete the skill file before removing from storage
         self._delete_skill_file(config)
-        self.storage.delete(id_)
+        await self.storage.delete(id_)
+        cache_invalidation_bus.publish("skill", id_)
 
     @staticmethod
     def check_user_permissions(config: SkillConfig, current_user_id: str) -> None:
@@ -0,0 +1,85 @@
+import logging
+import time
+from typing import Any, Literal
+
+from firebase_admin import firestore
+from google.cloud.firestore_v1 import FieldFilter
+from pydantic import BaseModel
+
+from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.skill_config import SkillConfig
+
+logger = logging.getLogger(__name__)
+
+TemplateKind = Literal["agency", "agent", "skill"]
+
+TEMPLATE_COLLECTIONS: dict[str, tuple[str, type[BaseModel]]] = {
+    "agency": ("agency_configs", AgencyConfig),
+    "agent": ("agent_configs", AgentFlowSpec),
+    "skill": ("skill_configs", SkillConfig),
+}
+
+
+class TemplateCatalog:
+    """In-memory copy of the public templates (configs without a user_id) of agencies, agents and skills.
+
+    Templates are shared by all users and rarely change, so the list endpoints read them from here
+    instead of running a second query on every call.
+    With the real Firestore client the catalog is kept fresh by snapshot listeners (see start()).
+    Clients without listeners (the mock client) and the SQLite backend (no client) fall back to polling:
+    a kind is reloaded from its storage when it's older than refresh_interval or was invalidated
+    through the cache invalidation bus.
+    """
+
+    def __init__(self, db: firestore.Client | None, storages: dict[str, Any], refresh_interval: float):
+        self._db = db
+        self._storages = storages
+        self._refresh_interval = refresh_interval
+        self._templates: dict[str, list[BaseModel]] = {}
+        self._loaded_at: dict[str, float] = {}
+        self._watches: dict[str, Any] = {}
+
+    def start(self) -> None:
+        """Attach a snapshot listener to each template query, if the client supports them."""
+        if self._db is None:
+            logger.info("No Firestore client, polling the templates")
+            return
+        for kind, (collection_name, model) in TEMPLATE_COLLECTIONS.items():
+            query = self._db.collection(collection_name).where(filter=FieldFilter("user_id", "==", None))
+            if not hasattr(query, "on_snapshot"):
+                logger.info(f"Snapshot listeners are not supported, polling {kind} templates")
+                continue
+            self._watches[kind] = query.on_snapshot(self._on_snapshot_callback(kind, model))
+
+    def stop(self) -> None:
+        for watch in self._watches.values():
+            watch.unsubscribe()
+        self._watches.clear()
+
+    async def get_templates(self, kind: TemplateKind) -> list[Any]:
+        """Return copies of the templates of the given kind."""
+        if self._is_stale(kind):
+            self._templates[kind] = await self._storages[kind].load_by_user_id(None)
+            self._loaded_at[kind] = time.monotonic()
+        return [template.model_copy(deep=True) for template in self._templates[kind]]
+
+    def invalidate(self, kind: TemplateKind) -> None:
+        """Force a reload of a polled kind. Listened kinds are pushed by Firestore and need no invalidation."""
+        if kind not in self._watches:
+            self._templates.pop(kind, None)
+
+    def _is_stale(self, kind: str) -> bool:
+        if kind not in self._templates:
+            return True
+        if kind in self._watches:
+            return False
+        return time.monotonic() - self._loaded_at[kind] > self._refresh_interval
+
+    def _on_snapshot_callback(self, kind: str, model: type[BaseModel]):
+        def on_snapshot(document_snapshots, changes, read_time) -> None:  # noqa: ARG001
+            # Runs on the listener's thread. The list is replaced in one assignment, readers never see a partial one.
+            self._templates[kind] = [model.model_validate(snapshot.to_dict()) for snapshot in document_snapshots]
+            logger.debug(f"Reloaded {len(self._templates[kind])} {kind} templates from a snapshot")
+
+        return on_snapshot
@@ -3,6 +3,7 @@ import logging
 from backend.exceptions import UnsetVariableError
 from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
 from backend.repositories.user_variable_storage import UserVariableStorage
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
 from backend.services.context_vars_manager import ContextEnvVarsManager
 from backend.services.encryption_service import EncryptionService
 from backend.settings import settings
@@ -43,6 +44,7 @@ class UserVariableManager:
             variables = {}
         variables[key] = self._encryption_service.encrypt(value)
         self._user_variable_storage.set_variables(user_id, variables)
+        cache_invalidation_bus.publish("user_variables", user_id)
 
     def get_variable_names(self, user_id: str) -> list[str]:
         """Get the names of all the variables for a user."""
@@ -81,4 +83,5 @@ class UserVariableManager:
             del existing_variables[key]
 
         self._user_variable_storage.set_variables(user_id, existing_variables)
+        cache_invalidation_bus.publish("user_variables", user_id)
         return True
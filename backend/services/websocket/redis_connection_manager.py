@@ -0,0 +1,135 @@
+import asyncio
+import contextlib
+import json
+import logging
+
+from redis import asyncio as aioredis
+
+from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MIN_RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+# How long the listener waits for a message before letting the (un)subscriptions through, see _listen
+POLL_TIMEOUT_SECONDS = 0.1
+
+
+class RedisWebSocketConnectionManager(WebSocketConnectionManager):
+    """Connection manager that reaches the clients connected to the other workers over Redis pub/sub.
+
+    Every worker subscribes to a channel per local client ("<channel_prefix>:<client_id>"). The messages for
+    a client connected elsewhere are published to its channel and relayed to the websocket by the worker that
+    owns the connection, so the clients don't need sticky routing. The local clients are served directly.
+    Without Redis (not started, or failing) only the local clients are reachable.
+    The PubSub connection is not safe for concurrent use: the reads of the listener and the (un)subscriptions
+    of the connecting clients take turns under a lock.
+    """
+
+    def __init__(self, channel_prefix: str = settings.websocket_channel_prefix):
+        super().__init__()
+        self.channel_prefix = channel_prefix
+        self._redis: aioredis.Redis | None = None
+        self._pubsub: aioredis.client.PubSub | None = None
+        self._listener: asyncio.Task | None = None
+        self._pubsub_lock = asyncio.Lock()
+
+    def channel(self, client_id: str) -> str:
+        return f"{self.channel_prefix}:{client_id}"
+
+    async def start(self, redis: aioredis.Redis) -> None:
+        """Start relaying the messages published for the local clients."""
+        self._redis = redis
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._redis = self._listener = None
+
+    async def connect(self, websocket, client_id: str) -> None:
+        await super().connect(websocket, client_id)
+        async with self._pubsub_lock:
+            if self._pubsub is None:
+                return  # subscribed by the listener when it (re)connects
+            try:
+                await self._pubsub.subscribe(self.channel(client_id))
+            except Exception as e:
+                # The listener subscribes the local clients again when it reconnects
+                logger.warning(f"Failed to subscribe to the channel of client_id: {client_id}: {e}")
+
+    async def disconnect(self, client_id: str, close: bool = False) -> None:
+        async with self._pubsub_lock:
+            if self._pubsub is not None:
+                try:
+                    await self._pubsub.unsubscribe(self.channel(client_id))
+                except Exception as e:
+                    logger.warning(f"Failed to unsubscribe from the channel of client_id: {client_id}: {e}")
+        await super().disconnect(client_id, close)
+
+    async def send_message(self, message: dict, client_id: str, user_id: str | None = None) -> None:
+        if client_id in self._connections or self._redis is None:
+            await super().send_message(message, client_id, user_id)
+            return
+        try:
+            # The user is checked by the worker the client is connected to
+            await self._redis.publish(self.channel(client_id), json.dumps({"message": message, "user_id": user_id}))
+        except Exception as e:
+            logger.warning(f"Failed to publish a message for client_id: {client_id}: {e}")
+
+    async def _listen(self) -> None:
+        delay = MIN_RECONNECT_DELAY_SECONDS
+        while True:
+            try:
+                async with self._redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    async with self._pubsub_lock:
+                        # The clients connecting from now on subscribe themselves
+                        self._pubsub = pubsub
+                        # The prefix channel keeps the subscription open while no client is connected
+                        channels = [self.channel(client_id) for client_id in self._connections]
+                        await pubsub.subscribe(self.channel_prefix, *channels)
+                    delay = MIN_RECONNECT_DELAY_SECONDS
+                    while True:
+                        # Polled rather than listen(), to release the connection to the (un)subscriptions
+                        async with self._pubsub_lock:
+                            message = await pubsub.get_message(
+                                ignore_subscribe_messages=True, timeout=POLL_TIMEOUT_SECONDS
+                            )
+                        if message is not None:
+                            await self._relay(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._pubsub = None
+                # The messages published while we were away are lost
+                logger.warning(f"Websocket relay subscription lost, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+            finally:
+                self._pubsub = None
+
+    async def _relay(self, message: dict) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        client_id = channel.removeprefix(f"{self.channel_prefix}:")
+        try:
+            data = json.loads(message["data"])
+            relayed, user_id = data["message"], data["user_id"]
+        except (TypeError, ValueError, KeyError):
+            logger.warning(f"Malformed websocket message for client_id: {client_id}: {message['data']!r}")
+            return
+        try:
+            # A full queue must not hold up the messages of the other clients for long
+            await asyncio.wait_for(super().send_message(relayed, client_id, user_id), self.drain_timeout_seconds)
+        except TimeoutError:
+            logger.warning(f"Send queue of client_id: {client_id} is full, dropping a relayed message")
+
+
+# The connections of the worker, shared by all the websocket handlers
+websocket_connection_manager = RedisWebSocketConnectionManager()
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import threading
+from types import TracebackType
+
+from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StreamCoalescer:
+    """Sends the events streamed by an agency run to a websocket client, in the order they were added.
+
+    Consecutive agent_status texts (the token deltas) are merged into one frame, sent flush_interval_ms after
+    the first of them or as soon as they reach flush_bytes. Any other message flushes the pending texts first.
+    The add methods can be called from any thread (agency-swarm streams in an executor thread),
+    the frames are sent by a single task on the event loop::
+
+        async with StreamCoalescer(connection_manager, client_id) as stream:
+            stream.add_status("Hello")
+    """
+
+    def __init__(
+        self,
+        connection_manager: WebSocketConnectionManager,
+        client_id: str,
+        flush_interval_ms: float | None = None,
+        flush_bytes: int | None = None,
+    ):
+        self.connection_manager = connection_manager
+        self.client_id = client_id
+        self.flush_interval = (
+            flush_interval_ms if flush_interval_ms is not None else settings.websocket_stream_flush_interval_ms
+        ) / 1000
+        self.flush_bytes = flush_bytes if flush_bytes is not None else settings.websocket_stream_flush_bytes
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._sender: asyncio.Task | None = None
+        # Guards the buffer and the order of the enqueued frames
+        self._lock = threading.Lock()
+        self._buffer: list[str] = []
+        self._buffer_bytes = 0
+
+    async def __aenter__(self) -> "StreamCoalescer":
+        self._loop = asyncio.get_running_loop()
+        self._sender = asyncio.create_task(self._send_frames())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        with self._lock:
+            self._flush()
+            self._enqueue(None)
+        await self._sender
+
+    def add_status(self, text: str | None) -> None:
+        """Add an agent_status text, merged with the adjacent ones."""
+        if not text:
+            return
+        with self._lock:
+            if not self._buffer:
+                self._loop.call_soon_threadsafe(self._loop.call_later, self.flush_interval, self.flush)
+            self._buffer.append(text)
+            self._buffer_bytes += len(text.encode())
+            if self._buffer_bytes >= self.flush_bytes:
+                self._flush()
+
+    def add_message(self, message: dict) -> None:
+        """Add a message sent as is, after the pending agent_status texts."""
+        with self._lock:
+            self._flush()
+            self._enqueue(message)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._enqueue({"type": "agent_status", "data": {"message": "".join(self._buffer)}})
+            self._buffer = []
+            self._buffer_bytes = 0
+
+    def _enqueue(self, frame: dict | None) -> None:
+        # The callbacks run in the order they were scheduled, so the frames are queued in the order of the calls
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, frame)
+
+    async def _send_frames(self) -> None:
+        failed = False
+        while (frame := await self._queue.get()) is not None:
+            if failed:
+                continue
+            try:
+                await self.connection_manager.send_message(frame, self.client_id)
+            except Exception as exception:
+                # The client is gone, drop the rest of the stream
+                logger.info(f"Stopped streaming to client_id: {self.client_id}: {exception!r}")
+                failed = True
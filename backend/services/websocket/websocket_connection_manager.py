@@ -1,27 +1,127 @@
 import asyncio
+import logging
 
 from starlette.websockets import WebSocket
 
+from backend.settings import FullQueuePolicy, settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Connection:
+    """A websocket and its outbound queue, drained by a writer task of its own."""
+
+    def __init__(self, websocket: WebSocket, client_id: str, queue_size: int):
+        self.websocket = websocket
+        self.client_id = client_id
+        # The user the client authenticated as, see WebSocketConnectionManager.set_user
+        self.user_id: str | None = None
+        # None tells the writer to stop
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=queue_size)
+        self.writer = asyncio.create_task(self._write(), name=f"websocket-writer-{client_id}")
+
+    async def _write(self) -> None:
+        while (message := await self.queue.get()) is not None:
+            try:
+                await self.websocket.send_json(message)
+            except Exception as exception:
+                logger.info(f"Failed to send a message to client_id: {self.client_id}: {exception!r}")
+                return
+            finally:
+                self.queue.task_done()
+
+    async def stop(self, timeout: float) -> None:
+        """Send the queued messages (for up to timeout seconds) and stop the writer."""
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            self.writer.cancel()
+        done, _ = await asyncio.wait([self.writer], timeout=timeout)
+        if not done:
+            self.writer.cancel()
+
+    async def put(self, message: dict) -> None:
+        """Wait for room in the queue, unless the writer failed."""
+        put = asyncio.ensure_future(self.queue.put(message))
+        try:
+            await asyncio.wait([put, self.writer], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            put.cancel()
+
+    async def flush(self) -> None:
+        """Wait until the queued messages are sent, or the writer failed."""
+        joined = asyncio.ensure_future(self.queue.join())
+        await asyncio.wait([joined, self.writer], return_when=asyncio.FIRST_COMPLETED)
+        joined.cancel()
+
 
 class WebSocketConnectionManager:
+    """The websocket connections of the worker by client id.
+
+    The messages are sent by a writer task per connection, from a bounded queue: a slow client only delays
+    its own messages. When the queue of a client is full, the agent_status messages (the streamed text) are
+    dropped and the other ones wait, or the client is disconnected, see settings.websocket_full_queue_policy.
+    """
+
     def __init__(self) -> None:
-        self.active_connections: dict[str, WebSocket] = {}
-        self._connections_lock = asyncio.Lock()
+        self.queue_size = settings.websocket_send_queue_size
+        self.full_queue_policy: FullQueuePolicy = settings.websocket_full_queue_policy
+        self.drain_timeout_seconds = settings.websocket_drain_timeout_seconds
+        # Only changed without awaiting in between, no lock needed on the event loop
+        self._connections: dict[str, _Connection] = {}
+
+    @property
+    def active_connections(self) -> dict[str, WebSocket]:
+        return {client_id: connection.websocket for client_id, connection in self._connections.items()}
 
     async def connect(self, websocket: WebSocket, client_id: str) -> None:
-        async with self._connections_lock:
-            await websocket.accept()
-            self.active_connections[client_id] = websocket
+        await websocket.accept()
+        previous = self._connections.get(client_id)
+        self._connections[client_id] = _Connection(websocket, client_id, self.queue_size)
+        if previous is not None:
+            await previous.stop(self.drain_timeout_seconds)
 
     async def disconnect(self, client_id: str, close: bool = False) -> None:
-        async with self._connections_lock:
-            if client_id in self.active_connections:
-                websocket = self.active_connections.pop(client_id)
-                if close:
-                    await websocket.close()
-
-    async def send_message(self, message: dict, client_id: str) -> None:
-        async with self._connections_lock:
-            if client_id in self.active_connections:
-                websocket = self.active_connections[client_id]
-                await websocket.send_json(message)
+        """Forget the client once its queued messages are sent, and close the websocket if asked."""
+        connection = self._connections.pop(client_id, None)
+        if connection is None:
+            return
+        await connection.stop(self.drain_timeout_seconds)
+        if close:
+            await connection.websocket.close()
+
+    def set_user(self, client_id: str, user_id: str) -> None:
+        """Record the user the client authenticated as."""
+        if (connection := self._connections.get(client_id)) is not None:
+            connection.user_id = user_id
+
+    async def send_message(self, message: dict, client_id: str, user_id: str | None = None) -> None:
+        """Queue the message for the client. Returns once it is queued, not sent.
+        A message with a user_id is for that user only: dropped unless the client authenticated as this user."""
+        connection = self._connections.get(client_id)
+        if connection is None or connection.writer.done():
+            return
+        if user_id is not None and connection.user_id != user_id:
+            logger.warning(f"Dropping a message of user {user_id} for client_id: {client_id} of another user")
+            return
+        try:
+            connection.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+        if self.full_queue_policy == "disconnect":
+            logger.warning(f"Send queue of client_id: {client_id} is full, disconnecting it")
+            # Not drained: the client doesn't keep up with it
+            connection.writer.cancel()
+            if self._connections.get(client_id) is connection:
+                del self._connections[client_id]
+            await connection.websocket.close()
+        elif message.get("type") == "agent_status":
+            logger.info(f"Send queue of client_id: {client_id} is full, dropping a status message")
+        else:
+            await connection.put(message)
+
+    async def flush(self, client_id: str) -> None:
+        """Wait until the messages queued for the client are sent."""
+        if (connection := self._connections.get(client_id)) is not None:
+            await connection.flush()
@@ -14,11 +14,15 @@ from backend.constants import INTERNAL_ERROR_MESSAGE
 from backend.exceptions import NotFoundError, UnsetVariableError
 from backend.models.auth import User
 from backend.models.session_config import SessionConfig
+from backend.repositories.data_loader import request_scope
 from backend.services.agency_manager import AgencyManager
 from backend.services.auth_service import AuthService
+from backend.services.background_tasks import run_in_background
 from backend.services.context_vars_manager import ContextEnvVarsManager
 from backend.services.message_manager import MessageManager
+from backend.services.run_scheduler import run_scheduler
 from backend.services.session_manager import SessionManager
+from backend.services.websocket.stream_coalescer import StreamCoalescer
 from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
 
 logger = logging.getLogger(__name__)
@@ -38,25 +42,33 @@ class WebSocketHandler:
         self.agency_manager = agency_manager
         self.message_manager = message_manager
         self.session_manager = session_manager
+        # The agencies bound in advance by the subscribe messages: client_id -> (user_id, session_id, setup task)
+        self._subscriptions: dict[str, tuple[str, str, asyncio.Task]] = {}
+        # The sessions to warm up once the client authenticates: client_id -> session_id
+        self._pending_warm_ups: dict[str, str] = {}
 
     async def handle_websocket_connection(
         self,
         websocket: WebSocket,
         client_id: str,
+        session_id: str | None = None,
     ) -> None:
         """
         Handle the WebSocket connection for a specific session.
 
         :param websocket: The WebSocket connection.
         :param client_id: The client ID.
+        :param session_id: The session the client is going to use, if known: its agency is constructed in advance,
+            once the first message authenticated the client as the owner of the session.
         """
         await self.connection_manager.connect(websocket, client_id)
         logger.info(f"WebSocket connected for client_id: {client_id}")
+        if session_id:
+            self._pending_warm_ups[client_id] = session_id
 
         try:
             await self._handle_websocket_messages(websocket, client_id)
         except (WebSocketDisconnect, ConnectionClosedOK):
-            await self.connection_manager.disconnect(client_id)
             logger.info(f"WebSocket disconnected for client_id: {client_id}")
         except UnsetVariableError as exception:
             await self._send_error_message(client_id, str(exception))
@@ -67,6 +79,21 @@ class WebSocketHandler:
         except Exception as exception:
             logger.exception(f"Exception while processing message: client_id: {client_id}, error: {str(exception)}")
             await self._send_error_message(client_id, INTERNAL_ERROR_MESSAGE)
+        finally:
+            self._pending_warm_ups.pop(client_id, None)
+            if subscription := self._subscriptions.pop(client_id, None):
+                subscription[2].cancel()
+            # Sends the queued messages (e.g. the error message) before the endpoint closes the websocket
+            await self.connection_manager.disconnect(client_id)
+
+    async def _warm_up_session(self, session_id: str, user_id: str) -> None:
+        """Construct and cache the agency of the session, so that the first message doesn't wait for it.
+        Only done for the sessions of the authenticated user."""
+        session = await self.session_manager.get_session(session_id)
+        if session.user_id != user_id:
+            logger.info(f"Not warming up session {session_id}: it doesn't belong to user {user_id}")
+            return
+        await self.agency_manager.warm_up(session.agency_id, user_id)
 
     async def _authenticate(self, client_id: str, token: str) -> User:
         """Authenticate the user before sending messages.
@@ -84,6 +111,7 @@ class WebSocketHandler:
             raise WebSocketDisconnect from None
 
         ContextEnvVarsManager.set("user_id", user.id)
+        self.connection_manager.set_user(client_id, user.id)
         return user
 
     async def _setup_agency(self, user_id: str, session_id: str) -> tuple[SessionConfig | None, Agency | None]:
@@ -95,7 +123,7 @@ class WebSocketHandler:
 
         :return: The session config and agency instances.
         """
-        session = self.session_manager.get_session(session_id)
+        session = await self.session_manager.get_session(session_id)
         agency, _ = await self.agency_manager.get_agency(session.agency_id, session.thread_ids, user_id)
         ContextEnvVarsManager.set("agency_id", session.agency_id)
         return session, agency
@@ -128,7 +156,9 @@ class WebSocketHandler:
         :return: True if the processing should continue, False otherwise.
         """
         try:
-            await self._process_single_message(websocket, client_id)
+            # Each message is a request of its own, don't serve it data loaded for the previous ones
+            with request_scope():
+                await self._process_single_message(websocket, client_id)
         except UnsetVariableError as exception:
             await self._send_error_message(client_id, str(exception))
             return False
@@ -155,12 +185,44 @@ class WebSocketHandler:
             return
 
         user = await self._authenticate(client_id, token)
+        if session_id := self._pending_warm_ups.pop(client_id, None):
+            run_in_background(self._warm_up_session(session_id, user.id), name=f"warm-up-session-{session_id}")
 
         if message_type == "user_message":
             await self._process_user_message(user, message_data, client_id)
+        elif message_type == "subscribe":
+            await self._process_subscribe(user, message_data, client_id)
         else:
             await self._send_error_message(client_id, "Invalid message type")
 
+    async def _process_subscribe(self, user: User, message_data: dict, client_id: str) -> None:
+        """Bind the agency of the session in the background, the next user message of the session will use it."""
+        session_id = message_data.get("session_id") if message_data else None
+        if not session_id:
+            await self._send_error_message(client_id, "Session ID not provided")
+            return
+
+        if subscription := self._subscriptions.pop(client_id, None):
+            subscription[2].cancel()
+        task = asyncio.create_task(self._setup_agency(user.id, session_id))
+        # Errors are reported when the task is awaited by the next user message, don't log them as unretrieved
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._subscriptions[client_id] = (user.id, session_id, task)
+        await self.connection_manager.send_message(
+            {"type": "subscribed", "data": {"session_id": session_id}}, client_id
+        )
+
+    async def _get_session_agency(
+        self, user_id: str, session_id: str, client_id: str
+    ) -> tuple[SessionConfig | None, Agency | None]:
+        """Get the agency bound by a subscribe message, or set it up."""
+        subscription = self._subscriptions.pop(client_id, None)
+        if subscription and subscription[:2] == (user_id, session_id):
+            return await subscription[2]
+        if subscription:
+            subscription[2].cancel()
+        return await self._setup_agency(user_id, session_id)
+
     async def _process_user_message(self, user: User, message_data: dict, client_id: str) -> None:
         user_message = message_data.get("content")
         session_id = message_data.get("session_id")
@@ -169,7 +231,7 @@ class WebSocketHandler:
             await self._send_error_message(client_id, "Message or session ID not provided")
             return
 
-        session, agency = await self._setup_agency(user.id, session_id)
+        session, agency = await self._get_session_agency(user.id, session_id, client_id)
 
         if not session or not agency:
             await self._send_error_message(
@@ -178,10 +240,9 @@ class WebSocketHandler:
             )
             return
 
-        self.session_manager.update_session_timestamp(session_id)
+        await self.session_manager.update_session_timestamp(session_id)
 
-        connection_manager = self.connection_manager
-        loop = asyncio.get_running_loop()
+        stream = StreamCoalescer(self.connection_manager, client_id)
 
         class WebSocketEventHandler(AgencyEventHandler):
             agent_name = None
@@ -190,82 +251,43 @@ class WebSocketHandler:
             @override
             def on_text_created(self, text: Text) -> None:  # type: ignore
                 """Callback that is fired when a text content block is created"""
-                loop.create_task(
-                    connection_manager.send_message(
-                        {
-                            "type": "agent_status",
-                            "data": {"message": f"\n{self.recipient_agent_name} @ {self.agent_name}  > "},
-                        },
-                        client_id,
-                    )
-                )
+                stream.add_status(f"\n{self.recipient_agent_name} @ {self.agent_name}  > ")
 
             @override
             def on_text_delta(self, delta: TextDelta, snapshot: Text) -> None:  # type: ignore
                 """Callback that is fired whenever a text content delta is returned
                 by the API.
                 """
-                loop.create_task(
-                    connection_manager.send_message(
-                        {"type": "agent_status", "data": {"message": delta.value}},
-                        client_id,
-                    )
-                )
+                stream.add_status(delta.value)
 
             @override
             def on_text_done(self, text: Text) -> None:  # type: ignore
                 """Callback that is fired when a text content block is done"""
-                loop.create_task(
-                    connection_manager.send_message(
-                        {
-                            "type": "agent_message",
-                            "data": {
-                                "sender": self.recipient_agent_name,
-                                "recipient": self.agent_name,
-                                "message": {"content": text.value},
-                            },
+                stream.add_message(
+                    {
+                        "type": "agent_message",
+                        "data": {
+                            "sender": self.recipient_agent_name,
+                            "recipient": self.agent_name,
+                            "message": {"content": text.value},
                         },
-                        client_id,
-                    )
+                    }
                 )
 
             def on_tool_call_created(self, tool_call: ToolCall) -> None:
                 """Callback that is fired when a tool call is created"""
-                loop.create_task(
-                    connection_manager.send_message(
-                        {
-                            "type": "agent_status",
-                            "data": {"message": f"\n{self.recipient_agent_name} > {tool_call.type}\n"},
-                        },
-                        client_id,
-                    )
-                )
+                stream.add_status(f"\n{self.recipient_agent_name} > {tool_call.type}\n")
 
             def on_tool_call_delta(self, delta: ToolCallDelta, snapshot: ToolCall) -> None:  # noqa:  ARG002
                 """Callback that is fired when a tool call delta is encountered"""
                 if delta.type == "code_interpreter":
                     if delta.code_interpreter.input:
-                        loop.create_task(
-                            connection_manager.send_message(
-                                {"type": "agent_status", "data": {"message": delta.code_interpreter.input}},
-                                client_id,
-                            )
-                        )
+                        stream.add_status(delta.code_interpreter.input)
                     if delta.code_interpreter.outputs:
-                        loop.create_task(
-                            connection_manager.send_message(
-                                {"type": "agent_status", "data": {"message": "\n\noutput > "}},
-                                client_id,
-                            )
-                        )
+                        stream.add_status("\n\noutput > ")
                         for output in delta.code_interpreter.outputs:
                             if output.type == "logs":
-                                loop.create_task(
-                                    connection_manager.send_message(
-                                        {"type": "agent_status", "data": {"message": f"\n{output.logs}"}},
-                                        client_id,
-                                    )
-                                )
+                                stream.add_status(f"\n{output.logs}")
 
             @classmethod
             def on_all_streams_end(cls):
@@ -277,7 +299,14 @@ class WebSocketHandler:
             ContextEnvVarsManager.set("agency_id", session.agency_id)
             agency.get_completion_stream(user_message, WebSocketEventHandler)
 
-        await loop.run_in_executor(None, get_completion_stream_wrapper)
+        async def report_position(position: int) -> None:
+            await self.connection_manager.send_message(
+                {"type": "run_queued", "data": {"session_id": session_id, "position": position}}, client_id
+            )
+
+        # All the streamed events are sent before the response
+        async with stream:
+            await run_scheduler.run(user.id, get_completion_stream_wrapper, on_position=report_position)
 
         all_messages = self.message_manager.get_messages(session_id)
         all_messages_dict = [message.model_dump() for message in all_messages]
@@ -1,9 +1,13 @@
+from typing import Literal
+
 from pydantic import Field, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 LARGE_GPT_MODEL = "gpt-4o"
 SMALL_GPT_MODEL = "gpt-4o-mini"
 
+FullQueuePolicy = Literal["drop_status", "disconnect"]
+
 
 class Settings(BaseSettings):
     algorithm: str = Field(default="HS256")
@@ -21,6 +25,30 @@ class Settings(BaseSettings):
     mailchimp_list_id: str | None = Field(default=None)
     e2b_api_key: str | None = Field(default=None)
 
+    storage_backend: Literal["firestore", "sqlite"] = Field(default="firestore")
+    sqlite_path: str = Field(default="agentos.sqlite3")
+
+    config_cache_maxsize: int = Field(default=1000)
+    config_cache_ttl_seconds: float = Field(default=300)
+    cache_invalidation_channel: str = Field(default="cache_invalidation")
+    template_catalog_refresh_seconds: float = Field(default=60)
+    firestore_max_concurrency: int = Field(default=8)
+    openai_max_concurrency: int = Field(default=8)
+    agent_construction_workers: int = Field(default=8)
+    agent_cache_maxsize: int = Field(default=1000)
+    agency_run_workers: int = Field(default=16)
+    agency_run_max_concurrency: int = Field(default=16)
+    agency_run_max_per_user: int = Field(default=2)
+    run_ttl_seconds: int = Field(default=24 * 60 * 60)
+    agency_pool_max_bytes: int = Field(default=512 * 1024 * 1024)
+    agency_pool_max_idle_seconds: float = Field(default=3600)
+    websocket_stream_flush_interval_ms: float = Field(default=50)
+    websocket_stream_flush_bytes: int = Field(default=4096)
+    websocket_send_queue_size: int = Field(default=256)
+    websocket_full_queue_policy: FullQueuePolicy = Field(default="drop_status")
+    websocket_drain_timeout_seconds: float = Field(default=5)
+    websocket_channel_prefix: str = Field(default="websocket")
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
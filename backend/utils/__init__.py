@@ -10,10 +10,8 @@ import tiktoken
 from firebase_admin import credentials
 from pydantic import BaseModel
 
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
-from backend.repositories.user_variable_storage import UserVariableStorage
 from backend.services.oai_client import get_openai_client
-from backend.services.user_variable_manager import UserVariableManager
+from backend.services.service_registry import service_registry
 from backend.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -29,8 +27,7 @@ def init_firebase_app():
 
 def init_openai_client():
     """Initialize the OpenAI client."""
-    user_variable_manager = UserVariableManager(UserVariableStorage(), AgentFlowSpecStorage())
-    return get_openai_client(user_variable_manager=user_variable_manager)
+    return get_openai_client(user_variable_manager=service_registry.user_variable_manager)
 
 
 def patch_openai_client():
@@ -63,9 +60,7 @@ def get_chat_completion(system_message: str, user_prompt: str, model: str, api_k
     if api_key:
         client = get_openai_client(api_key=api_key)
     else:
-        client = get_openai_client(
-            user_variable_manager=UserVariableManager(UserVariableStorage(), AgentFlowSpecStorage())
-        )
+        client = get_openai_client(user_variable_manager=service_registry.user_variable_manager)
     completion = client.chat.completions.create(
         model=model,
         messages=[
@@ -85,9 +80,7 @@ def get_chat_completion_structured(
     if api_key:
         client: openai.OpenAI = get_openai_client(api_key=api_key)
     else:
-        client = get_openai_client(
-            user_variable_manager=UserVariableManager(UserVariableStorage(), AgentFlowSpecStorage())
-        )
+        client = get_openai_client(user_variable_manager=service_registry.user_variable_manager)
 
     completion = client.beta.chat.completions.parse(
         model=model,
@@ -4,10 +4,11 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from backend.services.service_registry import service_registry
 from backend.settings import settings
 from tests.testing_utils import reset_context_vars
 from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID, TEST_ENCRYPTION_KEY, TEST_USER_ID
-from tests.testing_utils.mock_firestore_client import MockFirestoreClient
+from tests.testing_utils.mock_firestore_client import MockAsyncFirestoreClient, MockFirestoreClient
 
 # Configure root logger for tests
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -34,8 +35,14 @@ def mock_firestore_client():
     """Provide a mock Firestore client for tests."""
     logger.debug("Setting up mock Firestore client")
     firestore_client = MockFirestoreClient()
-    with patch("firebase_admin.firestore.client", return_value=firestore_client):
+    with (
+        patch("firebase_admin.firestore.client", return_value=firestore_client),
+        patch("firebase_admin.firestore_async.client", return_value=MockAsyncFirestoreClient(firestore_client)),
+    ):
+        # Shared services hold the client they were built with, so rebuild them around this test's mock
+        service_registry.shutdown()
         yield firestore_client
+        service_registry.shutdown()
     logger.debug("Tearing down mock Firestore client")
 
 
@@ -0,0 +1,20 @@
+from unittest.mock import patch
+
+import pytest
+
+from backend.services.service_registry import service_registry
+from tests.testing_utils.in_memory_firestore import InMemoryFirestore
+
+
+@pytest.fixture
+def in_memory_firestore():
+    """Serve the repositories from an in-memory Firestore that counts the round trips (see InMemoryFirestore).
+    Request it before the client, so that the application is built on top of it."""
+    firestore = InMemoryFirestore()
+    with (
+        patch("firebase_admin.firestore.client", return_value=firestore.client()),
+        patch("firebase_admin.firestore_async.client", return_value=firestore.async_client()),
+    ):
+        service_registry.shutdown()
+        yield firestore
+        service_registry.shutdown()
@@ -0,0 +1,108 @@
+"""Read amplification of the list endpoints: apart from the chunked `in` queries by skill title,
+the number of Firestore round trips must not grow with the number of listed items (no N+1 reads).
+Run with `pytest tests/functional/benchmarks -s` for the numbers."""
+
+import math
+import time
+
+import pytest
+
+from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.session_config import SessionConfig
+from backend.models.skill_config import SkillConfig
+from backend.repositories.batch_loader import IN_QUERY_LIMIT
+from backend.services.service_registry import service_registry
+from tests.testing_utils import TEST_USER_ID
+from tests.testing_utils.in_memory_firestore import InMemoryFirestore, LatencyModel
+
+# The endpoints and whether they load the skills of the listed agents by title
+LIST_ENDPOINTS = [
+    ("/api/agency/list", True),
+    ("/api/agent/list", True),
+    ("/api/skill/list", False),
+    ("/api/session/list", True),
+]
+SKILLS_PER_AGENCY = 4
+
+
+def seed_user_data(firestore: InMemoryFirestore, size: int) -> None:
+    """`size` agencies of two agents with two skills each, and a session per agency."""
+    timestamp = "2024-05-05T00:14:57.487901+00:00"
+    for i in range(size):
+        agent_ids = []
+        for role in ("sender", "receiver"):
+            agent_id = f"{role}_agent_{i}"
+            skills = [f"Skill_{role}_{i}_{j}" for j in range(2)]
+            for title in skills:
+                skill = SkillConfig(id=title, title=title, user_id=TEST_USER_ID, timestamp=timestamp)
+                firestore.seed("skill_configs", title, skill.model_dump())
+            agent = AgentFlowSpec(
+                id=agent_id,
+                user_id=TEST_USER_ID,
+                config={"name": f"{role} {i} ({TEST_USER_ID})"},
+                skills=skills,
+                timestamp=timestamp,
+            )
+            firestore.seed("agent_configs", agent_id, agent.model_dump())
+            agent_ids.append(agent_id)
+        agency = AgencyConfig(
+            id=f"agency_{i}",
+            user_id=TEST_USER_ID,
+            name=f"Agency {i}",
+            agents=agent_ids,
+            main_agent=f"sender {i} ({TEST_USER_ID})",
+            agency_chart={"0": [f"sender {i} ({TEST_USER_ID})", f"receiver {i} ({TEST_USER_ID})"]},
+            timestamp=timestamp,
+        )
+        firestore.seed("agency_configs", agency.id, agency.model_dump())
+        session = SessionConfig(
+            id=f"session_{i}", name=f"Session {i}", user_id=TEST_USER_ID, agency_id=agency.id, timestamp=timestamp
+        )
+        firestore.seed("session_configs", session.id, session.model_dump())
+
+
+def measure(firestore: InMemoryFirestore, client, endpoint: str) -> tuple[int, int]:
+    """The round trips and the document reads of one request with cold caches."""
+    service_registry.shutdown()  # drop the config caches and the template catalog
+    firestore.stats.reset()
+    response = client.get(endpoint)
+    assert response.status_code == 200, response.text
+    return firestore.stats.round_trips, firestore.stats.document_reads
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+@pytest.mark.parametrize("endpoint, loads_skills", LIST_ENDPOINTS)
+def test_list_round_trips_do_not_grow_with_the_list(in_memory_firestore, client, endpoint, loads_skills):
+    def title_queries(size: int) -> int:
+        return math.ceil(size * SKILLS_PER_AGENCY / IN_QUERY_LIMIT) if loads_skills else 0
+
+    seed_user_data(in_memory_firestore, 2)
+    small = measure(in_memory_firestore, client, endpoint)
+
+    seed_user_data(in_memory_firestore, 20)
+    large = measure(in_memory_firestore, client, endpoint)
+
+    print(f"{endpoint}: {small[0]} round trips for 2 agencies, {large[0]} for 20 ({large[1]} documents read)")
+    assert large[0] - title_queries(20) == small[0] - title_queries(2)
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_independent_reads_overlap(in_memory_firestore, client):
+    """With a simulated latency, the chunked reads of a request run concurrently: the request takes
+    less time than its round trips one after the other."""
+    seed_user_data(in_memory_firestore, 20)
+    in_memory_firestore.latency = LatencyModel(default=0.02, jitter=0.005, seed=0)
+    service_registry.shutdown()
+    in_memory_firestore.stats.reset()
+
+    started = time.perf_counter()
+    response = client.get("/api/agency/list")
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    stats = in_memory_firestore.stats
+    print(
+        f"/api/agency/list: {stats.round_trips} round trips ({stats.latency * 1000:.0f} ms) in {elapsed * 1000:.0f} ms"
+    )
+    assert elapsed < stats.latency
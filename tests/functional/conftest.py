@@ -6,8 +6,8 @@ from fastapi.testclient import TestClient
 
 from backend.dependencies.auth import get_current_user
 from backend.models.skill_config import SkillConfig
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
 from backend.services.adapters.agency_adapter import AgencyAdapter
 from backend.services.adapters.agent_adapter import AgentAdapter
 from tests.testing_utils import TEST_USER_ID, get_current_superuser_override, get_current_user_override
@@ -51,7 +51,7 @@ def mock_session_storage(mock_firestore_client, session_config_data):
 @pytest.fixture
 @pytest.mark.usefixtures("mock_firestore_client")
 def agency_adapter():
-    return AgencyAdapter(AgentFlowSpecStorage(), AgentAdapter(SkillConfigStorage()))
+    return AgencyAdapter(AsyncAgentFlowSpecStorage(), AgentAdapter(AsyncSkillConfigStorage()))
 
 
 @pytest.fixture
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pytest
+
+from backend.services.agency_pool import AgencyPool
+from backend.services.run_scheduler import RunScheduler
+
+
+@pytest.fixture
+def agency_pool(monkeypatch):
+    pool = AgencyPool(max_bytes=1000, max_idle_seconds=60)
+    monkeypatch.setattr("backend.routers.api.admin.agency_pool", pool)
+    return pool
+
+
+@pytest.mark.usefixtures("mock_get_current_superuser")
+def test_get_agency_pool(client, agency_pool):
+    agency_pool.put("key1", "agency", size=100, label="agency_id")
+
+    response = client.get("/api/admin/agency-pool")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["entries"] == 1
+    assert data["size_bytes"] == 100
+    assert [(item["key"], item["label"], item["size_bytes"]) for item in data["items"]] == [("key1", "agency_id", 100)]
+
+
+@pytest.mark.usefixtures("mock_get_current_superuser")
+def test_flush_agency_pool(client, agency_pool):
+    with patch("backend.routers.api.admin.cache_invalidation_bus") as bus_mock:
+        bus_mock.publish.side_effect = lambda *_: agency_pool.clear()
+        agency_pool.put("key1", "agency", size=100)
+
+        response = client.delete("/api/admin/agency-pool")
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "Agency pool flushed"
+    assert response.json()["data"]["entries"] == 0
+    bus_mock.publish.assert_called_once_with("agency_pool", None)
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_agency_pool_requires_a_superuser(client):
+    response = client.get("/api/admin/agency-pool")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.usefixtures("mock_get_current_superuser")
+def test_get_run_scheduler(client, monkeypatch):
+    monkeypatch.setattr(
+        "backend.routers.api.admin.run_scheduler",
+        RunScheduler(max_workers=4, max_concurrent_runs=8, max_runs_per_user=2),
+    )
+
+    response = client.get("/api/admin/run-scheduler")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["workers"], data["max_concurrent_runs"], data["running"], data["waiting"]) == (4, 4, 0, 0)
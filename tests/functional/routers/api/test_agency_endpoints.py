@@ -1,11 +1,15 @@
+import asyncio
 from copy import deepcopy
 from unittest import mock
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from backend.models.agency_bundle import AgencyBundle
 from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI
 from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.skill_config import SkillConfig
+from backend.services.agency_manager import AgencyManager
 from tests.testing_utils import TEST_USER_ID
 from tests.testing_utils.constants import TEST_AGENCY_ID
 
@@ -37,7 +41,7 @@ def test_get_agency_list_success(client, mock_firestore_client, agency_adapter):
             "timestamp": "2024-05-05T00:14:57.487901+00:00",
         },
     )
-    expected_agency = agency_adapter.to_api(db_agency)
+    expected_agency = asyncio.run(agency_adapter.to_api(db_agency))
 
     response = client.get("/api/agency/list")
 
@@ -63,7 +67,7 @@ def test_get_agency_config(client, mock_firestore_client, agency_adapter):
         "sender_agent_id",
         {"id": "sender_agent_id", "config": {"name": "Sender Agent"}, "timestamp": "2024-05-05T00:14:57.487901+00:00"},
     )
-    expected_agency = agency_adapter.to_api(db_agency)
+    expected_agency = asyncio.run(agency_adapter.to_api(db_agency))
 
     response = client.get("/api/agency?id=test_agency_id")
     assert response.status_code == 200
@@ -206,7 +210,7 @@ def test_update_agency_with_foreign_agent(client, mock_firestore_client, agency_
     )
     mock_firestore_client.setup_mock_data("agent_configs", "foreign_agent_id", foreign_agent_flow_spec.model_dump())
     # Simulate a PUT request to update the agency with agents belonging to a different user
-    new_data = agency_adapter.to_api(AgencyConfig(**db_agency)).model_dump()
+    new_data = asyncio.run(agency_adapter.to_api(AgencyConfig(**db_agency))).model_dump()
     response = client.put("/api/agency", json=new_data)
     # Check if the server responds with a 403 Forbidden
     assert response.status_code == 403
@@ -231,8 +235,8 @@ def test_create_or_update_agency_missing_agent(client, agency_adapter, mock_fire
     }
     mock_firestore_client.setup_mock_data("agent_configs", "sender_agent_id", agent_config_data_db)
     mock_firestore_client.setup_mock_data("agent_configs", "missing_agent_id", missing_agent_db)  # only for adapter
-    agency_data_with_missing_agent_api = agency_adapter.to_api(
-        AgencyConfig(**agency_data_with_missing_agent_db)
+    agency_data_with_missing_agent_api = asyncio.run(
+        agency_adapter.to_api(AgencyConfig(**agency_data_with_missing_agent_db))
     ).model_dump()
     mock_firestore_client.collection("agent_configs").document("missing_agent_id").delete()  # remove it
 
@@ -277,3 +281,128 @@ def test_delete_agency_user_id_mismatch(client, mock_firestore_client):
     response = client.delete(f"/api/agency?id={TEST_AGENCY_ID}")
     assert response.status_code == 403
     assert response.json() == {"data": {"message": "You don't have permissions to access this agency"}}
+
+
+SKILL_CODE = """\
+from agency_swarm.tools import BaseTool
+
+
+class SummarizeText(BaseTool):
+    def run(self):
+        return "summary"
+"""
+
+
+@pytest.fixture
+def agency_bundle():
+    """An agency of another user, as exported"""
+    agents = [
+        AgentFlowSpec(
+            id=f"{role}_agent_id",
+            user_id="other_user_id",
+            config={"name": f"{role.capitalize()} Agent (other_user_id)"},
+            skills=skills,
+            timestamp="2024-05-05T00:14:57.487901+00:00",
+        )
+        for role, skills in (("sender", ["SummarizeText"]), ("receiver", ["SearchWeb"]))
+    ]
+    agency = AgencyConfig(
+        id="other_agency_id",
+        user_id="other_user_id",
+        name="Test agency",
+        main_agent="Sender Agent (other_user_id)",
+        agents=["sender_agent_id", "receiver_agent_id"],
+        agency_chart={"0": ["Sender Agent (other_user_id)", "Receiver Agent (other_user_id)"]},
+    )
+    skill = SkillConfig(title="SummarizeText", user_id="other_user_id", content=SKILL_CODE)
+    return AgencyBundle(agency=agency, agents=agents, skills=[skill])
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_import_agency(client, mock_firestore_client, agency_bundle):
+    mock_firestore_client.setup_mock_data("skill_configs", "SearchWeb", {"title": "SearchWeb"})
+
+    with (
+        patch("backend.services.agent_manager.AgentManager._construct_agent") as mock_construct_agent,
+        patch("backend.services.skill_manager.SkillManager._evaluate_skill_safety", return_value=(True, "")),
+    ):
+        mock_construct_agent.side_effect = lambda config: Mock(id=config.config.name.split()[0].lower() + "_new_id")
+        response = client.post("/api/agency/import", json=agency_bundle.model_dump())
+
+    assert response.status_code == 200
+    agency = response.json()["data"]
+    assert agency["user_id"] == TEST_USER_ID
+    assert agency["id"] != "other_agency_id"
+    flow = agency["flows"][0]
+    assert flow["sender"]["id"] == "sender_new_id"
+    assert flow["sender"]["config"]["name"] == f"Sender Agent ({TEST_USER_ID})"
+    assert flow["receiver"]["config"]["name"] == f"Receiver Agent ({TEST_USER_ID})"
+
+    db_agency = mock_firestore_client.collection("agency_configs").document(agency["id"]).to_dict()
+    assert db_agency["agents"] == ["sender_new_id", "receiver_new_id"]
+    assert db_agency["main_agent"] == f"Sender Agent ({TEST_USER_ID})"
+    assert mock_firestore_client.collection("agent_configs").document("receiver_new_id").to_dict()["user_id"] == (
+        TEST_USER_ID
+    )
+    # One batched commit for the skills and one for the agents
+    assert mock_firestore_client.batch_commits == 2
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_import_agency_reports_all_errors(client, mock_firestore_client, agency_bundle):
+    agency_bundle.skills[0].content = "def broken("
+    agency_bundle.agents[1].skills = ["NonExistentSkill"]
+    agency_bundle.agency.agency_chart = {"0": ["Sender Agent (other_user_id)", "Unknown Agent"]}
+
+    with patch("backend.services.agent_manager.AgentManager._construct_agent") as mock_construct_agent:
+        response = client.post("/api/agency/import", json=agency_bundle.model_dump())
+
+    assert response.status_code == 400
+    message = response.json()["data"]["message"]
+    assert "Skill SummarizeText: Invalid skill code" in message
+    assert "Some skills are not supported: ['NonExistentSkill']" in message
+    assert "Agency chart agents not found in the bundle: ['Unknown Agent']" in message
+    mock_construct_agent.assert_not_called()
+    assert getattr(mock_firestore_client, "batch_commits", 0) == 0
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_export_agencies(client, mock_firestore_client, agency_bundle):
+    agency = agency_bundle.agency.model_copy(update={"id": TEST_AGENCY_ID, "user_id": TEST_USER_ID})
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency.model_dump())
+    for agent in agency_bundle.agents:
+        mock_firestore_client.setup_mock_data("agent_configs", agent.id, agent.model_dump())
+    skill = agency_bundle.skills[0].model_copy(update={"id": "skill_id", "user_id": TEST_USER_ID})
+    mock_firestore_client.setup_mock_data("skill_configs", "skill_id", skill.model_dump())
+    mock_firestore_client.setup_mock_data("skill_configs", "SearchWeb", {"id": "SearchWeb", "title": "SearchWeb"})
+
+    response = client.get("/api/agency/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    bundles = [AgencyBundle.model_validate_json(line) for line in response.text.splitlines()]
+    assert len(bundles) == 1
+    assert bundles[0].agency == agency
+    assert bundles[0].agents == agency_bundle.agents
+    assert {skill.title for skill in bundles[0].skills} == {"SummarizeText", "SearchWeb"}
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_export_agencies_not_found(client):
+    response = client.get("/api/agency/export?ids=non_existent_agency")
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_export_agencies_loads_each_agency_once(client, mock_firestore_client, agency_bundle):
+    agency = agency_bundle.agency.model_copy(update={"id": TEST_AGENCY_ID, "user_id": TEST_USER_ID, "agents": []})
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency.model_dump())
+
+    with patch.object(
+        AgencyManager, "get_agency_config", autospec=True, side_effect=AgencyManager.get_agency_config
+    ) as mock_get_agency_config:
+        response = client.get(f"/api/agency/export?ids={TEST_AGENCY_ID}")
+
+    assert response.status_code == 200
+    assert AgencyBundle.model_validate_json(response.text).agency.id == TEST_AGENCY_ID
+    mock_get_agency_config.assert_called_once()
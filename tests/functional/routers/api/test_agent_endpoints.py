@@ -29,7 +29,8 @@ def test_get_agent_list(agent_config_data_api, agent_config_data_db, client, moc
 
     response = client.get("/api/agent/list")
     assert response.status_code == 200
-    assert response.json()["data"] == [agent_config_data_api]
+    template_agent_data_api = {**agent_config_data_api, "id": "agent2", "user_id": None}
+    assert response.json()["data"] == [agent_config_data_api, template_agent_data_api]
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
@@ -51,6 +52,27 @@ def test_get_agent_list_owned_by_user(agent_config_data_api, agent_config_data_d
     assert response.json()["data"] == [agent_config_data_api]
 
 
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_get_agent_list_summary(agent_config_data_db, client, mock_firestore_client):
+    mock_firestore_client.setup_mock_data("agent_configs", TEST_AGENT_ID, agent_config_data_db)
+    template_data_db = {**agent_config_data_db, "id": "agent2", "user_id": None}
+    mock_firestore_client.setup_mock_data("agent_configs", "agent2", template_data_db)
+
+    response = client.get("/api/agent/list?summary=true")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {
+            "id": data["id"],
+            "user_id": data["user_id"],
+            "name": data["config"]["name"],
+            "description": data["description"],
+            "timestamp": data["timestamp"],
+        }
+        for data in (agent_config_data_db, template_data_db)
+    ]
+
+
 @pytest.mark.usefixtures("mock_get_current_user")
 def test_get_agent_config(client, agent_config_data_api, agent_config_data_db, mock_firestore_client):
     mock_firestore_client.setup_mock_data("agent_configs", TEST_AGENT_ID, agent_config_data_db)
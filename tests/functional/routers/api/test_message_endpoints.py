@@ -1,13 +1,16 @@
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from agency_swarm import Agency
 
 from backend.constants import INTERNAL_ERROR_MESSAGE
-from backend.dependencies.dependencies import get_user_variable_manager
+from backend.dependencies.dependencies import get_run_storage, get_user_variable_manager
+from backend.main import api_app
 from backend.models.agency_config import AgencyConfig
 from backend.models.message import Message
-from backend.repositories.agency_config_storage import AgencyConfigStorage
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
+from backend.repositories.run_storage import RunStorage
 from backend.repositories.user_variable_storage import UserVariableStorage
 from backend.services.agency_manager import AgencyManager
 from tests.testing_utils import TEST_USER_ID
@@ -19,7 +22,7 @@ from tests.testing_utils.constants import TEST_AGENCY_ID
 def agency_manager():
     yield AgencyManager(
         agent_manager=MagicMock(),
-        agency_config_storage=AgencyConfigStorage(),
+        agency_config_storage=AsyncAgencyConfigStorage(),
         user_variable_manager=get_user_variable_manager(user_variable_storage=UserVariableStorage()),
     )
 
@@ -183,3 +186,53 @@ def test_post_message_processing_failure(client, mock_construct_agency, mock_fir
     assert response.json()["data"]["message"] == INTERNAL_ERROR_MESSAGE
 
     mock_construct_agency.assert_called_once_with(AgencyConfig(**agency_data), {})
+
+
+@pytest.fixture
+def redis_store():
+    """A Redis client backed by a dict, for the run storage."""
+    store = {}
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+    redis.set = AsyncMock(side_effect=lambda key, value, ex=None: store.__setitem__(key, value))  # noqa: ARG005
+    api_app.dependency_overrides[get_run_storage] = lambda: RunStorage(redis)
+    yield store
+    api_app.dependency_overrides.pop(get_run_storage, None)
+
+
+# Message sent as a run
+@pytest.mark.usefixtures("mock_get_current_user", "mock_session_storage", "redis_store")
+def test_message_run_success(client, mock_construct_agency, mock_firestore_client, message_data):
+    agency_data = {
+        "user_id": TEST_USER_ID,
+        "id": TEST_AGENCY_ID,
+        "name": "Test Agency",
+        "main_agent": "sender_agent_id",
+        "timestamp": "2024-05-05T00:14:57.487901+00:00",
+    }
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_data)
+
+    response = client.post("/api/message/run", json=message_data)
+
+    assert response.status_code == 202
+    run = response.json()["data"]
+    assert (run["status"], run["session_id"], run["agency_id"]) == ("queued", "test_session_id", TEST_AGENCY_ID)
+
+    for _ in range(100):
+        run = client.get(f"/api/message/run/{run['id']}").json()["data"]
+        if run["status"] == "completed":
+            break
+        time.sleep(0.01)
+    assert run["response"] == "Hello, world!"
+    mock_construct_agency.return_value.get_completion.assert_called_once_with(
+        message="Hello, world!", yield_messages=False, message_files=None
+    )
+
+
+# Run not found
+@pytest.mark.usefixtures("mock_get_current_user", "redis_store")
+def test_message_run_not_found(client):
+    response = client.get("/api/message/run/missing")
+
+    assert response.status_code == 404
+    assert response.json()["data"]["message"] == "Run not found: missing"
@@ -2,7 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
-from backend.repositories.user_profile_storage import UserProfileStorage
+from backend.repositories.user_profile_storage import AsyncUserProfileStorage
 from backend.services.user_profile_manager import UserProfileManager
 from tests.testing_utils import TEST_USER_ID
 
@@ -11,7 +11,7 @@ from tests.testing_utils import TEST_USER_ID
 @pytest.mark.usefixtures("mock_firestore_client")
 def user_profile_manager():
     yield UserProfileManager(
-        user_profile_storage=UserProfileStorage(),
+        user_profile_storage=AsyncUserProfileStorage(),
     )
 
 
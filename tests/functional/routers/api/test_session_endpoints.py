@@ -22,6 +22,23 @@ def test_get_session_list(session_config_data, client, mock_firestore_client):
     assert response.json()["data"] == [expected_session_data]
 
 
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_get_session_list_page(session_config_data, client, mock_firestore_client):
+    for i in range(3):
+        data = {**session_config_data, "id": f"session{i}", "timestamp": f"2024-05-0{i + 1}T00:00:00+00:00"}
+        mock_firestore_client.setup_mock_data("session_configs", f"session{i}", data)
+    agency_config = {"name": "Test agency", "id": TEST_AGENCY_ID, "main_agent": "sender_agent_id"}
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config)
+
+    response = client.get("/api/session/list?limit=2")
+    assert response.status_code == 200
+    assert [session["id"] for session in response.json()["data"]] == ["session2", "session1"]
+
+    response = client.get(f"/api/session/list?limit=2&page_token={response.json()['next_page_token']}")
+    assert [session["id"] for session in response.json()["data"]] == ["session0"]
+    assert response.json()["next_page_token"] is None
+
+
 @pytest.mark.usefixtures("mock_get_current_user")
 def test_create_session_success(client, mock_firestore_client):
     agency_mock = MagicMock()
@@ -1,8 +1,9 @@
+import base64
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage, SkillConfigStorage
 from backend.services.skill_manager import SafetyEvaluation, SkillManager
 from tests.testing_utils import TEST_USER_ID
 
@@ -91,7 +92,7 @@ def mock_skill_manager(mock_file_system_auto):
         def _reload_and_validate_skill(self, class_name: str, module_name: str) -> None:
             pass  # Skip module reload in tests
 
-    manager = MockSkillManager(SkillConfigStorage(), fs=mock_file_system_auto)
+    manager = MockSkillManager(AsyncSkillConfigStorage(), fs=mock_file_system_auto)
     api_app.dependency_overrides[get_skill_manager] = lambda: manager
     yield manager
     api_app.dependency_overrides.pop(get_skill_manager, None)
@@ -149,6 +150,40 @@ class TestSkillEndpoints:
         assert response.status_code == 200
         assert len(response.json()["data"]) == 1
 
+    def test_get_skill_list_pages(self, client, skill_config_data, mock_firestore_client):
+        for i in range(5):
+            data = {**skill_config_data, "id": f"skill{i}", "timestamp": f"2024-04-0{i + 1}T00:00:00+00:00"}
+            mock_firestore_client.setup_mock_data("skill_configs", f"skill{i}", data)
+        template = {**skill_config_data, "id": "template", "user_id": None, "timestamp": "2024-04-03T12:00:00+00:00"}
+        mock_firestore_client.setup_mock_data("skill_configs", "template", template)
+
+        pages, page_token = [], None
+        while True:
+            response = client.get(
+                "/api/skill/list", params={"limit": 2, "page_token": page_token} if page_token else {"limit": 2}
+            )
+            assert response.status_code == 200
+            pages.append([skill["id"] for skill in response.json()["data"]])
+            page_token = response.json()["next_page_token"]
+            if page_token is None:
+                break
+
+        # Templates are merged into the user's skills in page order
+        assert pages == [["skill4", "skill3"], ["template", "skill2"], ["skill1", "skill0"]]
+
+    @pytest.mark.parametrize(
+        "page_token",
+        [
+            "invalid",
+            base64.urlsafe_b64encode(b"5").decode(),
+            base64.urlsafe_b64encode(b'["2024-04-01T12:00:00+00:00"]').decode(),
+            base64.urlsafe_b64encode(b'{"timestamp": "2024-04-01T12:00:00+00:00", "id": "skill1"}').decode(),
+        ],
+    )
+    def test_get_skill_list_invalid_page_token(self, client, page_token):
+        response = client.get("/api/skill/list", params={"page_token": page_token})
+        assert response.status_code == 400
+
     def test_get_skill_config_success(self, client, skill_config_data, setup_skill_config):
         setup_skill_config()
         response = client.get(f"/api/skill?id={skill_config_data['id']}")
@@ -11,7 +11,7 @@ def mock_websocket_handler():
         def __init__(self, *args, **kwargs):
             pass
 
-        async def handle_websocket_connection(self, websocket, client_id):  # noqa: ARG002
+        async def handle_websocket_connection(self, websocket, client_id, session_id=None):  # noqa: ARG002
             await websocket.accept()
             try:
                 while True:
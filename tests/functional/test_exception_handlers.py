@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import httpx
@@ -8,8 +9,8 @@ from pydantic import ValidationError
 from backend.dependencies.dependencies import get_agency_adapter
 from backend.exceptions import UnsetVariableError
 from backend.models.agency_config import AgencyConfig
-from backend.repositories.agency_config_storage import AgencyConfigStorage
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
 from backend.services.agency_manager import AgencyManager
 
 
@@ -30,13 +31,13 @@ def mock_agent_storage_to_raise_openai_authentication_error():
     request = httpx.Request(method="GET", url="http://testserver/api/agent?id=123")
     response = httpx.Response(401, request=request)
     exception = OpenAIAuthenticationError("Authentication Error", response=response, body={})
-    with patch.object(AgentFlowSpecStorage, "load_by_id", side_effect=exception):
+    with patch.object(AsyncAgentFlowSpecStorage, "load_by_id", side_effect=exception):
         yield
 
 
 @pytest.fixture
 def mock_agent_storage_to_raise_unhandled_exception():
-    with patch.object(AgencyConfigStorage, "load_by_id", side_effect=Exception("Unhandled Exception")):
+    with patch.object(AsyncAgencyConfigStorage, "load_by_id", side_effect=Exception("Unhandled Exception")):
         yield
 
 
@@ -54,7 +55,7 @@ def test_pydantic_validation_error(caplog, client, agency_adapter, mock_firestor
     }
     mock_firestore_client.setup_mock_data("agency_configs", "existing_agency", agency_data_db)
     mock_firestore_client.setup_mock_data("agent_configs", "sender_agent_id", agent_config_data_db)
-    agency_data_api = agency_adapter.to_api(AgencyConfig(**agency_data_db)).model_dump()
+    agency_data_api = asyncio.run(agency_adapter.to_api(AgencyConfig(**agency_data_db))).model_dump()
 
     response = client.put("/api/agency", json=agency_data_api)
 
@@ -0,0 +1,455 @@
+"""An in-memory Firestore stand-in for benchmarks.
+
+Unlike MockFirestoreClient, references and queries are independent immutable objects, as in the real client,
+and the queries follow Firestore semantics for the shapes the repositories use: where (==, !=, <, <=, >, >=,
+in, not-in, array_contains, array_contains_any, null), order_by, start_after, limit and select.
+Every round trip can be delayed (LatencyModel) and is counted, with the documents read and written (FirestoreStats),
+so that a benchmark can measure the read amplification of an endpoint.
+
+Usage:
+    firestore = InMemoryFirestore(LatencyModel(default=0.005, jitter=0.002))
+    firestore.seed("agent_configs", "agent1", {...})
+    patch("firebase_admin.firestore.client", return_value=firestore.client())
+    patch("firebase_admin.firestore_async.client", return_value=firestore.async_client())
+"""
+
+import asyncio
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.api_core.exceptions import InvalidArgument, NotFound
+from google.cloud.firestore_v1 import FieldFilter, Query as FirestoreQuery
+from google.cloud.firestore_v1.types import StructuredQuery
+
+# Firestore accepts up to 30 values in an `in`, `not-in` or `array_contains_any` filter
+DISJUNCTION_LIMIT = 30
+
+_MISSING = object()
+
+
+@dataclass
+class FirestoreStats:
+    """Counters of the operations sent to the in-memory Firestore."""
+
+    round_trips: int = 0
+    document_reads: int = 0
+    document_writes: int = 0
+    # The sum of the simulated latencies, i.e. the time the round trips would take one after the other
+    latency: float = 0.0
+    round_trips_by_operation: Counter[str] = field(default_factory=Counter)
+    reads_by_collection: Counter[str] = field(default_factory=Counter)
+
+    def reset(self) -> None:
+        self.round_trips = self.document_reads = self.document_writes = 0
+        self.latency = 0.0
+        self.round_trips_by_operation.clear()
+        self.reads_by_collection.clear()
+
+
+class LatencyModel:
+    """The simulated latency of a round trip: a delay per operation ("get", "get_all", "query", "commit")
+    or the default one, plus a uniform random jitter."""
+
+    def __init__(
+        self,
+        default: float = 0.0,
+        jitter: float = 0.0,
+        per_operation: dict[str, float] | None = None,
+        seed: int | None = None,
+    ):
+        self.default = default
+        self.jitter = jitter
+        self.per_operation = per_operation or {}
+        self._random = random.Random(seed)
+
+    def delay(self, operation: str) -> float:
+        delay = self.per_operation.get(operation, self.default)
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        return delay
+
+
+def _get_field(data: dict, field_path: str) -> Any:
+    for name in field_path.split("."):
+        if not isinstance(data, dict) or name not in data:
+            return _MISSING
+        data = data[name]
+    return data
+
+
+def _set_field(data: dict, field_path: str, value: Any) -> None:
+    *parents, name = field_path.split(".")
+    for parent in parents:
+        data = data.setdefault(parent, {})
+    data[name] = value
+
+
+def _sort_key(value: Any) -> tuple:
+    """Firestore orders values of different types by type first."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, int | float):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, repr(value))
+
+
+def _matches(value: Any, op: Any, operand: Any) -> bool:
+    if op in ("==", StructuredQuery.UnaryFilter.Operator.IS_NULL) and operand is None:
+        return value is None
+    if op in ("!=", StructuredQuery.UnaryFilter.Operator.IS_NOT_NULL) and operand is None:
+        return value is not _MISSING and value is not None
+    if value is _MISSING:
+        return False
+    if op == "==":
+        return value == operand
+    if op == "!=":
+        return value != operand
+    if op == "in":
+        return value in operand
+    if op == "not-in":
+        return value not in operand
+    if op == "array_contains":
+        return isinstance(value, list) and operand in value
+    if op == "array_contains_any":
+        return isinstance(value, list) and any(item in value for item in operand)
+    if value is None or _sort_key(value)[0] != _sort_key(operand)[0]:
+        return False
+    return {"<": value < operand, "<=": value <= operand, ">": value > operand, ">=": value >= operand}[op]
+
+
+class DocumentSnapshot:
+    def __init__(self, reference: "DocumentReference", data: dict | None):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self) -> dict | None:
+        return deepcopy(self._data)
+
+    def get(self, field_path: str) -> Any:
+        value = _get_field(self._data or {}, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return deepcopy(value)
+
+
+class InMemoryFirestore:
+    """The shared in-memory database behind the sync and async clients, with the latency model and the stats."""
+
+    def __init__(self, latency: LatencyModel | None = None):
+        self.latency = latency or LatencyModel()
+        self.stats = FirestoreStats()
+        self.collections: dict[str, dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def client(self) -> "Client":
+        return Client(self)
+
+    def async_client(self) -> "AsyncClient":
+        return AsyncClient(self)
+
+    def seed(self, collection_name: str, document_id: str, data: dict) -> None:
+        """Write a document directly, without a round trip."""
+        self.collections.setdefault(collection_name, {})[document_id] = deepcopy(data)
+
+    def _round_trip(self, operation: str) -> float:
+        self.stats.round_trips += 1
+        self.stats.round_trips_by_operation[operation] += 1
+        delay = self.latency.delay(operation)
+        self.stats.latency += delay
+        return delay
+
+    def _count_reads(self, collection_name: str, count: int) -> None:
+        self.stats.document_reads += count
+        self.stats.reads_by_collection[collection_name] += count
+
+    def get_documents(self, references: list["DocumentReference"], operation: str) -> tuple[list, float]:
+        with self._lock:
+            delay = self._round_trip(operation)
+            snapshots = []
+            for reference in references:
+                data = self.collections.get(reference.collection_name, {}).get(reference.id)
+                self._count_reads(reference.collection_name, 1)
+                snapshots.append(DocumentSnapshot(reference, deepcopy(data)))
+            return snapshots, delay
+
+    def run_query(self, query: "BaseQuery") -> tuple[list[DocumentSnapshot], float]:
+        with self._lock:
+            delay = self._round_trip("query")
+            documents = self.collections.get(query.collection_name, {})
+            results = [(id_, data) for id_, data in documents.items() if query._matches(data)]
+            results = query._order(results)
+            results = results if query._limit is None else results[: query._limit]
+            # A query is billed at least one read, even when it returns nothing
+            self._count_reads(query.collection_name, max(len(results), 1))
+            reference_class = query._reference_class
+            return [
+                DocumentSnapshot(reference_class(self, query.collection_name, id_), query._project(data))
+                for id_, data in results
+            ], delay
+
+    def commit(self, writes: list[tuple[str, "DocumentReference", dict | None]]) -> float:
+        with self._lock:
+            for operation, reference, _ in writes:
+                if operation == "update" and reference.id not in self.collections.get(reference.collection_name, {}):
+                    raise NotFound(f"No document to update: {reference.collection_name}/{reference.id}")
+            delay = self._round_trip("commit")
+            for operation, reference, data in writes:
+                collection = self.collections.setdefault(reference.collection_name, {})
+                if operation == "set":
+                    collection[reference.id] = deepcopy(data)
+                elif operation == "update":
+                    for field_path, value in data.items():
+                        _set_field(collection[reference.id], field_path, deepcopy(value))
+                else:
+                    collection.pop(reference.id, None)
+                self.stats.document_writes += 1
+            return delay
+
+
+class BaseQuery:
+    _reference_class: type["DocumentReference"]
+
+    def __init__(self, firestore: InMemoryFirestore, collection_name: str):
+        self._firestore = firestore
+        self.collection_name = collection_name
+        self._filters: list[tuple[str, Any, Any]] = []
+        self._orders: list[tuple[str, str]] = []
+        self._cursor: dict | None = None
+        self._limit: int | None = None
+        self._projection: list[str] | None = None
+
+    def _copy(self, **changes):
+        query = self._query_class(self._firestore, self.collection_name)
+        query.__dict__.update({**self.__dict__, **changes})
+        return query
+
+    @property
+    def _query_class(self) -> type["BaseQuery"]:
+        return type(self)
+
+    def where(self, field_path: str | None = None, op_string: str | None = None, value=None, *, filter=None):
+        if filter is not None:
+            if not isinstance(filter, FieldFilter):
+                raise NotImplementedError("Only FieldFilter is supported")
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        if op_string in ("in", "not-in", "array_contains_any") and len(value) > DISJUNCTION_LIMIT:
+            raise InvalidArgument(f"'{op_string}' supports up to {DISJUNCTION_LIMIT} values")
+        return self._copy(_filters=[*self._filters, (field_path, op_string, value)])
+
+    def order_by(self, field_path: str, direction: str = FirestoreQuery.ASCENDING):
+        return self._copy(_orders=[*self._orders, (field_path, direction)])
+
+    def start_after(self, document_fields: dict | DocumentSnapshot):
+        if isinstance(document_fields, DocumentSnapshot):
+            document_fields = document_fields.to_dict()
+        return self._copy(_cursor=dict(document_fields))
+
+    def limit(self, count: int):
+        return self._copy(_limit=count)
+
+    def select(self, field_paths):
+        return self._copy(_projection=list(field_paths))
+
+    def _matches(self, data: dict) -> bool:
+        if any(_get_field(data, field_path) is _MISSING for field_path, _ in self._orders):
+            return False  # an ordered query skips the documents without the field
+        return all(_matches(_get_field(data, path), op, value) for path, op, value in self._filters)
+
+    def _order(self, results: list[tuple[str, dict]]) -> list[tuple[str, dict]]:
+        # Ties are ordered by document id, in the direction of the last order
+        last_direction = self._orders[-1][1] if self._orders else FirestoreQuery.ASCENDING
+        results = sorted(results, key=lambda result: result[0], reverse=last_direction == FirestoreQuery.DESCENDING)
+        for field_path, direction in reversed(self._orders):
+            results.sort(
+                key=lambda result: _sort_key(_get_field(result[1], field_path)),  # noqa: B023
+                reverse=direction == FirestoreQuery.DESCENDING,
+            )
+        if self._cursor is not None:
+            results = [result for result in results if self._is_after_cursor(result[1])]
+        return results
+
+    def _is_after_cursor(self, data: dict) -> bool:
+        for field_path, direction in self._orders:
+            value = _sort_key(_get_field(data, field_path))
+            cursor_value = _sort_key(self._cursor.get(field_path))
+            if value != cursor_value:
+                return value < cursor_value if direction == FirestoreQuery.DESCENDING else value > cursor_value
+        return False
+
+    def _project(self, data: dict) -> dict:
+        if self._projection is None:
+            return deepcopy(data)
+        projected: dict = {}
+        for field_path in self._projection:
+            value = _get_field(data, field_path)
+            if value is not _MISSING:
+                _set_field(projected, field_path, deepcopy(value))
+        return projected
+
+
+class DocumentReference:
+    def __init__(self, firestore: InMemoryFirestore, collection_name: str, document_id: str):
+        self._firestore = firestore
+        self.collection_name = collection_name
+        self.id = document_id
+
+    @property
+    def path(self) -> str:
+        return f"{self.collection_name}/{self.id}"
+
+    def get(self) -> DocumentSnapshot:
+        (snapshot,), delay = self._firestore.get_documents([self], "get")
+        time.sleep(delay)
+        return snapshot
+
+    def set(self, document_data: dict) -> None:
+        time.sleep(self._firestore.commit([("set", self, document_data)]))
+
+    def update(self, field_updates: dict, option=None) -> None:  # noqa: ARG002
+        time.sleep(self._firestore.commit([("update", self, field_updates)]))
+
+    def delete(self) -> None:
+        time.sleep(self._firestore.commit([("delete", self, None)]))
+
+
+class Query(BaseQuery):
+    _reference_class = DocumentReference
+
+    def stream(self):
+        snapshots, delay = self._firestore.run_query(self)
+        time.sleep(delay)
+        return iter(snapshots)
+
+    def get(self) -> list[DocumentSnapshot]:
+        return list(self.stream())
+
+
+class CollectionReference(Query):
+    @property
+    def _query_class(self) -> type[BaseQuery]:
+        return Query
+
+    @property
+    def id(self) -> str:
+        return self.collection_name
+
+    def document(self, document_id: str | None = None) -> DocumentReference:
+        return self._reference_class(self._firestore, self.collection_name, document_id or uuid.uuid4().hex[:20])
+
+
+class WriteBatch:
+    def __init__(self, firestore: InMemoryFirestore):
+        self._firestore = firestore
+        self._writes: list[tuple[str, DocumentReference, dict | None]] = []
+
+    def set(self, reference: DocumentReference, document_data: dict) -> None:
+        self._writes.append(("set", reference, document_data))
+
+    def update(self, reference: DocumentReference, field_updates: dict) -> None:
+        self._writes.append(("update", reference, field_updates))
+
+    def delete(self, reference: DocumentReference) -> None:
+        self._writes.append(("delete", reference, None))
+
+    def _commit(self) -> float:
+        writes, self._writes = self._writes, []
+        return self._firestore.commit(writes)
+
+    def commit(self) -> None:
+        time.sleep(self._commit())
+
+
+class Client:
+    """Sync client, see firestore.Client"""
+
+    def __init__(self, firestore: InMemoryFirestore):
+        self._firestore = firestore
+
+    def collection(self, collection_name: str) -> CollectionReference:
+        return CollectionReference(self._firestore, collection_name)
+
+    def batch(self) -> WriteBatch:
+        return WriteBatch(self._firestore)
+
+    def get_all(self, references):
+        snapshots, delay = self._firestore.get_documents(list(references), "get_all")
+        time.sleep(delay)
+        yield from snapshots
+
+
+class AsyncDocumentReference(DocumentReference):
+    async def get(self) -> DocumentSnapshot:
+        (snapshot,), delay = self._firestore.get_documents([self], "get")
+        await asyncio.sleep(delay)
+        return snapshot
+
+    async def set(self, document_data: dict) -> None:
+        await asyncio.sleep(self._firestore.commit([("set", self, document_data)]))
+
+    async def update(self, field_updates: dict, option=None) -> None:  # noqa: ARG002
+        await asyncio.sleep(self._firestore.commit([("update", self, field_updates)]))
+
+    async def delete(self) -> None:
+        await asyncio.sleep(self._firestore.commit([("delete", self, None)]))
+
+
+class AsyncQuery(BaseQuery):
+    _reference_class = AsyncDocumentReference
+
+    async def stream(self):
+        snapshots, delay = self._firestore.run_query(self)
+        await asyncio.sleep(delay)
+        for snapshot in snapshots:
+            yield snapshot
+
+    async def get(self) -> list[DocumentSnapshot]:
+        return [snapshot async for snapshot in self.stream()]
+
+
+class AsyncCollectionReference(AsyncQuery):
+    @property
+    def _query_class(self) -> type[BaseQuery]:
+        return AsyncQuery
+
+    @property
+    def id(self) -> str:
+        return self.collection_name
+
+    def document(self, document_id: str | None = None) -> AsyncDocumentReference:
+        return self._reference_class(self._firestore, self.collection_name, document_id or uuid.uuid4().hex[:20])
+
+
+class AsyncWriteBatch(WriteBatch):
+    async def commit(self) -> None:
+        await asyncio.sleep(self._commit())
+
+
+class AsyncClient:
+    """Async client, see firestore_async.AsyncClient"""
+
+    def __init__(self, firestore: InMemoryFirestore):
+        self._firestore = firestore
+
+    def collection(self, collection_name: str) -> AsyncCollectionReference:
+        return AsyncCollectionReference(self._firestore, collection_name)
+
+    def batch(self) -> AsyncWriteBatch:
+        return AsyncWriteBatch(self._firestore)
+
+    async def get_all(self, references):
+        snapshots, delay = self._firestore.get_documents(list(references), "get_all")
+        await asyncio.sleep(delay)
+        for snapshot in snapshots:
+            yield snapshot
@@ -1,10 +1,19 @@
-from google.cloud.firestore_v1 import FieldFilter
+import uuid
+
+from google.cloud.firestore_v1 import FieldFilter, Query
+from google.cloud.firestore_v1.types import StructuredQuery
+
+
+def _auto_id() -> str:
+    """Random document id, as generated by the Firestore client for document() without an id."""
+    return uuid.uuid4().hex[:20]
 
 
 class MockDocumentSnapshot:
     def __init__(self, id, data):
         self.id = id
         self._data = data
+        self.exists = data is not None
 
     def to_dict(self):
         return self._data
@@ -15,19 +24,30 @@ class MockFirestoreClient:
         self._collections = {}
         self._current_collection = None
         self._current_documents = {}
+        self._order_by, self._start_after, self._limit, self._select = [], None, None, None
 
     def collection(self, collection_name):
         self._current_collection = collection_name
         self._collections.setdefault(collection_name, {})
+        self._order_by, self._start_after, self._limit, self._select = [], None, None, None
         if collection_name not in self._current_documents:
             self._current_documents[collection_name] = {"current_document": None}
         return self
 
-    def document(self, document_name):
+    def document(self, document_name=None):
+        if document_name is None:
+            document_name = _auto_id()
         if self._current_collection:
             self._current_documents[self._current_collection]["current_document"] = document_name
         return self
 
+    @property
+    def id(self):
+        return self._current_documents.get(self._current_collection, {}).get("current_document")
+
+    def batch(self):
+        return MockWriteBatch(self)
+
     def get(self):
         return self
 
@@ -68,6 +88,10 @@ class MockFirestoreClient:
             if self._where_op == "in":
                 if doc_value in self._where_value:
                     matching_docs.append(MockDocumentSnapshot(doc_id, doc))
+            elif self._where_op == StructuredQuery.UnaryFilter.Operator.IS_NULL:
+                # FieldFilter(field, "==", None) is sent as an IS_NULL unary filter
+                if doc_value is None:
+                    matching_docs.append(MockDocumentSnapshot(doc_id, doc))
             elif (
                 self._where_op == "=="
                 and doc_value == self._where_value
@@ -75,7 +99,53 @@ class MockFirestoreClient:
                 and self._where_value in doc_value
             ):
                 matching_docs.append(MockDocumentSnapshot(doc_id, doc))
-        return iter(matching_docs)
+        return iter(self._apply_order_and_limit(matching_docs))
+
+    def order_by(self, field_path, direction=Query.ASCENDING):
+        self._order_by.append((field_path, direction))
+        return self
+
+    def start_after(self, values: dict):
+        self._start_after = values
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def select(self, field_paths):
+        self._select = list(field_paths)
+        return self
+
+    def _apply_order_and_limit(self, documents: list[MockDocumentSnapshot]) -> list[MockDocumentSnapshot]:
+        # Sort by the last order field first, Python's sort is stable
+        for field_path, direction in reversed(self._order_by):
+            documents.sort(key=lambda doc: doc.to_dict().get(field_path), reverse=direction == Query.DESCENDING)
+        if self._start_after is not None:
+            documents = [doc for doc in documents if self._is_after_cursor(doc.to_dict())]
+        documents = documents if self._limit is None else documents[: self._limit]
+        if self._select is not None:
+            documents = [MockDocumentSnapshot(doc.id, self._project(doc.to_dict())) for doc in documents]
+        return documents
+
+    def _project(self, data: dict) -> dict:
+        projected = {}
+        for field_path in self._select:
+            *parents, name = field_path.split(".")
+            source, target = data, projected
+            for parent in parents:
+                source = source.get(parent, {})
+                target = target.setdefault(parent, {})
+            if name in source:
+                target[name] = source[name]
+        return projected
+
+    def _is_after_cursor(self, data: dict) -> bool:
+        for field_path, direction in self._order_by:
+            value, cursor_value = data.get(field_path), self._start_after[field_path]
+            if value != cursor_value:
+                return value < cursor_value if direction == Query.DESCENDING else value > cursor_value
+        return False
 
     def add(self, data) -> tuple:
         collection = self._current_collection
@@ -95,3 +165,126 @@ class MockFirestoreClient:
         current_doc_id = self._current_documents[collection].get("current_document")
         self._collections[collection].pop(current_doc_id, None)
         self._current_documents[collection]["current_document"] = None
+
+
+class MockAsyncFirestoreClient:
+    """Async facade over MockFirestoreClient. Both clients share the same in-memory collections,
+    so the data set up through the sync mock is visible to the async repositories and vice versa."""
+
+    def __init__(self, sync_client: MockFirestoreClient):
+        self._client = sync_client
+
+    def collection(self, collection_name):
+        self._client.collection(collection_name)
+        return self
+
+    def document(self, document_name=None):
+        if document_name is None:
+            document_name = _auto_id()
+        return MockAsyncDocumentReference(self._client, self._client._current_collection, document_name)
+
+    def batch(self):
+        return MockAsyncWriteBatch(self._client)
+
+    def where(self, filter: FieldFilter):
+        self._client.where(filter)
+        return self
+
+    def order_by(self, field_path, direction=Query.ASCENDING):
+        self._client.order_by(field_path, direction)
+        return self
+
+    def start_after(self, values: dict):
+        self._client.start_after(values)
+        return self
+
+    def limit(self, count: int):
+        self._client.limit(count)
+        return self
+
+    def select(self, field_paths):
+        self._client.select(field_paths)
+        return self
+
+    async def get_all(self, references):
+        for reference in references:
+            yield await reference.get()
+
+    async def get(self):
+        self._client.get()
+        return self
+
+    @property
+    def exists(self):
+        return self._client.exists
+
+    def to_dict(self):
+        return self._client.to_dict()
+
+    async def stream(self):
+        for document_snapshot in self._client.stream():
+            yield document_snapshot
+
+    async def set(self, data: dict):
+        self._client.set(data)
+
+    async def add(self, data) -> tuple:
+        return self._client.add(data)
+
+    async def update(self, data: dict, option=None):
+        self._client.update(data, option)
+
+    async def delete(self):
+        self._client.delete()
+
+
+class MockAsyncDocumentReference:
+    """Async document reference bound to one document, so that several references can be used at once
+    (e.g. by get_all). Each operation points the shared mock at the document first."""
+
+    def __init__(self, client: MockFirestoreClient, collection_name: str, document_name: str):
+        self._client = client
+        self._collection_name = collection_name
+        self.id = document_name
+
+    def _select(self) -> MockFirestoreClient:
+        return self._client.collection(self._collection_name).document(self.id)
+
+    async def get(self):
+        client = self._select()
+        return MockDocumentSnapshot(self.id, client.to_dict() if client.exists else None)
+
+    async def set(self, data: dict):
+        self._select().set(data)
+
+    async def update(self, data: dict, option=None):
+        self._select().update(data, option)
+
+    async def delete(self):
+        self._select().delete()
+
+
+class MockWriteBatch:
+    """Collects the writes and applies them on commit. The commits are counted on the client."""
+
+    def __init__(self, client: MockFirestoreClient):
+        self._client = client
+        self._writes = []
+
+    def set(self, reference, data: dict):
+        if isinstance(reference, MockAsyncDocumentReference):
+            self._writes.append((reference._collection_name, reference.id, data))
+        else:
+            # The sync mock is its own document reference, pointing at the current document
+            self._writes.append((reference._current_collection, reference.id, data))
+
+    def commit(self):
+        for collection_name, document_name, data in self._writes:
+            self._client.collection(collection_name).document(document_name).set(data)
+        self._client.batch_commits = getattr(self._client, "batch_commits", 0) + 1
+        self._writes = []
+
+
+class MockAsyncWriteBatch(MockWriteBatch):
+    async def commit(self):
+        super().commit()
@@ -26,8 +26,8 @@ def test_run_success(get_sql_database_metadata, mock_user_variable_manager):
         patch("backend.custom_skills.GetSQLDatabaseMetadata.create_engine") as mock_create_engine,
         patch("backend.custom_skills.GetSQLDatabaseMetadata.MetaData") as mock_metadata,
         patch(
-            "backend.custom_skills.GetSQLDatabaseMetadata.UserVariableManager",
-            return_value=mock_user_variable_manager,
+            "backend.custom_skills.GetSQLDatabaseMetadata.service_registry.user_variable_manager",
+            mock_user_variable_manager,
         ),
     ):
         mock_engine = MagicMock()
@@ -73,8 +73,8 @@ def test_run_exception(get_sql_database_metadata, mock_user_variable_manager, ca
         patch("backend.custom_skills.GetSQLDatabaseMetadata.create_engine") as mock_create_engine,
         patch("backend.custom_skills.GetSQLDatabaseMetadata.MetaData") as mock_metadata,
         patch(
-            "backend.custom_skills.GetSQLDatabaseMetadata.UserVariableManager",
-            return_value=mock_user_variable_manager,
+            "backend.custom_skills.GetSQLDatabaseMetadata.service_registry.user_variable_manager",
+            mock_user_variable_manager,
         ),
     ):
         mock_engine = MagicMock()
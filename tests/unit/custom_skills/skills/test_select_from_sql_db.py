@@ -4,17 +4,17 @@ from unittest.mock import MagicMock, patch
 from backend.custom_skills.SelectFromSQLDatabase import SelectFromSQLDatabase
 
 
-@patch("backend.custom_skills.SelectFromSQLDatabase.UserVariableManager")
+@patch("backend.custom_skills.SelectFromSQLDatabase.service_registry")
 @patch("backend.custom_skills.SelectFromSQLDatabase.create_engine")
 @patch("backend.custom_skills.SelectFromSQLDatabase.sessionmaker")
-def test_select_from_db_success(mock_sessionmaker, mock_create_engine, mock_user_variable_manager):
+def test_select_from_db_success(mock_sessionmaker, mock_create_engine, mock_service_registry):
     # Mock the user variable manager to return database credentials
     mock_variable_storage = MagicMock()
     mock_variable_storage.get_by_key.side_effect = [
         "postgresql://username@host:5432/",  # DATABASE_URL_PREFIX
         "secret",  # DATABASE_PASSWORD
     ]
-    mock_user_variable_manager.return_value = mock_variable_storage
+    mock_service_registry.user_variable_manager = mock_variable_storage
 
     # Mock the SQLAlchemy session
     mock_session_class = MagicMock()
@@ -42,13 +42,13 @@ def test_select_from_db_success(mock_sessionmaker, mock_create_engine, mock_user
     mock_session.execute.assert_called_once()
 
 
-@patch("backend.custom_skills.SelectFromSQLDatabase.UserVariableManager")
+@patch("backend.custom_skills.SelectFromSQLDatabase.service_registry")
 @patch("backend.custom_skills.SelectFromSQLDatabase.create_engine")
 @patch("backend.custom_skills.SelectFromSQLDatabase.sessionmaker")
-def test_select_from_db_failure(mock_sessionmaker, mock_create_engine, mock_user_variable_manager):
+def test_select_from_db_failure(mock_sessionmaker, mock_create_engine, mock_service_registry):
     mock_variable_storage = MagicMock()
     mock_variable_storage.get_by_key.side_effect = ["postgresql://username@host:5432/", "secret"]
-    mock_user_variable_manager.return_value = mock_variable_storage
+    mock_service_registry.user_variable_manager = mock_variable_storage
 
     mock_session_class = MagicMock()
     mock_session = mock_session_class.return_value.__enter__.return_value
@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI, CommunicationFlow
+from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI, AgencyConfigSummary, CommunicationFlow
 from backend.models.agent_flow_spec import AgentFlowSpecForAPI
 
 
@@ -13,6 +13,12 @@ def test_empty_agency_chart():
     assert config.agency_chart == {}
 
 
+def test_summary_without_timestamp():
+    # Documents stored without a timestamp are listed like with the full model
+    summary = AgencyConfigSummary(id="123", name="Test agency")
+    assert summary.timestamp
+
+
 def test_invalid_list_size_in_agency_chart():
     # Test should fail if any list element in the agency chart does not contain exactly 2 strings
     with pytest.raises(ValueError) as excinfo:
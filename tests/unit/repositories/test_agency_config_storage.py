@@ -1,5 +1,7 @@
+import pytest
+
 from backend.models.agency_config import AgencyConfig
-from backend.repositories.agency_config_storage import AgencyConfigStorage
+from backend.repositories.agency_config_storage import AgencyConfigStorage, AsyncAgencyConfigStorage
 from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID, TEST_USER_ID
 
 
@@ -62,3 +64,40 @@ def test_delete_agency_config(mock_firestore_client, agency_config_data):
 
     # Assert
     assert mock_firestore_client.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_load_agency_config_by_user_id(mock_firestore_client, agency_config_data):
+    mocked_data = AgencyConfig.model_validate(agency_config_data)
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+
+    storage = AsyncAgencyConfigStorage()
+    result = await storage.load_by_user_id(TEST_USER_ID)
+
+    assert result == [mocked_data]
+
+
+@pytest.mark.asyncio
+async def test_async_load_agency_config_by_agent_id(mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+
+    storage = AsyncAgencyConfigStorage()
+
+    assert len(await storage.load_by_agent_id(TEST_AGENT_ID)) == 1
+    assert await storage.load_by_agent_id("another_agent_id") == []
+
+
+@pytest.mark.asyncio
+async def test_async_save_and_delete_agency_config(mock_firestore_client, agency_config_data):
+    agency_config = AgencyConfig.model_validate(agency_config_data)
+    mock_firestore_client.setup_mock_data("agency_configs", agency_config.id, agency_config_data)
+    agency_config.description = "Updated"
+
+    storage = AsyncAgencyConfigStorage()
+    id_ = await storage.save(agency_config)
+
+    assert id_ == agency_config.id
+    assert (await storage.load_by_id(id_)).description == "Updated"
+
+    await storage.delete(id_)
+    assert await storage.load_by_id(id_) is None
@@ -1,7 +1,7 @@
 import pytest
 
 from backend.models.agent_flow_spec import AgentFlowSpec
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
+from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage, AsyncAgentFlowSpecStorage
 from tests.testing_utils import TEST_USER_ID
 
 
@@ -54,20 +54,19 @@ def test_save_existing_agent_flow_spec(mock_firestore_client, agent_data):
 
 
 def test_save_new_agent_flow_spec(mock_firestore_client, agent_data):
-    mock_firestore_client.setup_mock_data("agent_configs", "new_agent_id", agent_data)
-
     new_agent_data = agent_data.copy()
     # Remove agent id to simulate a new agent
     del new_agent_data["id"]
     agent_flow_spec = AgentFlowSpec(**new_agent_data)
 
     storage = AgentFlowSpecStorage()
-    storage.save(agent_flow_spec)
+    agent_id = storage.save(agent_flow_spec)
 
+    # Check that the agent id was allocated client-side and the document written under it
+    assert agent_id is not None
+    assert agent_flow_spec.id == agent_id
     serialized_data = agent_flow_spec.model_dump()
-    assert mock_firestore_client.to_dict() == serialized_data
-    # Check that the agent id was updated
-    assert agent_flow_spec.id == "new_agent_id"
+    assert mock_firestore_client.collection("agent_configs").document(agent_id).to_dict() == serialized_data
 
 
 def test_load_agent_flow_spec_by_ids(mock_storage, mock_firestore_client, agent_data):
@@ -106,3 +105,33 @@ def test_delete_agent_flow_spec(mock_storage, mock_firestore_client, agent_data)
     mock_storage.delete(agent_flow_spec.id)
 
     assert mock_firestore_client.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_load_agent_flow_spec_by_ids(mock_firestore_client, agent_data):
+    agent_data2 = agent_data.copy()
+    agent_data2["id"] = "agent2"
+    mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
+    mock_firestore_client.setup_mock_data("agent_configs", "agent2", agent_data2)
+
+    storage = AsyncAgentFlowSpecStorage()
+    loaded_agent_flow_specs = await storage.load_by_ids(["agent1", "agent2"])
+
+    assert len(loaded_agent_flow_specs) == 2
+    assert AgentFlowSpec.model_validate(agent_data) in loaded_agent_flow_specs
+    assert AgentFlowSpec.model_validate(agent_data2) in loaded_agent_flow_specs
+
+
+@pytest.mark.asyncio
+async def test_async_save_new_agent_flow_spec(mock_firestore_client, agent_data):
+    new_agent_data = agent_data.copy()
+    del new_agent_data["id"]
+    agent_flow_spec = AgentFlowSpec(**new_agent_data)
+
+    agent_id = await AsyncAgentFlowSpecStorage().save(agent_flow_spec)
+
+    assert agent_id is not None
+    assert agent_flow_spec.id == agent_id
+    assert (
+        mock_firestore_client.collection("agent_configs").document(agent_id).to_dict() == agent_flow_spec.model_dump()
+    )
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from backend.repositories.batch_loader import load_in_chunks
+
+
+@pytest.mark.asyncio
+async def test_load_in_chunks_deduplicates_and_preserves_order():
+    chunks = []
+
+    async def load_chunk(keys: list[str]) -> list[str]:
+        chunks.append(keys)
+        # Firestore doesn't return the documents in the order of the `in` values
+        return list(reversed(keys))
+
+    keys = [f"key{i}" for i in range(25)]
+    result = await load_in_chunks(keys + ["key3", "key0"], load_chunk, key=lambda item: item)
+
+    assert result == keys
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_load_in_chunks_caps_concurrency():
+    running = 0
+    max_running = 0
+
+    async def load_chunk(keys: list[str]) -> list[str]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return keys
+
+    result = await load_in_chunks([str(i) for i in range(50)], load_chunk, key=str, chunk_size=5, max_concurrency=3)
+
+    assert len(result) == 50
+    assert max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_load_in_chunks_without_keys():
+    async def load_chunk(keys: list[str]) -> list[str]:
+        raise AssertionError(f"No query should run, got {keys}")
+
+    assert await load_in_chunks([], load_chunk, key=str) == []
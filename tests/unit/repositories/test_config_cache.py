@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.models.skill_config import SkillConfig
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
+from backend.repositories.config_cache import AsyncCachedConfigStorage, CachedConfigStorage, ConfigCache
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage, SkillConfigStorage
+from tests.testing_utils import TEST_USER_ID
+
+
+@pytest.fixture
+def agent_data():
+    return {
+        "id": "agent1",
+        "user_id": TEST_USER_ID,
+        "config": {"name": "Sender Agent"},
+        "skills": ["Skill 1"],
+        "timestamp": "2024-05-05T00:14:57.487901+00:00",
+    }
+
+
+@pytest.fixture
+def skill_data():
+    return {
+        "id": "skill1",
+        "user_id": TEST_USER_ID,
+        "title": "Example Skill",
+        "timestamp": "2024-05-05T00:14:57.487901+00:00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_load_by_id_is_served_from_cache(mock_firestore_client, agent_data):
+    mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
+    storage = AsyncCachedConfigStorage(AsyncAgentFlowSpecStorage(), ConfigCache(maxsize=10, ttl=60))
+
+    first = await storage.load_by_id("agent1")
+    # Changes behind the cache's back are not seen until the entry is invalidated
+    mock_firestore_client.setup_mock_data("agent_configs", "agent1", {**agent_data, "skills": []})
+    second = await storage.load_by_id("agent1")
+
+    assert first == second == AgentFlowSpec.model_validate(agent_data)
+    assert first is not second
+    assert storage.cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+@pytest.mark.asyncio
+async def test_save_and_delete_invalidate(mock_firestore_client, agent_data):
+    mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
+    storage = AsyncCachedConfigStorage(AsyncAgentFlowSpecStorage(), ConfigCache(maxsize=10, ttl=60))
+
+    agent = await storage.load_by_id("agent1")
+    agent.skills = []
+    await storage.save(agent)
+    assert (await storage.load_by_id("agent1")).skills == []
+
+    await storage.delete("agent1")
+    assert await storage.load_by_id("agent1") is None
+    assert storage.cache.misses == 3
+
+
+@pytest.mark.asyncio
+async def test_load_by_ids_fetches_only_missing_ids(mock_firestore_client, agent_data):
+    mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
+    storage = AsyncCachedConfigStorage(AsyncAgentFlowSpecStorage(), ConfigCache(maxsize=10, ttl=60))
+    await storage.load_by_id("agent1")
+
+    loaded = await storage.load_by_ids(["agent1", "agent1"])
+
+    assert loaded == [AgentFlowSpec.model_validate(agent_data)]
+    assert storage.cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_storages_share_invalidation(mock_firestore_client, skill_data):
+    mock_firestore_client.setup_mock_data("skill_configs", "skill1", skill_data)
+    cache = ConfigCache(maxsize=10, ttl=60)
+    sync_storage = CachedConfigStorage(SkillConfigStorage(), cache)
+    async_storage = AsyncCachedConfigStorage(AsyncSkillConfigStorage(), cache)
+
+    assert sync_storage.load_by_titles(["Example Skill"]) == [SkillConfig.model_validate(skill_data)]
+    assert await async_storage.load_by_titles(["Example Skill"]) == [SkillConfig.model_validate(skill_data)]
+    assert cache.hits == 1
+
+    await async_storage.delete("skill1")
+
+    assert sync_storage.load_by_titles(["Example Skill"]) == []
+    assert cache.misses == 2
+
+
+class BlockingStorage:
+    """Async storage fake whose reads return the document as it was when they started, once released."""
+
+    def __init__(self, config):
+        self.config = config
+        self.reading = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def _read(self):
+        config = self.config
+        self.reading.set()
+        await self.release.wait()
+        return config.model_copy(deep=True)
+
+    async def load_by_id(self, id_):
+        config = await self._read()
+        return config if config.id == id_ else None
+
+    async def load_by_titles(self, titles):
+        config = await self._read()
+        return [config] if config.title in titles else []
+
+    async def save(self, config):
+        self.config = config
+        return config.id
+
+
+@pytest.mark.asyncio
+async def test_read_in_flight_during_a_save_is_not_cached(agent_data):
+    storage = AsyncCachedConfigStorage(
+        BlockingStorage(AgentFlowSpec.model_validate(agent_data)), ConfigCache(maxsize=10, ttl=60)
+    )
+
+    read = asyncio.create_task(storage.load_by_id("agent1"))
+    await storage._storage.reading.wait()
+    await storage.save(AgentFlowSpec.model_validate({**agent_data, "skills": []}))
+    storage._storage.release.set()
+
+    assert (await read).skills == ["Skill 1"]
+    assert (await storage.load_by_id("agent1")).skills == []
+
+
+@pytest.mark.asyncio
+async def test_titles_read_in_flight_during_a_save_are_not_cached(skill_data):
+    storage = AsyncCachedConfigStorage(
+        BlockingStorage(SkillConfig.model_validate(skill_data)), ConfigCache(maxsize=10, ttl=60)
+    )
+
+    read = asyncio.create_task(storage.load_by_titles(["Example Skill"]))
+    await storage._storage.reading.wait()
+    await storage.save(SkillConfig.model_validate({**skill_data, "content": "new"}))
+    storage._storage.release.set()
+
+    assert (await read)[0].content == ""
+    assert (await storage.load_by_titles(["Example Skill"]))[0].content == "new"
+
+
+def test_sync_read_in_flight_during_an_invalidation_is_not_cached(mock_firestore_client, skill_data):
+    mock_firestore_client.setup_mock_data("skill_configs", "skill1", skill_data)
+    cache = ConfigCache(maxsize=10, ttl=60)
+    storage = SkillConfigStorage()
+    load_by_titles = storage.load_by_titles
+
+    def load_during_a_save(titles):
+        configs = load_by_titles(titles)
+        # e.g. a save through another storage sharing the cache
+        mock_firestore_client.setup_mock_data("skill_configs", "skill1", {**skill_data, "content": "new"})
+        cache.invalidate("skill1")
+        return configs
+
+    storage.load_by_titles = load_during_a_save
+    cached_storage = CachedConfigStorage(storage, cache)
+
+    assert cached_storage.load_by_titles(["Example Skill"])[0].content == ""
+    storage.load_by_titles = load_by_titles
+    assert cached_storage.load_by_titles(["Example Skill"])[0].content == "new"
@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.models.skill_config import SkillConfig
+from backend.repositories.config_cache import AsyncCachedConfigStorage, ConfigCache
+from backend.repositories.data_loader import DataLoader, clear_request_loaders, get_request_loader, request_scope
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
+
+SKILL = {"id": "skill1", "user_id": "user1", "title": "Skill", "timestamp": "2024-05-05T00:14:57+00:00"}
+
+
+def make_loader(batches: list[list[str]]) -> DataLoader[str, str]:
+    async def batch_load(keys: list[str]) -> dict[str, str]:
+        batches.append(keys)
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    return DataLoader(batch_load)
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_are_coalesced():
+    batches = []
+    loader = make_loader(batches)
+
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"), loader.load("missing"))
+
+    assert results == ["A", "B", "A", None]
+    assert batches == [["a", "b", "missing"]]
+
+
+@pytest.mark.asyncio
+async def test_loaded_keys_are_memoized_until_cleared():
+    batches = []
+    loader = make_loader(batches)
+
+    assert await loader.load_many(["a", "b"]) == ["A", "B"]
+    assert await loader.load_many(["b", "c"]) == ["B", "C"]
+    loader.clear("b")
+    assert await loader.load("b") == "B"
+
+    assert batches == [["a", "b"], ["c"], ["b"]]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_memoized():
+    batch_load = AsyncMock(side_effect=[RuntimeError("unavailable"), {"a": "A"}])
+    loader = DataLoader(batch_load)
+
+    with pytest.raises(RuntimeError):
+        await loader.load("a")
+    assert await loader.load("a") == "A"
+    assert batch_load.await_count == 2
+
+
+def test_loaders_are_scoped_to_the_request():
+    owner = object()
+    batch_load = AsyncMock()
+
+    assert get_request_loader(owner, "ids", batch_load) is None
+    with request_scope():
+        loader = get_request_loader(owner, "ids", batch_load)
+        assert get_request_loader(owner, "ids", batch_load) is loader
+        with request_scope():
+            assert get_request_loader(owner, "ids", batch_load) is not loader
+
+
+@pytest.mark.asyncio
+async def test_cached_storage_reads_each_id_once_per_request(mock_firestore_client):
+    mock_firestore_client.setup_mock_data("skill_configs", "skill1", SKILL)
+    mock_firestore_client.setup_mock_data("skill_configs", "skill2", {**SKILL, "id": "skill2"})
+    inner = AsyncSkillConfigStorage()
+    inner.load_by_ids = AsyncMock(wraps=inner.load_by_ids)
+    storage = AsyncCachedConfigStorage(inner, ConfigCache(maxsize=10, ttl=60))
+
+    with request_scope():
+        first, second, both = await asyncio.gather(
+            storage.load_by_id("skill1"), storage.load_by_id("skill2"), storage.load_by_ids(["skill1", "skill2"])
+        )
+        first.title = "Changed"
+        # Only the request loader can serve the repeated read now
+        storage.cache.clear()
+        again = await storage.load_by_id("skill1")
+
+    assert both == [SkillConfig.model_validate(SKILL), SkillConfig.model_validate({**SKILL, "id": "skill2"})]
+    assert second.id == "skill2"
+    assert again.title == "Skill"
+    inner.load_by_ids.assert_awaited_once_with(["skill1", "skill2"])
+
+
+@pytest.mark.asyncio
+async def test_cached_storage_loads_titles_after_a_write_in_the_request(mock_firestore_client):
+    mock_firestore_client.setup_mock_data("skill_configs", "skill1", SKILL)
+    storage = AsyncCachedConfigStorage(AsyncSkillConfigStorage(), ConfigCache(maxsize=10, ttl=60))
+
+    with request_scope():
+        await storage.save(SkillConfig.model_validate({**SKILL, "id": "skill2", "title": "Other"}))
+
+        assert await storage.load_by_titles(["Skill"]) == [SkillConfig.model_validate(SKILL)]
+
+
+def test_clear_request_loaders_does_not_create_loaders():
+    owner = object()
+    batch_load = AsyncMock()
+
+    with request_scope():
+        clear_request_loaders(owner)
+        loader = get_request_loader(owner, "titles", batch_load)
+        clear_request_loaders(owner)
+
+        assert get_request_loader(owner, "titles", batch_load) is loader
+        assert get_request_loader(owner, "ids", batch_load)._batch_load is batch_load
@@ -1,7 +1,7 @@
 import pytest
 
 from backend.models.session_config import SessionConfig
-from backend.repositories.session_storage import SessionConfigStorage
+from backend.repositories.session_storage import AsyncSessionConfigStorage, SessionConfigStorage
 from tests.testing_utils import TEST_USER_ID
 
 
@@ -77,3 +77,18 @@ def test_delete_session_config(mock_firestore_client, session_data, storage):
     storage.delete("session1")
 
     assert mock_firestore_client.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_session_config_round_trip(mock_firestore_client, session_data):
+    storage = AsyncSessionConfigStorage()
+    await storage.save(SessionConfig(**session_data))
+    await storage.update("session1", {"name": "renamed"})
+
+    loaded_session_config = await storage.load_by_id("session1")
+    assert loaded_session_config.name == "renamed"
+    assert [session.id for session in await storage.load_by_user_id(TEST_USER_ID)] == ["session1"]
+    assert [session.id for session in await storage.load_by_agency_id("agency1")] == ["session1"]
+
+    await storage.delete("session1")
+    assert mock_firestore_client.to_dict() == {}
@@ -1,7 +1,7 @@
 import pytest
 
 from backend.models.skill_config import SkillConfig
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage, SkillConfigStorage
 from tests.testing_utils import TEST_USER_ID
 
 
@@ -42,19 +42,18 @@ def test_load_skill_config_by_id(mock_storage, mock_firestore_client, skill_data
 
 def test_save_new_skill_config(mock_storage, mock_firestore_client, skill_data):
     # Test case for creating a new skill config
-    mock_firestore_client.setup_mock_data("skill_configs", "skill2", skill_data)
-
     new_skill_data = skill_data.copy()
     del new_skill_data["id"]  # Simulate a new skill without an id
     skill_config = SkillConfig(**new_skill_data)
 
     skill_id = mock_storage.save(skill_config)
 
-    assert skill_id == "skill2"
+    # The id is allocated client-side
+    assert skill_id is not None
+    assert skill_config.id == skill_id
 
     serialized_data = skill_config.model_dump()
-    assert mock_firestore_client.to_dict() == serialized_data
-    assert skill_config.id == "skill2"
+    assert mock_firestore_client.collection("skill_configs").document(skill_id).to_dict() == serialized_data
 
 
 def test_update_existing_skill_config(mock_storage, mock_firestore_client, skill_data):
@@ -105,3 +104,48 @@ def test_delete_skill_config(mock_storage, mock_firestore_client, skill_data):
     mock_storage.delete(skill_data["id"])
 
     assert mock_firestore_client.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_load_skill_config_by_titles(mock_firestore_client, skill_data):
+    skill_data2 = skill_data.copy()
+    skill_data2["id"] = "skill2"
+    skill_data2["title"] = "Another Skill"
+    mock_firestore_client.setup_mock_data("skill_configs", "skill1", skill_data)
+    mock_firestore_client.setup_mock_data("skill_configs", "skill2", skill_data2)
+
+    storage = AsyncSkillConfigStorage()
+    loaded_skill_configs = await storage.load_by_titles(["Example Skill", "Another Skill"])
+
+    assert len(loaded_skill_configs) == 2
+    assert SkillConfig.model_validate(skill_data) in loaded_skill_configs
+    assert SkillConfig.model_validate(skill_data2) in loaded_skill_configs
+
+
+@pytest.mark.asyncio
+async def test_async_save_new_skill_config(mock_firestore_client, skill_data):
+    new_skill_data = skill_data.copy()
+    del new_skill_data["id"]
+    skill_config = SkillConfig(**new_skill_data)
+
+    skill_id = await AsyncSkillConfigStorage().save(skill_config)
+
+    assert skill_id is not None
+    assert skill_config.id == skill_id
+    assert mock_firestore_client.collection("skill_configs").document(skill_id).to_dict() == skill_config.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_async_save_many_skill_configs(mock_firestore_client, skill_data):
+    skill_configs = [SkillConfig(**{**skill_data, "id": None, "title": f"Skill {i}"}) for i in range(3)]
+    skill_configs.append(SkillConfig(**skill_data))
+
+    ids = await AsyncSkillConfigStorage().save_many(skill_configs)
+
+    assert ids == [skill_config.id for skill_config in skill_configs]
+    assert ids[-1] == skill_data["id"]
+    assert len(set(ids)) == 4
+    assert mock_firestore_client.batch_commits == 1
+    for skill_config in skill_configs:
+        stored = mock_firestore_client.collection("skill_configs").document(skill_config.id).to_dict()
+        assert stored == skill_config.model_dump()
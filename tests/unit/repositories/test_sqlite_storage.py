@@ -0,0 +1,144 @@
+import pytest
+
+from backend.models.agency_config import AgencyConfig, AgencyConfigSummary
+from backend.models.agent_flow_spec import AgentFlowSpec, AgentFlowSpecSummary
+from backend.models.session_config import SessionConfig
+from backend.models.skill_config import SkillConfig
+from backend.repositories.sqlite_storage import (
+    AsyncSqliteStorage,
+    SqliteAgencyConfigStorage,
+    SqliteAgentFlowSpecStorage,
+    SqliteDatabase,
+    SqliteSessionConfigStorage,
+    SqliteSkillConfigStorage,
+    SqliteUserVariableStorage,
+)
+from tests.testing_utils import TEST_USER_ID
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = SqliteDatabase(str(tmp_path / "test.sqlite3"))
+    yield database
+    database.close()
+
+
+def make_agent(id_: str | None, timestamp: str, user_id: str | None = TEST_USER_ID) -> AgentFlowSpec:
+    return AgentFlowSpec(id=id_, user_id=user_id, config={"name": f"Agent {id_}"}, timestamp=timestamp)
+
+
+def test_database_uses_wal(db):
+    assert db.connection().execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_save_and_load_agent(db):
+    storage = SqliteAgentFlowSpecStorage(db)
+    agent = make_agent(None, "2024-05-05T00:00:00+00:00")
+
+    agent_id = storage.save(agent)
+
+    assert agent.id == agent_id
+    assert storage.load_by_id(agent_id) == agent
+    assert storage.load_by_id("missing") is None
+
+
+def test_load_by_user_id_and_templates(db):
+    storage = SqliteAgentFlowSpecStorage(db)
+    user_agent = make_agent("agent1", "2024-05-05T00:00:00+00:00")
+    template_agent = make_agent("agent2", "2024-05-05T00:00:00+00:00", user_id=None)
+    storage.save_many([user_agent, template_agent])
+
+    assert storage.load_by_user_id(TEST_USER_ID) == [user_agent]
+    assert storage.load_by_user_id(None) == [template_agent]
+    assert storage.load_by_user_id(TEST_USER_ID, summary=True) == [
+        AgentFlowSpecSummary.model_validate(user_agent.model_dump())
+    ]
+
+
+def test_load_page_by_user_id(db):
+    storage = SqliteAgentFlowSpecStorage(db)
+    agents = [make_agent(f"agent{i}", f"2024-05-0{i}T00:00:00+00:00") for i in range(1, 6)]
+    storage.save_many(agents)
+
+    first_page = storage.load_page_by_user_id(TEST_USER_ID, 2)
+    second_page = storage.load_page_by_user_id(TEST_USER_ID, 2, (first_page[-1].timestamp, first_page[-1].id))
+
+    assert [agent.id for agent in first_page] == ["agent5", "agent4"]
+    assert [agent.id for agent in second_page] == ["agent3", "agent2"]
+
+
+def test_load_by_ids_keeps_the_order(db):
+    storage = SqliteAgentFlowSpecStorage(db)
+    storage.save_many([make_agent(f"agent{i}", "2024-05-05T00:00:00+00:00") for i in range(3)])
+
+    agents = storage.load_by_ids(["agent2", "missing", "agent0", "agent2"])
+
+    assert [agent.id for agent in agents] == ["agent2", "agent0"]
+
+
+def test_agency_agents_join_table(db):
+    storage = SqliteAgencyConfigStorage(db)
+    agency = AgencyConfig(id="agency1", user_id=TEST_USER_ID, name="Agency", main_agent="A", agents=["a1", "a2"])
+    storage.save(agency)
+
+    assert storage.load_by_agent_id("a1") == [agency]
+
+    agency.agents = ["a2"]
+    storage.save(agency)
+    assert storage.load_by_agent_id("a1") == []
+    assert storage.load_by_agent_id("a2") == [agency]
+    assert storage.load_by_user_id(TEST_USER_ID, summary=True) == [
+        AgencyConfigSummary.model_validate(agency.model_dump())
+    ]
+
+    storage.delete("agency1")
+    assert storage.load_by_agent_id("a2") == []
+
+
+def test_agent_lookup_uses_the_index(db):
+    plan = db.connection().execute(
+        "EXPLAIN QUERY PLAN SELECT data FROM agency_configs "
+        "JOIN agency_agents ON agency_agents.agency_id = agency_configs.id WHERE agency_agents.agent_id = ?",
+        ("a1",),
+    )
+    assert any("agency_agents_agent_id" in row[-1] for row in plan.fetchall())
+
+
+def test_load_skills_by_titles(db):
+    storage = SqliteSkillConfigStorage(db)
+    skills = [SkillConfig(id=f"skill{i}", title=f"Skill{i}", timestamp="2024-05-05T00:00:00+00:00") for i in range(3)]
+    storage.save_many(skills)
+
+    assert storage.load_by_titles(["Skill2", "Skill0", "Missing"]) == [skills[2], skills[0]]
+
+
+def test_update_session(db):
+    storage = SqliteSessionConfigStorage(db)
+    session = SessionConfig(id="session1", name="Session", user_id=TEST_USER_ID, agency_id="agency1")
+    storage.save(session)
+
+    storage.update("session1", {"name": "Renamed", "thread_ids.main_thread": "thread1"})
+
+    loaded = storage.load_by_agency_id("agency1")
+    assert [(session.name, session.thread_ids) for session in loaded] == [("Renamed", {"main_thread": "thread1"})]
+
+
+def test_user_variables(db):
+    storage = SqliteUserVariableStorage(db)
+    assert storage.get_all_variables(TEST_USER_ID) is None
+
+    storage.set_variables(TEST_USER_ID, {"OPENAI_API_KEY": "key"})
+    storage.update_variables(TEST_USER_ID, {"E2B_API_KEY": "e2b"})
+
+    assert storage.get_all_variables(TEST_USER_ID) == {"OPENAI_API_KEY": "key", "E2B_API_KEY": "e2b"}
+
+
+@pytest.mark.asyncio
+async def test_async_storage(db):
+    storage = AsyncSqliteStorage(SqliteAgentFlowSpecStorage(db))
+    agent = make_agent("agent1", "2024-05-05T00:00:00+00:00")
+
+    await storage.save(agent)
+
+    assert await storage.load_by_ids(["agent1"]) == [agent]
+    assert storage.db is db
@@ -1,12 +1,12 @@
 import pytest
 
-from backend.repositories.skill_config_storage import SkillConfigStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
 from backend.services.adapters.agent_adapter import AgentAdapter
 
 
 @pytest.fixture
-def skill_config_storage() -> SkillConfigStorage:
-    return SkillConfigStorage()
+def skill_config_storage() -> AsyncSkillConfigStorage:
+    return AsyncSkillConfigStorage()
 
 
 @pytest.fixture
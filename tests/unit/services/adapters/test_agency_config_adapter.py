@@ -2,13 +2,13 @@ import pytest
 
 from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI, CommunicationFlow
 from backend.models.agent_flow_spec import AgentConfig, AgentFlowSpec, AgentFlowSpecForAPI
-from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
 from backend.services.adapters.agency_adapter import AgencyAdapter
 
 
 @pytest.fixture
-def agent_flow_spec_storage() -> AgentFlowSpecStorage:
-    return AgentFlowSpecStorage()
+def agent_flow_spec_storage() -> AsyncAgentFlowSpecStorage:
+    return AsyncAgentFlowSpecStorage()
 
 
 @pytest.fixture
@@ -41,7 +41,8 @@ def test_to_model(agency_adapter):
     }
 
 
-def test_to_api(agency_adapter, agent_adapter, mocker):
+@pytest.mark.asyncio
+async def test_to_api(agency_adapter, agent_adapter, mocker):
     sender = AgentFlowSpec(id="sender_id", config=AgentConfig(name="Sender"))
     receiver = AgentFlowSpec(id="receiver_id", config=AgentConfig(name="Receiver"))
     agency_config = AgencyConfig(
@@ -61,18 +62,19 @@ def test_to_api(agency_adapter, agent_adapter, mocker):
         "load_by_ids",
         return_value=[sender, receiver],
     )
-    agency_config_api = agency_adapter.to_api(agency_config)
+    agency_config_api = await agency_adapter.to_api(agency_config)
     assert agency_config_api.name == "Test Agency"
     assert agency_config_api.description == "Test Description"
     assert agency_config_api.shared_instructions == "Test Instructions"
     assert len(agency_config_api.flows) == 2
-    assert agency_config_api.flows[0].sender == agent_adapter.to_api(sender)
-    assert agency_config_api.flows[0].receiver == agent_adapter.to_api(receiver)
-    assert agency_config_api.flows[1].sender == agent_adapter.to_api(sender)
-    assert agency_config_api.flows[1].receiver == agent_adapter.to_api(receiver)
+    assert agency_config_api.flows[0].sender == await agent_adapter.to_api(sender)
+    assert agency_config_api.flows[0].receiver == await agent_adapter.to_api(receiver)
+    assert agency_config_api.flows[1].sender == await agent_adapter.to_api(sender)
+    assert agency_config_api.flows[1].receiver == await agent_adapter.to_api(receiver)
 
 
-def test_to_api_without_agents(agency_adapter):
+@pytest.mark.asyncio
+async def test_to_api_without_agents(agency_adapter):
     agency_config = AgencyConfig(
         id="agency_id",
         name="Test Agency",
@@ -82,7 +84,7 @@ def test_to_api_without_agents(agency_adapter):
         main_agent="Sender",
         agency_chart={},
     )
-    agency_config_api = agency_adapter.to_api(agency_config)
+    agency_config_api = await agency_adapter.to_api(agency_config)
     assert agency_config_api.name == "Test Agency"
     assert agency_config_api.description == "Test Description"
     assert agency_config_api.shared_instructions == "Test Instructions"
@@ -1,3 +1,5 @@
+import pytest
+
 from backend.models.agent_flow_spec import AgentConfig, AgentFlowSpec, AgentFlowSpecForAPI
 from backend.models.skill_config import SkillConfig
 
@@ -21,7 +23,8 @@ def test_to_model(agent_adapter):
     assert agent_flow_spec.description == "Test Description"
 
 
-def test_to_api(agent_adapter, mocker):
+@pytest.mark.asyncio
+async def test_to_api(agent_adapter, mocker):
     skill_configs = [
         SkillConfig(title="Skill 1"),
         SkillConfig(title="Skill 2"),
@@ -39,14 +42,15 @@ def test_to_api(agent_adapter, mocker):
         return_value=skill_configs,
     )
 
-    agent_flow_spec_api = agent_adapter.to_api(agent_flow_spec)
+    agent_flow_spec_api = await agent_adapter.to_api(agent_flow_spec)
 
     assert agent_flow_spec_api.config.name == "Test Agent"
     assert agent_flow_spec_api.skills == skill_configs
     assert agent_flow_spec_api.description == "Test Description"
 
 
-def test_to_api_without_skills(agent_adapter):
+@pytest.mark.asyncio
+async def test_to_api_without_skills(agent_adapter):
     agent_flow_spec = AgentFlowSpec(
         id="1234",
         config=AgentConfig(name="Test Agent"),
@@ -54,7 +58,7 @@ def test_to_api_without_skills(agent_adapter):
         description="Test Description",
     )
 
-    agent_flow_spec_api = agent_adapter.to_api(agent_flow_spec)
+    agent_flow_spec_api = await agent_adapter.to_api(agent_flow_spec)
 
     assert agent_flow_spec_api.config.name == "Test Agent"
     assert agent_flow_spec_api.skills == []
@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.exceptions import NotFoundError
+from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentConfig, AgentFlowSpec
+from backend.models.session_config import SessionConfig
+from backend.models.skill_config import SkillConfig
+from backend.services.adapters.agency_adapter import AgencyAdapter
+from backend.services.adapters.agent_adapter import AgentAdapter
+from backend.services.adapters.session_adapter import SessionAdapter
+
+
+@pytest.fixture
+def storages():
+    agency_storage, agent_storage, skill_storage = AsyncMock(), AsyncMock(), AsyncMock()
+    agency_storage.load_by_ids.return_value = [
+        AgencyConfig(id="agency1", name="Agency 1", main_agent="Sender", agents=["sender_id"]),
+        AgencyConfig(
+            id="agency2",
+            name="Agency 2",
+            main_agent="Sender",
+            agents=["sender_id", "receiver_id"],
+            agency_chart={"0": ["Sender", "Receiver"]},
+        ),
+    ]
+    agent_storage.load_by_ids.return_value = [
+        AgentFlowSpec(id="sender_id", config=AgentConfig(name="Sender"), skills=["Skill 1"]),
+        AgentFlowSpec(id="receiver_id", config=AgentConfig(name="Receiver"), skills=["Skill 1", "Skill 2"]),
+    ]
+    skill_storage.load_by_titles.return_value = [SkillConfig(title="Skill 1"), SkillConfig(title="Skill 2")]
+    return agency_storage, agent_storage, skill_storage
+
+
+@pytest.fixture
+def session_adapter(storages) -> SessionAdapter:
+    agency_storage, agent_storage, skill_storage = storages
+    return SessionAdapter(agency_storage, AgencyAdapter(agent_storage, AgentAdapter(skill_storage)))
+
+
+@pytest.mark.asyncio
+async def test_to_api_many_loads_each_kind_once(session_adapter, storages):
+    agency_storage, agent_storage, skill_storage = storages
+    sessions = [
+        SessionConfig(
+            id=f"session{i}", name="Session", user_id="user1", agency_id=f"agency{i % 2 + 1}", timestamp=str(i)
+        )
+        for i in range(50)
+    ]
+
+    sessions_for_api = await session_adapter.to_api_many(sessions)
+
+    assert [session.id for session in sessions_for_api] == [session.id for session in sessions]
+    assert sessions_for_api[0].flow_config.name == "Agency 1"
+    flow = sessions_for_api[1].flow_config.flows[0]
+    assert (flow.sender.config.name, flow.receiver.config.name) == ("Sender", "Receiver")
+    assert [skill.title for skill in flow.receiver.skills] == ["Skill 1", "Skill 2"]
+    # Every session gets its own copy of the shared agency
+    assert sessions_for_api[1].flow_config is not sessions_for_api[3].flow_config
+    agency_storage.load_by_ids.assert_awaited_once_with(["agency1", "agency2"])
+    agent_storage.load_by_ids.assert_awaited_once_with(["sender_id", "receiver_id"])
+    skill_storage.load_by_titles.assert_awaited_once_with(["Skill 1", "Skill 2"])
+
+
+@pytest.mark.asyncio
+async def test_to_api_many_raises_for_missing_agency(session_adapter):
+    sessions = [SessionConfig(id="session1", name="Session", user_id="user1", agency_id="deleted_agency")]
+
+    with pytest.raises(NotFoundError):
+        await session_adapter.to_api_many(sessions)
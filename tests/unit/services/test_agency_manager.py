@@ -1,15 +1,17 @@
+import asyncio
 from http import HTTPStatus
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
-from agency_swarm import Agency, Agent
+from agency_swarm import Agency, Agent, BaseTool
 from fastapi import HTTPException
 
 from backend.dependencies.dependencies import get_user_variable_manager
 from backend.models.agency_config import AgencyConfig
-from backend.repositories.agency_config_storage import AgencyConfigStorage
-from backend.repositories.user_variable_storage import UserVariableStorage
-from backend.services.agency_manager import AgencyManager, agency_cache
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
+from backend.services.agency_manager import AgencyManager, agency_pool
+from backend.services.cache_invalidation_bus import cache_invalidation_bus
+from backend.services.service_registry import ServiceRegistry
 from tests.testing_utils import TEST_USER_ID
 from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID
 
@@ -18,12 +20,36 @@ from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID
 @pytest.mark.usefixtures("mock_firestore_client")
 def agency_manager():
     yield AgencyManager(
-        agent_manager=MagicMock(),
-        agency_config_storage=AgencyConfigStorage(),
-        user_variable_manager=get_user_variable_manager(user_variable_storage=UserVariableStorage()),
+        agent_manager=MagicMock(sync_assistants=AsyncMock()),
+        agency_config_storage=AsyncAgencyConfigStorage(),
+        user_variable_manager=get_user_variable_manager(),
     )
 
 
+class StateTool(BaseTool):
+    """Returns the value of the key in the shared state."""
+
+    def run(self):
+        return self._shared_state.get("key")
+
+
+def make_agent(name: str, tools: list | None = None) -> Agent:
+    with patch("agency_swarm.agents.agent.get_openai_client"):
+        return Agent(name=name, description=f"{name} description", tools=tools)
+
+
+def make_mock_agent(id_: str, name: str) -> MagicMock:
+    agent = MagicMock(spec=Agent)
+    agent.id = id_
+    agent.name = name
+    agent.description = f"{name} description"
+    agent.temperature = 0.5
+    agent.top_p = 1.0
+    agent.examples = []
+    agent.tools = []
+    return agent
+
+
 # test get_agency_list method
 @pytest.mark.asyncio
 async def test_get_agency_list(agency_manager, mock_firestore_client):
@@ -93,12 +119,13 @@ async def test_load_and_construct_agents_success(agency_manager):
         agents=[TEST_AGENT_ID],
     )
     agent_flow_spec_mock = Mock()
+    agent_flow_spec_mock.id = TEST_AGENT_ID
     agent_flow_spec_mock.config.name = "Sender Agent"
     agent_mock = MagicMock(spec=Agent)
     agent_mock.id = TEST_AGENT_ID
 
     agent_manager_mock = AsyncMock()
-    agent_manager_mock.get_agent.return_value = (agent_mock, agent_flow_spec_mock)
+    agent_manager_mock.get_agents.return_value = [(agent_mock, agent_flow_spec_mock)]
 
     agency_manager.agent_manager = agent_manager_mock
 
@@ -107,6 +134,7 @@ async def test_load_and_construct_agents_success(agency_manager):
     assert "Sender Agent" in agents
     assert isinstance(agents["Sender Agent"], Agent)
     assert agents["Sender Agent"].id == TEST_AGENT_ID
+    agent_manager_mock.get_agents.assert_called_once_with([TEST_AGENT_ID])
 
 
 # Test agent not found
@@ -122,7 +150,7 @@ async def test_load_and_construct_agents_agent_not_found(agency_manager):
     )
 
     agent_manager_mock = AsyncMock()
-    agent_manager_mock.get_agent.return_value = None
+    agent_manager_mock.get_agents.return_value = []
     agency_manager.agent_manager = agent_manager_mock
 
     with patch("logging.Logger.error") as mock_logger_error:
@@ -154,6 +182,7 @@ async def test_construct_agency_single_layer_chart(agency_manager):
     mock_agent_1.temperature = 0.5
     mock_agent_1.top_p = 1.0
     mock_agent_1.examples = []
+    mock_agent_1.tools = []
     mock_agent_2 = MagicMock(spec=Agent)
     mock_agent_2.id = "agent2_id"
     mock_agent_2.name = "agent2_name"
@@ -161,36 +190,154 @@ async def test_construct_agency_single_layer_chart(agency_manager):
     mock_agent_2.temperature = 0.5
     mock_agent_2.top_p = 1.0
     mock_agent_2.examples = []
+    mock_agent_2.tools = []
 
     # Clear the agency cache before the test
-    agency_cache.clear()
+    agency_pool.clear()
 
     # Construct the agency
     with patch.object(agency_manager, "_load_and_construct_agents", new_callable=AsyncMock) as mock_load_agents:
         mock_load_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
-        agency = await agency_manager._construct_agency_and_update_assistants(agency_config, {})
+        agency = await agency_manager._construct_agency_and_update_assistants(agency_config, None)
 
     # Assertions
     assert isinstance(agency, Agency)
-    assert len(agency.agents) == 2
-    assert agency.agents == [mock_agent_1, mock_agent_2]
+    assert [agent.name for agent in agency.agents] == ["Sender Agent", "agent2_name"]
     assert agency.shared_instructions == "manifesto"
 
-    # Verify that the agency is cached
-    cache_key = "8147cad3c67ff29b97a59e6e1fc1ae9ddc4e6738c2d41190516480a916d0c40e"
-    assert cache_key in agency_cache
-    assert agency_cache[cache_key] == agency
+    # Verify that the agency is cached by the agency config
+    cache_key = next(iter(agency_pool))
+    cached = agency_pool.get(cache_key)
+    assert cached.agents == [mock_agent_1, mock_agent_2]
 
     # Call the method again with the same arguments
     with patch.object(agency_manager, "_load_and_construct_agents", new_callable=AsyncMock) as mock_load_agents:
         mock_load_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
-        cached_agency = await agency_manager._construct_agency_and_update_assistants(agency_config, {})
+        cached_agency = await agency_manager._construct_agency_and_update_assistants(agency_config, None)
 
-    # Verify that the cached agency is returned
-    assert cached_agency == agency
+    # Verify that the cached agency is reused
+    assert [agent.name for agent in cached_agency.agents] == ["Sender Agent", "agent2_name"]
     assert mock_load_agents.call_count == 0  # Ensure that _load_and_construct_agents is not called again
 
 
+@pytest.mark.asyncio
+async def test_construct_agency_reused_across_sessions(agency_manager):
+    agency_config = AgencyConfig(
+        id=TEST_AGENCY_ID,
+        user_id=TEST_USER_ID,
+        name="Test agency",
+        agents=[TEST_AGENT_ID, "agent2_id"],
+        main_agent="Sender Agent",
+        agency_chart={"0": ["Sender Agent", "agent2_name"]},
+    )
+    mock_agent_1 = make_mock_agent(TEST_AGENT_ID, "Sender Agent")
+    mock_agent_2 = make_mock_agent("agent2_id", "agent2_name")
+    agency_pool.clear()
+
+    session_1_thread_ids = {"main_thread": "thread1", "Sender Agent": {"agent2_name": "thread2"}}
+    session_2_thread_ids = {"main_thread": "thread3", "Sender Agent": {"agent2_name": "thread4"}}
+    with patch.object(agency_manager, "_load_and_construct_agents", new_callable=AsyncMock) as mock_load_agents:
+        mock_load_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
+        agency_1 = await agency_manager._construct_agency_and_update_assistants(agency_config, session_1_thread_ids)
+        agency_2 = await agency_manager._construct_agency_and_update_assistants(agency_config, session_2_thread_ids)
+
+    # The agents are constructed once, each session gets its own threads
+    mock_load_agents.assert_called_once()
+    assert len(agency_pool) == 1
+    assert agency_1.main_thread.id == "thread1"
+    assert agency_2.main_thread.id == "thread3"
+    assert agency_1.agents_and_threads["Sender Agent"]["agent2_name"].id == "thread2"
+    assert agency_2.agents_and_threads["Sender Agent"]["agent2_name"].id == "thread4"
+    assert agency_1.ceo is agency_1.agents_and_threads["Sender Agent"]["agent2_name"].agent
+    assert agency_1.ceo is not agency_2.ceo
+    assert agency_1.shared_state is not agency_2.shared_state
+
+
+@patch.object(Agent, "init_oai")
+def test_bind_threads_tools_use_the_session_shared_state(_):
+    agency = Agency([make_agent("Sender Agent", tools=[StateTool])])
+
+    session_1 = AgencyManager._bind_threads(agency, None)
+    session_2 = AgencyManager._bind_threads(agency, None)
+    session_1.shared_state.set("key", "session 1")
+    session_2.shared_state.set("key", "session 2")
+
+    tool_1, tool_2 = session_1.ceo.functions[0], session_2.ceo.functions[0]
+    assert tool_1.__name__ == tool_2.__name__ == "StateTool"
+    assert tool_1().run() == "session 1"
+    assert tool_2().run() == "session 2"
+    assert agency.ceo.tools == [StateTool]
+
+
+@patch.object(Agent, "init_oai")
+def test_agency_swarm_internals_used_to_bind_threads(_):
+    """Fails when an agency-swarm upgrade changes the internals AgencyManager._bind_threads relies on."""
+    sender, recipient = make_agent("Sender Agent"), make_agent("agent2_name")
+
+    agency = Agency([sender, [sender, recipient]])
+
+    assert callable(agency._init_threads)
+    assert callable(agency._create_special_tools)
+    assert set(agency.agents_and_threads) == {"main_thread", "Sender Agent"}
+    assert agency.agents_and_threads["main_thread"] is agency.main_thread
+    thread = agency.agents_and_threads["Sender Agent"]["agent2_name"]
+    assert (thread.agent, thread.recipient_agent) == (sender, recipient)
+    assert "SendMessage" in {tool.__name__ for tool in sender.tools}
+
+    session_agency = AgencyManager._bind_threads(agency, None)
+    session_thread = session_agency.agents_and_threads["Sender Agent"]["agent2_name"]
+    assert session_thread is not thread
+    assert (session_thread.agent, session_thread.recipient_agent) == (session_agency.ceo, session_agency.agents[1])
+
+
+def test_agency_pool_event_only_drops_the_constructed_agencies():
+    agency_pool.put("key1", "agency", size=100)
+
+    with patch.object(ServiceRegistry, "invalidate") as mock_invalidate:
+        cache_invalidation_bus.publish("agency_pool", None)
+
+    assert len(agency_pool) == 0
+    mock_invalidate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_construct_the_agency_once(agency_manager):
+    agency_config = AgencyConfig(
+        id=TEST_AGENCY_ID, user_id=TEST_USER_ID, name="Test agency", agents=[TEST_AGENT_ID], main_agent="Sender Agent"
+    )
+    agency_pool.clear()
+
+    async def load_agents(_):
+        await asyncio.sleep(0.01)
+        return {"Sender Agent": make_mock_agent(TEST_AGENT_ID, "Sender Agent")}
+
+    with patch.object(agency_manager, "_load_and_construct_agents", side_effect=load_agents) as mock_load_agents:
+        agencies = await asyncio.gather(
+            *(agency_manager._construct_agency_and_update_assistants(agency_config, None) for _ in range(3))
+        )
+
+    mock_load_agents.assert_called_once()
+    assert len({id(agency.ceo) for agency in agencies}) == 3
+    assert len(agency_pool) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up(agency_manager, mock_firestore_client):
+    agency_config = AgencyConfig(
+        id=TEST_AGENCY_ID, user_id=TEST_USER_ID, name="Test agency", agents=[TEST_AGENT_ID], main_agent="Sender Agent"
+    )
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config.model_dump())
+    agency_pool.clear()
+
+    with patch.object(agency_manager, "_load_and_construct_agents", new_callable=AsyncMock) as mock_load_agents:
+        mock_load_agents.return_value = {"Sender Agent": make_mock_agent(TEST_AGENT_ID, "Sender Agent")}
+        await agency_manager.warm_up(TEST_AGENCY_ID, TEST_USER_ID)
+        await agency_manager.get_agency(TEST_AGENCY_ID, None, TEST_USER_ID)
+
+    mock_load_agents.assert_called_once()
+    assert len(agency_pool) == 1
+
+
 @pytest.mark.asyncio
 async def test_delete_agency(agency_manager, mock_firestore_client):
     mock_firestore_client.setup_mock_data(
@@ -212,7 +359,8 @@ def test_validate_agency_ownership_raises_403(agency_manager):
     assert exc_info.value.status_code == HTTPStatus.FORBIDDEN
 
 
-def test_is_agent_used_in_agencies(agency_manager, mock_firestore_client):
+@pytest.mark.asyncio
+async def test_is_agent_used_in_agencies(agency_manager, mock_firestore_client):
     agency_config = AgencyConfig(
         id=TEST_AGENCY_ID,
         user_id=TEST_USER_ID,
@@ -222,5 +370,5 @@ def test_is_agent_used_in_agencies(agency_manager, mock_firestore_client):
         agents=[TEST_AGENT_ID],
     )
     mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config.model_dump())
-    assert agency_manager.is_agent_used_in_agencies(TEST_AGENT_ID)
-    assert not agency_manager.is_agent_used_in_agencies("another_agent_id")
+    assert await agency_manager.is_agent_used_in_agencies(TEST_AGENT_ID)
+    assert not await agency_manager.is_agent_used_in_agencies("another_agent_id")
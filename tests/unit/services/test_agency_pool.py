@@ -0,0 +1,92 @@
+from openai import OpenAI
+
+from backend.services.agency_pool import AgencyPool, estimate_size
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_and_stats():
+    pool = AgencyPool(max_bytes=1000, max_idle_seconds=60)
+    pool.put("key1", "agency1", size=100, label="agency_id")
+
+    assert pool.get("key1") == "agency1"
+    assert pool.get("missing") is None
+    assert pool.stats() == {
+        "entries": 1,
+        "size_bytes": 100,
+        "max_bytes": 1000,
+        "max_idle_seconds": 60,
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "evictions": 0,
+    }
+    assert [(entry["key"], entry["label"]) for entry in pool.entries()] == [("key1", "agency_id")]
+
+
+def test_evicts_the_least_recently_used_over_the_size_bound():
+    pool = AgencyPool(max_bytes=250, max_idle_seconds=60)
+    pool.put("key1", "agency1", size=100)
+    pool.put("key2", "agency2", size=100)
+    pool.get("key1")
+
+    pool.put("key3", "agency3", size=100)
+
+    assert list(pool) == ["key1", "key3"]
+    assert pool.stats()["size_bytes"] == 200
+    assert pool.evictions == 1
+
+
+def test_keeps_an_entry_larger_than_the_bound():
+    pool = AgencyPool(max_bytes=50, max_idle_seconds=60)
+    pool.put("key1", "agency1", size=100)
+
+    assert "key1" in pool
+
+
+def test_evicts_idle_entries():
+    timer = FakeTimer()
+    pool = AgencyPool(max_bytes=1000, max_idle_seconds=60, timer=timer)
+    pool.put("key1", "agency1", size=100)
+    timer.now = 30
+    pool.put("key2", "agency2", size=100)
+
+    timer.now = 61
+    assert pool.get("key1") is None
+    assert pool.get("key2") == "agency2"
+    assert pool.evictions == 1
+    assert pool.stats()["size_bytes"] == 100
+
+
+def test_clear():
+    pool = AgencyPool(max_bytes=1000, max_idle_seconds=60)
+    pool.put("key1", "agency1", size=100)
+
+    assert pool.clear() == 1
+    assert len(pool) == 0
+    assert pool.stats()["size_bytes"] == 0
+
+
+def test_estimate_size():
+    small = {"data": "x"}
+    large = {"data": "x" * 10_000}
+
+    assert estimate_size(large) > estimate_size(small) + 9_000
+
+
+def test_estimate_size_skips_shared_objects():
+    client = OpenAI(api_key="test")
+    agent = {"instructions": "x" * 10_000}
+    agency_1 = {"client": client, "agents": [agent], "name": "agency1"}
+    agency_2 = {"client": client, "agents": [agent], "name": "agency2"}
+
+    # Neither agency is charged for the client nor for the agent they share
+    assert estimate_size(agency_1, shared=[agent]) < 1_000
+    assert estimate_size(agency_2, shared=[agent]) < 1_000
+    assert estimate_size(agency_1) > 10_000
@@ -6,7 +6,7 @@ from fastapi import HTTPException
 from backend.exceptions import NotFoundError
 from backend.models.agent_flow_spec import AgentFlowSpec
 from backend.models.skill_config import SkillConfig
-from backend.services.agent_manager import AgentManager
+from backend.services.agent_manager import AgentManager, _invalidate_agents, agent_cache, assistant_fingerprint
 from tests.testing_utils import TEST_USER_ID
 from tests.testing_utils.constants import TEST_AGENT_ID
 
@@ -18,9 +18,20 @@ def mock_skill_registry():
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def clear_agent_cache():
+    agent_cache.clear()
+    yield
+    agent_cache.clear()
+
+
+def make_agent_mock(**kwargs) -> MagicMock:
+    return MagicMock(tools=[], files_folder=[], tool_resources={}, metadata={}, **kwargs)
+
+
 @pytest.fixture
 def storage_mock():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
@@ -30,7 +41,7 @@ def user_variable_manager_mock():
 
 @pytest.fixture
 def skill_storage_mock():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
@@ -47,7 +58,7 @@ async def test_get_agent_list(agent_manager, storage_mock):
     result = await agent_manager.get_agent_list(TEST_USER_ID)
 
     assert result == template_configs + user_configs
-    storage_mock.load_by_user_id.assert_any_call(TEST_USER_ID)
+    storage_mock.load_by_user_id.assert_any_call(TEST_USER_ID, summary=False)
     storage_mock.load_by_user_id.assert_any_call(None)
 
 
@@ -129,7 +140,7 @@ async def test_get_agent_list_owned_by_user(agent_manager, storage_mock):
     result = await agent_manager.get_agent_list(TEST_USER_ID, owned_by_user=True)
 
     assert result == user_configs
-    storage_mock.load_by_user_id.assert_called_once_with(TEST_USER_ID)
+    storage_mock.load_by_user_id.assert_called_once_with(TEST_USER_ID, summary=False)
 
 
 # Test get_agent with existing agent
@@ -137,15 +148,59 @@ async def test_get_agent_list_owned_by_user(agent_manager, storage_mock):
 async def test_get_agent_existing(agent_manager, storage_mock):
     config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Agent1"})
     storage_mock.load_by_id.return_value = config
-    agent_manager._construct_agent = MagicMock(return_value="mocked_agent")
+    agent_manager._construct_agent = MagicMock(return_value=make_agent_mock(id=TEST_AGENT_ID))
 
-    result = await agent_manager.get_agent(TEST_AGENT_ID)
+    agent, result_config = await agent_manager.get_agent(TEST_AGENT_ID)
 
-    assert result == ("mocked_agent", config)
+    assert agent.id == TEST_AGENT_ID
+    assert result_config == config
     storage_mock.load_by_id.assert_called_once_with(TEST_AGENT_ID)
     agent_manager._construct_agent.assert_called_once_with(config)
 
 
+# Test get_agent reuses the agent constructed for the same version of the config
+@pytest.mark.asyncio
+async def test_get_agent_cached_by_timestamp(agent_manager, storage_mock):
+    config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Agent1"}, timestamp="1")
+    storage_mock.load_by_id.return_value = config
+    agent_manager._construct_agent = MagicMock(side_effect=lambda _: make_agent_mock())
+
+    first, _ = await agent_manager.get_agent(TEST_AGENT_ID)
+    second, _ = await agent_manager.get_agent(TEST_AGENT_ID)
+    first.tools.append("SendMessage")
+
+    agent_manager._construct_agent.assert_called_once_with(config)
+    assert first is not second
+    assert second.tools == []
+
+    storage_mock.load_by_id.return_value = config.model_copy(update={"timestamp": "2"})
+    await agent_manager.get_agent(TEST_AGENT_ID)
+
+    assert agent_manager._construct_agent.call_count == 2
+
+
+# Test an agent constructed across an invalidation is not cached
+@pytest.mark.asyncio
+async def test_get_agent_invalidated_during_construction(agent_manager, storage_mock):
+    config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Agent1"}, timestamp="1")
+    storage_mock.load_by_id.return_value = config
+
+    def construct_agent(_):
+        # e.g. a skill changed while the agent was being constructed
+        _invalidate_agents(None)
+        return make_agent_mock()
+
+    agent_manager._construct_agent = MagicMock(side_effect=construct_agent)
+    await agent_manager.get_agent(TEST_AGENT_ID)
+
+    assert len(agent_cache) == 0
+    agent_manager._construct_agent = MagicMock(side_effect=lambda _: make_agent_mock())
+    await agent_manager.get_agent(TEST_AGENT_ID)
+
+    agent_manager._construct_agent.assert_called_once_with(config)
+    assert len(agent_cache) == 1
+
+
 # Test get_agent with non-existing agent
 @pytest.mark.asyncio
 async def test_get_agent_non_existing(agent_manager, storage_mock):
@@ -203,6 +258,56 @@ async def test_create_or_update_agent(agent_manager, storage_mock):
     storage_mock.save.assert_called_once_with(config)
 
 
+# Test create_or_update_agents
+@pytest.mark.asyncio
+async def test_create_or_update_agents(agent_manager, storage_mock):
+    configs = [AgentFlowSpec(config={"name": f"Agent{i}"}, user_id=TEST_USER_ID) for i in range(3)]
+    agent_manager._construct_agent = MagicMock(side_effect=lambda config: MagicMock(id=f"id_{config.config.name}"))
+    storage_mock.save_many.side_effect = lambda configs: [config.id for config in configs]
+
+    result = await agent_manager.create_or_update_agents(configs)
+
+    assert result == [f"id_Agent{i} ({TEST_USER_ID})" for i in range(3)]
+    storage_mock.save_many.assert_called_once_with(configs)
+    storage_mock.save.assert_not_called()
+
+
+# Test that the assistant updates are skipped when the settings are unchanged
+@pytest.mark.asyncio
+async def test_sync_assistants_skips_assistants_in_sync(agent_manager, storage_mock):
+    agent_in_sync = MagicMock(id="agent1", instructions="Unchanged")
+    agent_changed = MagicMock(id="agent2", instructions="Changed")
+    configs = [
+        AgentFlowSpec(
+            id="agent1", config={"name": "Agent1"}, assistant_fingerprint=assistant_fingerprint(agent_in_sync)
+        ),
+        AgentFlowSpec(id="agent2", config={"name": "Agent2"}, assistant_fingerprint="outdated"),
+    ]
+    storage_mock.load_by_ids.return_value = configs
+
+    await agent_manager.sync_assistants([agent_in_sync, agent_changed])
+
+    agent_in_sync.init_oai.assert_not_called()
+    agent_changed.init_oai.assert_called_once()
+    storage_mock.update.assert_called_once_with(
+        "agent2", {"assistant_fingerprint": assistant_fingerprint(agent_changed)}
+    )
+
+
+# Test get_agents
+@pytest.mark.asyncio
+async def test_get_agents(agent_manager, storage_mock):
+    configs = [AgentFlowSpec(id=f"agent{i}", config={"name": f"Agent{i}"}) for i in range(3)]
+    storage_mock.load_by_ids.return_value = configs
+    agent_manager._construct_agent = MagicMock(side_effect=lambda config: make_agent_mock(id=config.id))
+
+    result = await agent_manager.get_agents(["agent0", "agent1", "agent2", "missing"])
+
+    assert [(agent.id, config) for agent, config in result] == [(config.id, config) for config in configs]
+    storage_mock.load_by_ids.assert_called_once_with(["agent0", "agent1", "agent2", "missing"])
+    storage_mock.load_by_id.assert_not_called()
+
+
 # Test _validate_agent_ownership with valid ownership
 def test_validate_agent_ownership_valid(agent_manager):
     config_db = AgentFlowSpec(user_id=TEST_USER_ID, config={"name": "Agent1"})
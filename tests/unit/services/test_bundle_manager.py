@@ -0,0 +1,20 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.models.agency_config import AgencyConfig
+from backend.services.bundle_manager import BundleManager
+from tests.testing_utils import TEST_USER_ID
+
+
+@pytest.mark.asyncio
+async def test_prepare_agency_without_main_agent():
+    manager = BundleManager(MagicMock(), MagicMock(storage=MagicMock(load_by_id=AsyncMock())), MagicMock())
+    agency = AgencyConfig.model_construct(name="Empty agency", agents=[], main_agent=None, agency_chart={})
+    errors = []
+
+    prepared = await manager._prepare_agency(agency, [], TEST_USER_ID, {}, errors)
+
+    assert errors == []
+    assert prepared.main_agent is None
+    assert prepared.user_id == TEST_USER_ID
@@ -0,0 +1,115 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.services.cache_invalidation_bus import CacheInvalidationBus
+
+
+class FakePubSub:
+    def __init__(self, messages: list[dict]):
+        self.messages = messages
+        self.subscribe = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        await asyncio.Event().wait()  # keep the subscription open like a real connection
+
+
+def make_redis(messages: list[dict]) -> MagicMock:
+    redis = MagicMock()
+    redis.pubsub.return_value = FakePubSub(messages)
+    redis.publish = AsyncMock()
+    redis.aclose = AsyncMock()
+    return redis
+
+
+def test_publish_without_redis_invalidates_locally():
+    bus = CacheInvalidationBus()
+    handler = MagicMock()
+    bus.subscribe("agent", handler)
+
+    bus.publish("agent", "agent1")
+    bus.publish("skill", "skill1")
+
+    handler.assert_called_once_with("agent1")
+
+
+@pytest.mark.asyncio
+async def test_publish_broadcasts_to_redis():
+    bus = CacheInvalidationBus(channel="test_channel")
+    redis = make_redis([])
+    await bus.start(redis)
+
+    bus.publish("agency", "agency1")
+    await asyncio.sleep(0)
+    await bus.stop()
+
+    redis.publish.assert_awaited_once_with(
+        "test_channel", json.dumps({"origin": bus.origin, "kind": "agency", "id": "agency1"})
+    )
+    redis.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_events_from_other_workers_are_dispatched():
+    bus = CacheInvalidationBus(channel="test_channel")
+    handler = MagicMock()
+    bus.subscribe("skill", handler)
+    redis = make_redis(
+        [
+            {"data": json.dumps({"origin": "other", "kind": "skill", "id": "skill1"}).encode()},
+            {"data": json.dumps({"origin": bus.origin, "kind": "skill", "id": "skill2"}).encode()},
+            {"data": b"not json"},
+        ]
+    )
+
+    await bus.start(redis)
+    await asyncio.sleep(0.01)
+    await bus.stop()
+
+    redis.pubsub.return_value.subscribe.assert_awaited_once_with("test_channel")
+    handler.assert_called_once_with("skill1")
+
+
+@pytest.mark.asyncio
+async def test_lost_subscription_drops_all_caches_once_restored(monkeypatch):
+    monkeypatch.setattr("backend.services.cache_invalidation_bus.MIN_RECONNECT_DELAY_SECONDS", 0.001)
+    bus = CacheInvalidationBus()
+    handler = MagicMock()
+    bus.subscribe("agent", handler)
+    redis = make_redis([])
+    pubsub = redis.pubsub.return_value
+    redis.pubsub.side_effect = [ConnectionError("Redis is down")] * 3 + [pubsub]
+
+    await bus.start(redis)
+    await asyncio.sleep(0.05)
+    await bus.stop()
+
+    assert redis.pubsub.call_count == 4
+    handler.assert_called_once_with(None)
+
+
+@pytest.mark.asyncio
+async def test_caches_kept_while_redis_is_down(monkeypatch):
+    monkeypatch.setattr("backend.services.cache_invalidation_bus.MIN_RECONNECT_DELAY_SECONDS", 0.001)
+    bus = CacheInvalidationBus()
+    handler = MagicMock()
+    bus.subscribe("agent", handler)
+    redis = make_redis([])
+    redis.pubsub.side_effect = ConnectionError("Redis is down")
+
+    await bus.start(redis)
+    await asyncio.sleep(0.02)
+    await bus.stop()
+
+    assert redis.pubsub.call_count > 1
+    handler.assert_not_called()
@@ -0,0 +1,90 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from backend.constants import INTERNAL_ERROR_MESSAGE
+from backend.exceptions import NotFoundError
+from backend.models.message import Message
+from backend.models.run import Run
+from backend.models.session_config import SessionConfig
+from backend.services.run_manager import RunManager
+from tests.testing_utils import TEST_USER_ID
+from tests.testing_utils.constants import TEST_AGENCY_ID
+
+
+@pytest.fixture
+def agency():
+    return MagicMock()
+
+
+@pytest.fixture
+def saved_runs():
+    return []
+
+
+@pytest.fixture
+def run_manager(agency, saved_runs):
+    session_manager = MagicMock(get_session=AsyncMock(), update_session_timestamp=AsyncMock())
+    session_manager.get_session.return_value = SessionConfig(
+        id="session_id", name="Session", user_id=TEST_USER_ID, agency_id=TEST_AGENCY_ID
+    )
+    agency_manager = MagicMock(get_agency=AsyncMock(return_value=(agency, MagicMock())))
+    run_storage = MagicMock(save=AsyncMock(side_effect=lambda run: saved_runs.append(run.model_copy())))
+    run_storage.load_by_id = AsyncMock()
+    return RunManager(run_storage, agency_manager, session_manager, MagicMock(send_message=AsyncMock()))
+
+
+async def wait_for_run(saved_runs, status: str) -> None:
+    for _ in range(100):
+        if saved_runs and saved_runs[-1].status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"The run is not {status}")
+
+
+@pytest.mark.asyncio
+async def test_start_run(run_manager, agency, saved_runs):
+    agency.get_completion.return_value = "Hello"
+
+    run = await run_manager.start_run(TEST_USER_ID, Message(session_id="session_id", content="Hi"), "client_id")
+    await wait_for_run(saved_runs, "completed")
+
+    assert run.status == "queued"
+    assert [saved.status for saved in saved_runs] == ["queued", "running", "completed"]
+    assert saved_runs[-1].response == "Hello"
+    agency.get_completion.assert_called_once_with(message="Hi", yield_messages=False, message_files=None)
+    run_manager.session_manager.update_session_timestamp.assert_awaited_once_with("session_id")
+    run_manager.connection_manager.send_message.assert_awaited_once_with(
+        {"type": "run_finished", "data": saved_runs[-1].model_dump()}, "client_id", user_id=TEST_USER_ID
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_run_failure(run_manager, agency, saved_runs):
+    agency.get_completion.side_effect = RuntimeError("OpenAI error")
+
+    await run_manager.start_run(TEST_USER_ID, Message(session_id="session_id", content="Hi"))
+    await wait_for_run(saved_runs, "failed")
+
+    assert saved_runs[-1].error == INTERNAL_ERROR_MESSAGE
+    run_manager.session_manager.update_session_timestamp.assert_not_awaited()
+    run_manager.connection_manager.send_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_run(run_manager):
+    run = Run(id="run_id", user_id=TEST_USER_ID, agency_id=TEST_AGENCY_ID, session_id="session_id")
+    run_manager.run_storage.load_by_id.return_value = run
+
+    assert await run_manager.get_run("run_id", TEST_USER_ID) == run
+
+    with pytest.raises(HTTPException) as exc_info:
+        await run_manager.get_run("run_id", "other_user_id")
+    assert exc_info.value.status_code == HTTPStatus.FORBIDDEN
+
+    run_manager.run_storage.load_by_id.return_value = None
+    with pytest.raises(NotFoundError, match="Run not found: run_id"):
+        await run_manager.get_run("run_id", TEST_USER_ID)
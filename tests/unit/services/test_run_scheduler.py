@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.services.run_scheduler import RunScheduler
+
+
+class BlockingRun:
+    """A blocking call that returns once released."""
+
+    def __init__(self):
+        self.released = threading.Event()
+
+    def __call__(self, value):
+        self.released.wait(5)
+        return value
+
+
+async def wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition not met")
+
+
+@pytest.mark.asyncio
+async def test_run_returns_the_result_in_the_current_context():
+    scheduler = RunScheduler(max_workers=2, max_concurrent_runs=2, max_runs_per_user=1)
+
+    result = await scheduler.run("user1", lambda a, b=0: (a, b, threading.current_thread().name), 1, b=2)
+
+    assert result[:2] == (1, 2)
+    assert result[2].startswith("agency-run")
+    assert scheduler.stats()["started"] == 1
+    assert scheduler.stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_runs_over_the_user_limit_wait_in_order():
+    scheduler = RunScheduler(max_workers=4, max_concurrent_runs=4, max_runs_per_user=1)
+    first, second = BlockingRun(), BlockingRun()
+    positions = []
+
+    async def report(position):
+        positions.append(position)
+
+    first_task = asyncio.create_task(scheduler.run("user1", first, "first"))
+    await wait_for(lambda: scheduler.stats()["running"] == 1)
+    second_task = asyncio.create_task(scheduler.run("user1", second, "second", on_position=report))
+    # Another user isn't held up by the waiting run of user1
+    assert await scheduler.run("user2", lambda: "other") == "other"
+    await wait_for(lambda: positions == [1])
+    assert scheduler.stats()["waiting"] == 1
+
+    first.released.set()
+    second.released.set()
+
+    assert await asyncio.gather(first_task, second_task) == ["first", "second"]
+    stats = scheduler.stats()
+    assert (stats["running"], stats["waiting"], stats["queued"], stats["max_waiting"]) == (0, 0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_runs_over_the_global_limit_report_their_position():
+    scheduler = RunScheduler(max_workers=1, max_concurrent_runs=1, max_runs_per_user=1)
+    run = BlockingRun()
+    positions = {"user2": [], "user3": []}
+
+    def reporter(user_id):
+        async def report(position):
+            positions[user_id].append(position)
+
+        return report
+
+    running = asyncio.create_task(scheduler.run("user1", run, 1))
+    await wait_for(lambda: scheduler.stats()["running"] == 1)
+    waiting = [asyncio.create_task(scheduler.run(user, run, user, on_position=reporter(user))) for user in positions]
+    await wait_for(lambda: positions == {"user2": [1], "user3": [2]})
+
+    # The cancelled runs leave the queue
+    waiting[0].cancel()
+    await wait_for(lambda: positions["user3"] == [2, 1])
+    run.released.set()
+
+    assert await running == 1
+    assert await waiting[1] == "user3"
+    with pytest.raises(asyncio.CancelledError):
+        await waiting[0]
+    assert scheduler.stats()["running"] == 0
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from backend.repositories.sqlite_storage import SqliteSkillConfigStorage
+from backend.services.service_registry import ServiceRegistry
+from backend.settings import settings
+
+
+def test_services_are_built_lazily_and_shared(mock_firestore_client):
+    registry = ServiceRegistry()
+
+    assert registry.user_variable_manager is registry.user_variable_manager
+    assert registry.agency_adapter.agent_adapter is registry.agent_adapter
+    assert registry.session_adapter.agency_config_storage is registry.agency_config_storage
+    assert registry.sync_skill_config_storage.db is mock_firestore_client
+    assert registry.run_storage.redis is registry.redis
+
+
+def test_shutdown_drops_services():
+    registry = ServiceRegistry()
+    registry.startup()
+    agent_adapter = registry.agent_adapter
+
+    registry.shutdown()
+
+    assert "agent_adapter" not in vars(registry)
+    assert registry.agent_adapter is not agent_adapter
+
+
+def test_sqlite_storage_backend(tmp_path):
+    registry = ServiceRegistry()
+    with (
+        patch.object(settings, "storage_backend", "sqlite"),
+        patch.object(settings, "sqlite_path", str(tmp_path / "test.sqlite3")),
+    ):
+        registry.startup()
+
+    assert registry.firestore_client is None
+    assert isinstance(registry.sync_skill_config_storage._storage, SqliteSkillConfigStorage)
+    assert registry.sync_skill_config_storage.db is registry.sqlite_database
+    registry.shutdown()
+
+
+@pytest.mark.usefixtures("mock_firestore_client")
+def test_skill_events_drop_the_title_entries():
+    registry = ServiceRegistry()
+    registry.startup()
+    # A title cached as not found, then the skill is created on another worker
+    registry.skill_config_cache.put_titles(["New Skill"], [])
+
+    registry.invalidate("skill", "skill1")
+
+    assert registry.skill_config_cache.get_titles(["New Skill"]) == ({}, ["New Skill"])
+    registry.shutdown()
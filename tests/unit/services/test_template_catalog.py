@@ -0,0 +1,64 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.models.skill_config import SkillConfig
+from backend.repositories.agency_config_storage import AsyncAgencyConfigStorage
+from backend.repositories.agent_flow_spec_storage import AsyncAgentFlowSpecStorage
+from backend.repositories.skill_config_storage import AsyncSkillConfigStorage
+from backend.services.template_catalog import TemplateCatalog
+from tests.testing_utils import TEST_USER_ID
+
+TEMPLATE_SKILL = {"id": "skill1", "user_id": None, "title": "Template", "timestamp": "2024-05-05T00:14:57+00:00"}
+
+
+@pytest.fixture
+def catalog(mock_firestore_client):
+    return TemplateCatalog(
+        mock_firestore_client,
+        {
+            "agency": AsyncAgencyConfigStorage(),
+            "agent": AsyncAgentFlowSpecStorage(),
+            "skill": AsyncSkillConfigStorage(),
+        },
+        refresh_interval=60,
+    )
+
+
+@pytest.mark.asyncio
+async def test_templates_are_polled_when_listeners_are_unsupported(catalog, mock_firestore_client):
+    mock_firestore_client.setup_mock_data("skill_configs", "skill1", TEMPLATE_SKILL)
+    mock_firestore_client.setup_mock_data("skill_configs", "skill2", {**TEMPLATE_SKILL, "user_id": TEST_USER_ID})
+    catalog.start()
+
+    assert await catalog.get_templates("skill") == [SkillConfig.model_validate(TEMPLATE_SKILL)]
+
+    mock_firestore_client.setup_mock_data("skill_configs", "skill3", {**TEMPLATE_SKILL, "id": "skill3"})
+    assert len(await catalog.get_templates("skill")) == 1
+
+    catalog.invalidate("skill")
+    assert len(await catalog.get_templates("skill")) == 2
+
+
+@pytest.mark.asyncio
+async def test_templates_are_pushed_by_snapshot_listeners():
+    queries = {}
+
+    def collection(name):
+        queries[name] = MagicMock()
+        return MagicMock(where=MagicMock(return_value=queries[name]))
+
+    storage = AsyncMock()
+    storage.load_by_user_id.return_value = []
+    catalog = TemplateCatalog(MagicMock(collection=collection), {"skill": storage}, refresh_interval=60)
+    catalog.start()
+
+    on_snapshot = queries["skill_configs"].on_snapshot.call_args.args[0]
+    on_snapshot([MagicMock(to_dict=MagicMock(return_value=TEMPLATE_SKILL))], [], None)
+    catalog.invalidate("skill")
+
+    assert await catalog.get_templates("skill") == [SkillConfig.model_validate(TEMPLATE_SKILL)]
+    storage.load_by_user_id.assert_not_called()
+
+    catalog.stop()
+    queries["skill_configs"].on_snapshot.return_value.unsubscribe.assert_called_once()
@@ -0,0 +1,159 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.services.websocket.redis_connection_manager import RedisWebSocketConnectionManager
+
+
+@pytest.fixture(autouse=True)
+def short_poll_timeout(monkeypatch):
+    monkeypatch.setattr("backend.services.websocket.redis_connection_manager.POLL_TIMEOUT_SECONDS", 0.001)
+
+
+class FakePubSub:
+    """Records the calls made while another one is in progress (a real PubSub connection can't take them)."""
+
+    def __init__(self, messages: list[dict]):
+        self.messages = list(messages)
+        self.in_use = False
+        self.overlapping_calls = 0
+        self.subscribe = AsyncMock(side_effect=self._command)
+        self.unsubscribe = AsyncMock(side_effect=self._command)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def _command(self, *_):
+        self._enter()
+        await asyncio.sleep(0)  # waiting for the reply
+        self.in_use = False
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float):
+        assert ignore_subscribe_messages
+        self._enter()
+        try:
+            await asyncio.sleep(0 if self.messages else timeout)
+            return self.messages.pop(0) if self.messages else None
+        finally:
+            self.in_use = False
+
+    def _enter(self):
+        if self.in_use:
+            self.overlapping_calls += 1
+        self.in_use = True
+
+
+def make_redis(messages: list[dict]) -> MagicMock:
+    redis = MagicMock()
+    redis.pubsub.return_value = FakePubSub(messages)
+    redis.publish = AsyncMock()
+    redis.aclose = AsyncMock()
+    return redis
+
+
+def relayed(message: dict, user_id: str | None = None) -> bytes:
+    return json.dumps({"message": message, "user_id": user_id}).encode()
+
+
+def make_websocket() -> MagicMock:
+    return MagicMock(accept=AsyncMock(), send_json=AsyncMock(), close=AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_send_message_to_local_client():
+    manager = RedisWebSocketConnectionManager(channel_prefix="test")
+    redis = make_redis([])
+    websocket = make_websocket()
+    await manager.start(redis)
+    await manager.connect(websocket, "client1")
+
+    await manager.send_message({"text": "Hello"}, "client1")
+    await manager.disconnect("client1")
+    await manager.stop()
+
+    websocket.send_json.assert_awaited_once_with({"text": "Hello"})
+    redis.publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_send_message_to_remote_client_publishes_it():
+    manager = RedisWebSocketConnectionManager(channel_prefix="test")
+    redis = make_redis([])
+    await manager.start(redis)
+
+    await manager.send_message({"text": "Hello"}, "client1", user_id="user1")
+    await manager.stop()
+
+    redis.publish.assert_awaited_once_with(
+        "test:client1", json.dumps({"message": {"text": "Hello"}, "user_id": "user1"})
+    )
+
+
+@pytest.mark.asyncio
+async def test_published_messages_relayed_to_local_client():
+    manager = RedisWebSocketConnectionManager(channel_prefix="test")
+    websocket = make_websocket()
+    await manager.connect(websocket, "client1")
+    manager.set_user("client1", "user1")
+    redis = make_redis(
+        [
+            {"type": "message", "channel": b"test:client1", "data": relayed({"text": "Hello"})},
+            {"type": "message", "channel": b"test:client1", "data": b"not json"},
+            {"type": "message", "channel": b"test:client1", "data": json.dumps({"text": "Not relayed"}).encode()},
+            {"type": "message", "channel": b"test:client1", "data": relayed({"text": "Other user"}, "user2")},
+            {"type": "message", "channel": b"test:client1", "data": relayed({"text": "User"}, "user1")},
+            {"type": "message", "channel": b"test:client2", "data": relayed({"text": "Other"})},
+        ]
+    )
+
+    await manager.start(redis)
+    await asyncio.sleep(0.01)
+    await manager.disconnect("client1")
+    await manager.stop()
+
+    redis.pubsub.return_value.subscribe.assert_awaited_once_with("test", "test:client1")
+    assert [call.args[0] for call in websocket.send_json.await_args_list] == [{"text": "Hello"}, {"text": "User"}]
+
+
+@pytest.mark.asyncio
+async def test_connect_and_disconnect_manage_the_client_subscription():
+    manager = RedisWebSocketConnectionManager(channel_prefix="test")
+    redis = make_redis([])
+    await manager.start(redis)
+    await asyncio.sleep(0)  # let the listener subscribe
+
+    await manager.connect(make_websocket(), "client1")
+    await manager.disconnect("client1")
+    await manager.stop()
+
+    pubsub = redis.pubsub.return_value
+    pubsub.subscribe.assert_awaited_with("test:client1")
+    pubsub.unsubscribe.assert_awaited_once_with("test:client1")
+    redis.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_clients_connect_while_messages_are_relayed():
+    manager = RedisWebSocketConnectionManager(channel_prefix="test")
+    websocket = make_websocket()
+    await manager.connect(websocket, "client1")
+    redis = make_redis(
+        [{"type": "message", "channel": b"test:client1", "data": relayed({"index": index})} for index in range(20)]
+    )
+    await manager.start(redis)
+
+    others = [f"client{index}" for index in range(2, 10)]
+    await asyncio.gather(*(manager.connect(make_websocket(), client_id) for client_id in others))
+    await asyncio.sleep(0.01)
+    await asyncio.gather(*(manager.disconnect(client_id) for client_id in [*others, "client1"]))
+    await manager.stop()
+
+    pubsub = redis.pubsub.return_value
+    assert pubsub.overlapping_calls == 0
+    assert pubsub.subscribe.await_count == 1 + len(others)
+    assert [call.args[0] for call in websocket.send_json.await_args_list] == [{"index": index} for index in range(20)]
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.services.websocket.stream_coalescer import StreamCoalescer
+
+
+@pytest.fixture
+def connection_manager():
+    return MagicMock(send_message=AsyncMock())
+
+
+def sent_frames(connection_manager) -> list[dict]:
+    return [call.args[0] for call in connection_manager.send_message.await_args_list]
+
+
+def status(message: str) -> dict:
+    return {"type": "agent_status", "data": {"message": message}}
+
+
+@pytest.mark.asyncio
+async def test_statuses_merged_and_ordered_with_messages(connection_manager):
+    async with StreamCoalescer(connection_manager, "client_id", flush_interval_ms=1000) as stream:
+        stream.add_status("Hel")
+        stream.add_status("lo")
+        stream.add_message({"type": "agent_message", "data": {"message": {"content": "Hello"}}})
+        stream.add_status(None)
+        stream.add_status("Bye")
+
+    assert sent_frames(connection_manager) == [
+        status("Hello"),
+        {"type": "agent_message", "data": {"message": {"content": "Hello"}}},
+        status("Bye"),
+    ]
+    connection_manager.send_message.assert_awaited_with(status("Bye"), "client_id")
+
+
+@pytest.mark.asyncio
+async def test_statuses_flushed_by_size(connection_manager):
+    async with StreamCoalescer(connection_manager, "client_id", flush_interval_ms=1000, flush_bytes=4) as stream:
+        for text in ["ab", "cd", "ef"]:
+            stream.add_status(text)
+
+    assert sent_frames(connection_manager) == [status("abcd"), status("ef")]
+
+
+@pytest.mark.asyncio
+async def test_statuses_flushed_by_interval(connection_manager):
+    async with StreamCoalescer(connection_manager, "client_id", flush_interval_ms=10) as stream:
+        stream.add_status("a")
+        await asyncio.sleep(0.05)
+        assert sent_frames(connection_manager) == [status("a")]
+
+        stream.add_status("b")
+
+    assert sent_frames(connection_manager) == [status("a"), status("b")]
+
+
+@pytest.mark.asyncio
+async def test_statuses_added_from_another_thread(connection_manager):
+    async with StreamCoalescer(connection_manager, "client_id", flush_interval_ms=1000) as stream:
+        await asyncio.to_thread(lambda: [stream.add_status(str(i)) for i in range(100)])
+
+    assert sent_frames(connection_manager) == [status("".join(str(i) for i in range(100)))]
+
+
+@pytest.mark.asyncio
+async def test_stream_dropped_after_send_failure(connection_manager):
+    connection_manager.send_message.side_effect = [RuntimeError("closed"), None]
+
+    async with StreamCoalescer(connection_manager, "client_id") as stream:
+        stream.add_message({"type": "agent_message"})
+        stream.add_message({"type": "agent_message"})
+
+    assert connection_manager.send_message.await_count == 1
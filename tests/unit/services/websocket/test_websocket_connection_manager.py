@@ -1,6 +1,7 @@
 import asyncio
 
 import pytest
+import pytest_asyncio
 
 from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
 
@@ -9,20 +10,26 @@ class MockWebSocket:
     def __init__(self):
         self.accepted_subprotocol = None
         self.sent_json = None
+        self.closed = False
 
     async def accept(self):
         pass
 
     async def close(self):
         self.accepted_subprotocol = None
+        self.closed = True
 
     async def send_json(self, message):
         self.sent_json = message
 
 
-@pytest.fixture
-def connection_manager():
-    return WebSocketConnectionManager()
+@pytest_asyncio.fixture
+async def connection_manager():
+    manager = WebSocketConnectionManager()
+    yield manager
+    # Stop the writers
+    for client_id in list(manager.active_connections):
+        await manager.disconnect(client_id)
 
 
 @pytest.fixture
@@ -68,9 +75,27 @@ async def test_send_message(connection_manager, mock_websocket):
     await connection_manager.connect(mock_websocket, client_id)
     message = {"text": "Hello"}
     await connection_manager.send_message(message, client_id)
+    await connection_manager.flush(client_id)
     assert mock_websocket.sent_json == message
 
 
+@pytest.mark.asyncio
+async def test_send_message_of_a_user(connection_manager):
+    websocket, other_websocket = MockWebSocket(), MockWebSocket()
+    await connection_manager.connect(websocket, "client1")
+    await connection_manager.connect(other_websocket, "client2")
+    connection_manager.set_user("client1", "user1")
+    connection_manager.set_user("client2", "user2")
+
+    await connection_manager.send_message({"text": "Hello"}, "client1", user_id="user1")
+    await connection_manager.send_message({"text": "Hello"}, "client2", user_id="user1")
+    await connection_manager.flush("client1")
+    await connection_manager.flush("client2")
+
+    assert websocket.sent_json == {"text": "Hello"}
+    assert other_websocket.sent_json is None
+
+
 @pytest.mark.asyncio
 async def test_send_message_nonexistent_client(connection_manager):
     client_id = "nonexistent_client"
@@ -93,3 +118,76 @@ async def test_concurrent_connections(connection_manager):
     assert client_id2 in connection_manager.active_connections
     assert connection_manager.active_connections[client_id1] == websocket1
     assert connection_manager.active_connections[client_id2] == websocket2
+
+
+class SlowWebSocket(MockWebSocket):
+    """Sends once released."""
+
+    def __init__(self):
+        super().__init__()
+        self.released = asyncio.Event()
+        self.sent: list[dict] = []
+
+    async def send_json(self, message):
+        await self.released.wait()
+        self.sent.append(message)
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_delay_the_others(connection_manager):
+    slow_websocket = SlowWebSocket()
+    websocket = MockWebSocket()
+    await connection_manager.connect(slow_websocket, "slow_client")
+    await connection_manager.connect(websocket, "client")
+
+    await connection_manager.send_message({"text": "Slow"}, "slow_client")
+    await connection_manager.send_message({"text": "Hello"}, "client")
+    await connection_manager.flush("client")
+
+    assert websocket.sent_json == {"text": "Hello"}
+    assert slow_websocket.sent == []
+
+    slow_websocket.released.set()
+    await connection_manager.disconnect("slow_client")
+    assert slow_websocket.sent == [{"text": "Slow"}]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_status_messages(connection_manager):
+    connection_manager.queue_size = 1
+    websocket = SlowWebSocket()
+    await connection_manager.connect(websocket, "client")
+
+    for message in ["a", "b", "c"]:
+        await connection_manager.send_message({"type": "agent_status", "data": {"message": message}}, "client")
+    websocket.released.set()
+    await connection_manager.send_message({"type": "agent_message"}, "client")
+    await connection_manager.flush("client")
+
+    # "a" was queued, "b" and "c" dropped
+    assert websocket.sent == [{"type": "agent_status", "data": {"message": "a"}}, {"type": "agent_message"}]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_disconnects(connection_manager):
+    connection_manager.queue_size = 1
+    connection_manager.full_queue_policy = "disconnect"
+    websocket = SlowWebSocket()
+    await connection_manager.connect(websocket, "client")
+
+    for message in ["a", "b", "c"]:
+        await connection_manager.send_message({"type": "agent_status", "data": {"message": message}}, "client")
+
+    assert websocket.closed
+    assert "client" not in connection_manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_disconnect_sends_the_queued_messages(connection_manager, mock_websocket):
+    await connection_manager.connect(mock_websocket, "client")
+
+    await connection_manager.send_message({"text": "Bye"}, "client")
+    await connection_manager.disconnect("client", close=True)
+
+    assert mock_websocket.sent_json == {"text": "Bye"}
+    assert mock_websocket.closed
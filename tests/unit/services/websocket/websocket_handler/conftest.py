@@ -7,9 +7,9 @@ from backend.services.websocket.websocket_handler import WebSocketHandler
 
 @pytest.fixture
 def websocket_handler() -> WebSocketHandler:
-    connection_manager = AsyncMock()
+    connection_manager = AsyncMock(set_user=MagicMock())
     auth_service = MagicMock()
     agency_manager = AsyncMock()
     message_manager = MagicMock()
-    session_manager = MagicMock()
+    session_manager = AsyncMock()
     return WebSocketHandler(connection_manager, auth_service, agency_manager, message_manager, session_manager)
@@ -19,6 +19,7 @@ async def test_authenticate_valid_token(websocket_handler):
 
     assert result == user
     websocket_handler.auth_service.get_user.assert_called_once_with(token)
+    websocket_handler.connection_manager.set_user.assert_called_once_with(client_id, "user_id")
 
 
 @pytest.mark.asyncio
@@ -36,6 +37,7 @@ async def test_authenticate_invalid_token(websocket_handler):
         await websocket_handler._authenticate(client_id, token)
 
     websocket_handler.auth_service.get_user.assert_called_once_with(token)
+    websocket_handler.connection_manager.set_user.assert_not_called()
     websocket_handler.connection_manager.send_message.assert_awaited_once_with(
         {"status": False, "message": "Invalid token"}, client_id
     )
@@ -119,6 +119,41 @@ async def test_process_single_message_user_message(websocket_handler):
     )
 
 
+@pytest.mark.asyncio
+async def test_process_single_message_subscribe(websocket_handler):
+    websocket = AsyncMock(spec=WebSocket)
+    client_id = "client_id"
+    user = User(id="user_id", email="user@example.com")
+    session = SessionConfig(id="session_id", name="Session", user_id=user.id, agency_id="agency_id")
+    agency = MagicMock()
+    websocket_handler.auth_service.get_user.return_value = user
+    websocket_handler.session_manager.get_session.return_value = session
+    websocket_handler.agency_manager.get_agency.return_value = (agency, None)
+    websocket_handler.message_manager.get_messages.return_value = []
+
+    websocket.receive_json.return_value = {
+        "type": "subscribe",
+        "data": {"session_id": "session_id"},
+        "access_token": "token",
+    }
+    await websocket_handler._process_single_message(websocket, client_id)
+
+    websocket_handler.connection_manager.send_message.assert_awaited_once_with(
+        {"type": "subscribed", "data": {"session_id": "session_id"}}, client_id
+    )
+
+    websocket.receive_json.return_value = {
+        "type": "user_message",
+        "data": {"content": "User message", "session_id": "session_id"},
+        "access_token": "token",
+    }
+    await websocket_handler._process_single_message(websocket, client_id)
+
+    # The user message uses the agency bound by the subscribe message
+    websocket_handler.agency_manager.get_agency.assert_awaited_once_with(session.agency_id, session.thread_ids, user.id)
+    agency.get_completion_stream.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_process_single_message_invalid_message_type(websocket_handler):
     websocket = AsyncMock(spec=WebSocket)
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -7,6 +8,7 @@ from starlette.websockets import WebSocket, WebSocketDisconnect
 from websockets.exceptions import ConnectionClosedOK
 
 from backend.exceptions import NotFoundError, UnsetVariableError
+from backend.models.session_config import SessionConfig
 
 
 @pytest.mark.asyncio
@@ -23,6 +25,48 @@ async def test_handle_websocket_connection(websocket_handler):
     websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id)
 
 
+async def connect_and_send_message(websocket_handler, session: SessionConfig, user_id: str) -> None:
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.receive_json.side_effect = [{"type": "invalid_type", "access_token": "token"}, WebSocketDisconnect(1000)]
+    websocket_handler.session_manager.get_session.return_value = session
+    websocket_handler.auth_service.get_user.return_value = MagicMock(id=user_id)
+
+    await websocket_handler.handle_websocket_connection(websocket, "client_id", session_id=session.id)
+    await asyncio.sleep(0)  # let the warm-up run
+
+
+@pytest.mark.asyncio
+async def test_handle_websocket_connection_warms_up_the_session_agency(websocket_handler):
+    session = SessionConfig(id="session_id", name="Session", user_id="user_id", agency_id="agency_id")
+
+    await connect_and_send_message(websocket_handler, session, "user_id")
+
+    websocket_handler.session_manager.get_session.assert_awaited_once_with("session_id")
+    websocket_handler.agency_manager.warm_up.assert_awaited_once_with("agency_id", "user_id")
+
+
+@pytest.mark.asyncio
+async def test_handle_websocket_connection_no_warm_up_before_authentication(websocket_handler):
+    websocket = AsyncMock(spec=WebSocket)
+
+    with patch.object(websocket_handler, "_handle_websocket_messages", new_callable=AsyncMock) as handle_messages_mock:
+        handle_messages_mock.side_effect = WebSocketDisconnect(1000)
+        await websocket_handler.handle_websocket_connection(websocket, "client_id", session_id="session_id")
+        await asyncio.sleep(0)
+
+    websocket_handler.session_manager.get_session.assert_not_awaited()
+    websocket_handler.agency_manager.warm_up.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_handle_websocket_connection_no_warm_up_of_other_users_sessions(websocket_handler):
+    session = SessionConfig(id="session_id", name="Session", user_id="other_user_id", agency_id="agency_id")
+
+    await connect_and_send_message(websocket_handler, session, "user_id")
+
+    websocket_handler.agency_manager.warm_up.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_handle_websocket_connection_unset_variable_error(websocket_handler):
     websocket = AsyncMock(spec=WebSocket)